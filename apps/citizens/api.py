@@ -6,6 +6,9 @@ from ninja.pagination import LimitOffsetPagination, paginate
 from apps.citizens.schemas import CitizenCreateIn, CitizenOut, CitizenUpdateIn
 from apps.citizens.services import CitizenService
 from apps.organizations.models import OrgRole
+from apps.pictograms import packs
+from core.conditional import conditional, etag_matches, instance_etag, not_modified, page_etag
+from core.media import serve_media
 from core.permissions import check_role_or_raise
 from core.schemas import ErrorOut
 
@@ -30,6 +33,7 @@ def create_citizen(request, org_id: int, payload: CitizenCreateIn):
     "/organizations/{org_id}/citizens",
     response=list[CitizenOut],
 )
+@conditional(page_etag)
 @paginate(LimitOffsetPagination)
 def list_citizens(request, org_id: int):
     """List citizens in an organization. Requires membership."""
@@ -44,6 +48,7 @@ def list_citizens(request, org_id: int):
     "/citizens/{citizen_id}",
     response={200: CitizenOut, 403: ErrorOut, 404: ErrorOut},
 )
+@conditional(instance_etag)
 def get_citizen(request, citizen_id: int):
     """Get citizen detail. Requires membership in the citizen's org."""
     citizen = CitizenService.get_citizen(citizen_id)
@@ -75,3 +80,26 @@ def delete_citizen(request, citizen_id: int):
     check_role_or_raise(request.auth, citizen.organization_id, min_role=OrgRole.ADMIN)
     CitizenService.delete_citizen(citizen_id=citizen_id)
     return 204, None
+
+
+@router.get(
+    "/citizens/{citizen_id}/pictogram-pack",
+    response={200: None, 403: ErrorOut, 404: ErrorOut},
+)
+def download_pictogram_pack(request, citizen_id: int):
+    """Download a ZIP of every pictogram visible to the citizen, with images, sounds and a manifest.
+
+    The pack is cached by manifest hash, which is also its (strong) ETag.
+    It is served like other media (``core.media.serve_media``), so
+    interrupted downloads resume with ``Range``/``If-Range``.
+    """
+    citizen = CitizenService.get_citizen(citizen_id)
+    check_role_or_raise(request.auth, citizen.organization_id, min_role=OrgRole.MEMBER)
+
+    plan = packs.plan_pack(organization_id=citizen.organization_id, citizen_id=citizen.id)
+    if etag_matches(request, f'"{plan.digest}"'):
+        return not_modified(f'"{plan.digest}"')
+
+    response = serve_media(request, packs.get_or_build_pack(plan))
+    response["Content-Disposition"] = f'attachment; filename="pictograms-citizen-{citizen.id}.zip"'
+    return response
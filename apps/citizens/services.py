@@ -1,5 +1,7 @@
 """Business logic for citizen operations."""
 
+from collections.abc import Iterable
+
 from django.db.models import QuerySet
 
 from apps.citizens.models import Citizen
@@ -26,6 +28,16 @@ class CitizenService:
         except Citizen.DoesNotExist as e:
             raise ResourceNotFoundError(f"Citizen {citizen_id} not found.") from e
 
+    @staticmethod
+    def get_citizens(citizen_ids: Iterable[int]) -> dict[int, Citizen]:
+        """Fetch citizens by ID in one query. Raises if any ID is unknown."""
+        citizen_ids = set(citizen_ids)
+        citizens = Citizen.objects.in_bulk(citizen_ids)
+        missing = citizen_ids - citizens.keys()
+        if missing:
+            raise ResourceNotFoundError(f"Citizen {min(missing)} not found.")
+        return citizens
+
     @staticmethod
     def update_citizen(*, citizen_id: int, first_name: str | None = None, last_name: str | None = None) -> Citizen:
         citizen = CitizenService.get_citizen(citizen_id)
@@ -33,7 +45,7 @@ class CitizenService:
         for field, value in updates.items():
             setattr(citizen, field, value)
         if updates:
-            citizen.save(update_fields=list(updates))
+            citizen.save(update_fields=[*updates, "updated_at"])
         return citizen
 
     @staticmethod
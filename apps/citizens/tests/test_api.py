@@ -89,6 +89,19 @@ class TestUpdateCitizen:
         assert response.status_code == 200
         assert response.json()["first_name"] == "Alicia"
 
+    def test_rename_invalidates_etag(self, client, org, member):
+        from apps.citizens.models import Citizen
+
+        citizen = Citizen.objects.create(first_name="Alice", last_name="A", organization=org)
+        headers = auth_header_for_user(member)
+        url = f"/api/v1/citizens/{citizen.id}"
+        etag = client.get(url, **headers)["ETag"]
+
+        client.patch(url, data={"first_name": "Alicia"}, content_type="application/json", **headers)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag, **headers)
+        assert response.status_code == 200
+        assert response.json()["first_name"] == "Alicia"
+
 
 @pytest.mark.django_db
 class TestDeleteCitizen:
@@ -143,3 +156,53 @@ class TestUpdateCitizenBothFields:
         data = response.json()
         assert data["first_name"] == "Bob"
         assert data["last_name"] == "Z"
+
+
+@pytest.mark.django_db
+class TestPictogramPack:
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_member_downloads_pack(self, client, org, member, citizen):
+        import io
+        import zipfile
+
+        from apps.pictograms.models import Pictogram
+        from apps.pictograms.tests.utils import make_test_image
+
+        Pictogram.objects.create(name="Mine", image=make_test_image(), organization=org, citizen=citizen)
+        headers = auth_header_for_user(member)
+        response = client.get(f"/api/v1/citizens/{citizen.id}/pictogram-pack", **headers)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/zip"
+        assert response["Content-Disposition"] == f'attachment; filename="pictograms-citizen-{citizen.id}.zip"'
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as archive:
+            assert "manifest.json" in archive.namelist()
+
+    def test_pack_revalidates_with_etag(self, client, member, citizen):
+        headers = auth_header_for_user(member)
+        url = f"/api/v1/citizens/{citizen.id}/pictogram-pack"
+        etag = client.get(url, **headers)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag, **headers).status_code == 304
+
+    def test_interrupted_download_resumes(self, client, member, citizen):
+        headers = auth_header_for_user(member)
+        url = f"/api/v1/citizens/{citizen.id}/pictogram-pack"
+        full = client.get(url, **headers)
+        body = b"".join(full.streaming_content)
+
+        response = client.get(url, HTTP_RANGE="bytes=10-", HTTP_IF_RANGE=full["ETag"], **headers)
+        assert response.status_code == 206
+        assert b"".join(response.streaming_content) == body[10:]
+
+    def test_pack_is_handed_to_the_proxy(self, client, member, citizen, settings):
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+        response = client.get(f"/api/v1/citizens/{citizen.id}/pictogram-pack", **auth_header_for_user(member))
+        assert response["X-Accel-Redirect"].startswith("/protected-media/pictogram-packs/")
+        assert response["Content-Disposition"].startswith("attachment;")
+
+    def test_non_member_denied(self, client, non_member, citizen):
+        headers = auth_header_for_user(non_member)
+        response = client.get(f"/api/v1/citizens/{citizen.id}/pictogram-pack", **headers)
+        assert response.status_code == 403
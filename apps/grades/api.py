@@ -1,11 +1,17 @@
 """Grade API endpoints."""
 
+from django.http import JsonResponse
 from ninja import Router
 from ninja.pagination import LimitOffsetPagination, paginate
 
-from apps.grades.schemas import GradeCitizenAssignIn, GradeCreateIn, GradeOut, GradeUpdateIn
+from apps.grades.schemas import GradeCitizenAssignIn, GradeCreateIn, GradeOut, GradePictogramsOut, GradeUpdateIn
 from apps.grades.services import GradeService
 from apps.organizations.models import OrgRole
+from apps.pictograms import cache as library_cache
+from apps.pictograms.schemas import PictogramOut
+from apps.pictograms.services import PictogramService
+from core.conditional import conditional, etag_matches, instance_etag, make_etag, not_modified, page_etag
+from core.media import media_url_epoch
 from core.permissions import check_role_or_raise
 from core.schemas import ErrorOut
 
@@ -27,6 +33,7 @@ def create_grade(request, org_id: int, payload: GradeCreateIn):
     "/organizations/{org_id}/grades",
     response=list[GradeOut],
 )
+@conditional(page_etag)
 @paginate(LimitOffsetPagination)
 def list_grades(request, org_id: int):
     """List grades in an organization. Requires membership."""
@@ -62,6 +69,7 @@ def delete_grade(request, grade_id: int):
     "/grades/{grade_id}",
     response={200: GradeOut, 403: ErrorOut, 404: ErrorOut},
 )
+@conditional(instance_etag)
 def get_grade(request, grade_id: int):
     """Get a grade by ID. Requires membership in the grade's org."""
     grade = GradeService.get_grade(grade_id)
@@ -69,6 +77,39 @@ def get_grade(request, grade_id: int):
     return 200, grade
 
 
+@router.get(
+    "/grades/{grade_id}/pictograms",
+    response={200: GradePictogramsOut, 403: ErrorOut, 404: ErrorOut},
+)
+def get_grade_pictograms(request, grade_id: int):
+    """Pictograms of every citizen in a grade: shared global+org tier plus a per-citizen map.
+
+    Requires membership in the grade's org. The ETag comes from the library
+    cache version stamps, so revalidation never queries pictograms.
+    """
+    grade = GradeService.get_grade(grade_id)
+    check_role_or_raise(request.auth, grade.organization_id, min_role=OrgRole.MEMBER)
+    citizen_ids = GradeService.list_citizen_ids(grade)
+
+    scopes = library_cache.library_scopes(grade.organization_id)
+    scopes += [library_cache.citizen_scope(citizen_id) for citizen_id in citizen_ids]
+    etag = make_etag("grade-pictograms", grade.pk, citizen_ids, library_cache.get_versions(scopes), media_url_epoch())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    shared, by_citizen = PictogramService.list_grade_pictograms(grade.organization_id, citizen_ids)
+    body = {
+        "shared": [PictogramOut.from_orm(p).model_dump() for p in shared],
+        "citizens": {
+            citizen_id: [PictogramOut.from_orm(p).model_dump() for p in pictograms]
+            for citizen_id, pictograms in by_citizen.items()
+        },
+    }
+    response = JsonResponse(body)
+    response["ETag"] = etag
+    return response
+
+
 @router.post(
     "/grades/{grade_id}/citizens",
     response={200: GradeOut, 400: ErrorOut, 403: ErrorOut, 404: ErrorOut},
@@ -3,6 +3,8 @@
 from ninja import Schema
 from pydantic import Field
 
+from apps.pictograms.schemas import PictogramOut
+
 
 class GradeCreateIn(Schema):
     name: str = Field(min_length=1, max_length=255)
@@ -20,3 +22,10 @@ class GradeOut(Schema):
 
 class GradeCitizenAssignIn(Schema):
     citizen_ids: list[int]
+
+
+class GradePictogramsOut(Schema):
+    # Global and organization pictograms, visible to every citizen in the grade
+    shared: list[PictogramOut]
+    # Citizen ID -> that citizen's personal pictograms
+    citizens: dict[int, list[PictogramOut]]
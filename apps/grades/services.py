@@ -23,6 +23,10 @@ class GradeService:
         except Grade.DoesNotExist as e:
             raise ResourceNotFoundError(f"Grade {grade_id} not found.") from e
 
+    @staticmethod
+    def list_citizen_ids(grade: Grade) -> list[int]:
+        return list(grade.citizens.order_by("pk").values_list("pk", flat=True))
+
     @staticmethod
     def create_grade(*, name: str, org_id: int) -> Grade:
         return Grade.objects.create(name=name, organization_id=org_id)
@@ -36,7 +40,7 @@ class GradeService:
         grade = GradeService.get_grade(grade_id)
         if name is not None:
             grade.name = name
-            grade.save(update_fields=["name"])
+            grade.save(update_fields=["name", "updated_at"])
         return grade
 
     @staticmethod
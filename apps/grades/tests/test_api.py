@@ -63,6 +63,20 @@ class TestGradeAPI:
         assert response.status_code == 200
         assert response.json()["name"] == "Class 4A"
 
+    def test_rename_invalidates_etags(self, client, org, owner):
+        grade = Grade.objects.create(name="Class 3A", organization=org)
+        headers = auth_header_for_user(owner)
+        url = f"/api/v1/grades/{grade.id}"
+        list_url = f"/api/v1/organizations/{org.id}/grades"
+        etag = client.get(url, **headers)["ETag"]
+        list_etag = client.get(list_url, **headers)["ETag"]
+
+        client.patch(url, data={"name": "Class 4A"}, content_type="application/json", **headers)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag, **headers)
+        assert response.status_code == 200
+        assert response.json()["name"] == "Class 4A"
+        assert client.get(list_url, HTTP_IF_NONE_MATCH=list_etag, **headers).status_code == 200
+
     def test_delete_grade(self, client, org, owner):
         grade = Grade.objects.create(name="Class 3A", organization=org)
         headers = auth_header_for_user(owner)
@@ -211,3 +225,62 @@ class TestCrossOrgCitizenAssignment:
         )
         assert response.status_code == 200
         assert grade.citizens.count() == 2
+
+
+@pytest.mark.django_db
+class TestGradePictogramsAPI:
+    def _setup(self, org, second_org):
+        from apps.pictograms.models import Pictogram
+
+        grade = Grade.objects.create(name="Class 3A", organization=org)
+        alice = Citizen.objects.create(first_name="Alice", last_name="A", organization=org)
+        bob = Citizen.objects.create(first_name="Bob", last_name="B", organization=org)
+        outsider = Citizen.objects.create(first_name="Carl", last_name="C", organization=org)
+        grade.citizens.set([alice, bob])
+
+        url = "https://example.com/p.png"
+        Pictogram.objects.create(name="Global", image_url=url)
+        Pictogram.objects.create(name="Org", image_url=url, organization=org)
+        Pictogram.objects.create(name="Other org", image_url=url, organization=second_org)
+        Pictogram.objects.create(name="Alice's", image_url=url, organization=org, citizen=alice)
+        Pictogram.objects.create(name="Carl's", image_url=url, organization=org, citizen=outsider)
+        return grade, alice, bob
+
+    def test_returns_shared_tier_and_per_citizen_delta(self, client, org, second_org, member):
+        grade, alice, bob = self._setup(org, second_org)
+        response = client.get(f"/api/v1/grades/{grade.id}/pictograms", **auth_header_for_user(member))
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["name"] for p in data["shared"]] == ["Global", "Org"]
+        assert {int(k): [p["name"] for p in v] for k, v in data["citizens"].items()} == {
+            alice.id: ["Alice's"],
+            bob.id: [],
+        }
+
+    def test_query_count_does_not_grow_with_citizens(
+        self, client, org, second_org, member, django_assert_max_num_queries
+    ):
+        grade, _alice, _bob = self._setup(org, second_org)
+        for i in range(5):
+            grade.citizens.add(Citizen.objects.create(first_name=f"Kid{i}", last_name="K", organization=org))
+        # user, grade, membership, citizen IDs, pictograms
+        with django_assert_max_num_queries(5):
+            response = client.get(f"/api/v1/grades/{grade.id}/pictograms", **auth_header_for_user(member))
+        assert response.status_code == 200
+
+    def test_revalidation_and_invalidation(self, client, org, second_org, member):
+        from apps.pictograms.models import Pictogram
+
+        grade, alice, _bob = self._setup(org, second_org)
+        headers = auth_header_for_user(member)
+        url = f"/api/v1/grades/{grade.id}/pictograms"
+        etag = client.get(url, **headers)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag, **headers).status_code == 304
+
+        Pictogram.objects.create(name="New", image_url="https://example.com/n.png", organization=org, citizen=alice)
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag, **headers).status_code == 200
+
+    def test_non_member_is_rejected(self, client, org, second_org, non_member):
+        grade, _alice, _bob = self._setup(org, second_org)
+        response = client.get(f"/api/v1/grades/{grade.id}/pictograms", **auth_header_for_user(non_member))
+        assert response.status_code == 403
@@ -45,7 +45,7 @@ class OrganizationService:
         """Update an organization's name."""
         org = OrganizationService.get_organization(org_id)
         org.name = name
-        org.save(update_fields=["name"])
+        org.save(update_fields=["name", "updated_at"])
         return org
 
     @staticmethod
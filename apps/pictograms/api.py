@@ -1,18 +1,57 @@
 """Pictogram API endpoints."""
 
-from ninja import File, Form, Router
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.translation.trans_real import parse_accept_lang_header
+from ninja import File, Form, Query, Router
+from ninja.decorators import decorate_view
 from ninja.files import UploadedFile
-from ninja.pagination import LimitOffsetPagination, paginate
+from ninja.pagination import LimitOffsetPagination
 
 from apps.citizens.services import CitizenService
 from apps.organizations.models import OrgRole
-from apps.pictograms.schemas import PictogramCreateIn, PictogramOut, PictogramUpdateIn
-from apps.pictograms.services import PictogramService
-from core.permissions import check_org_or_superuser, check_role_or_raise
+from apps.pictograms import atlas as atlases
+from apps.pictograms import autocomplete, imports, usage
+from apps.pictograms import cache as library_cache
+from apps.pictograms.models import JobStatus
+from apps.pictograms.schemas import (
+    AtlasFrameOut,
+    PictogramAtlasOut,
+    PictogramBulkCreateIn,
+    PictogramBulkDeleteIn,
+    PictogramBulkDeleteOut,
+    PictogramBulkUpdateIn,
+    PictogramChangesOut,
+    PictogramCloneIn,
+    PictogramCloneJobOut,
+    PictogramCreateIn,
+    PictogramDuplicateOut,
+    PictogramImportJobOut,
+    PictogramLookupIn,
+    PictogramOut,
+    PictogramPageOut,
+    PictogramSuggestionOut,
+    PictogramUpdateIn,
+    PictogramUploadOut,
+    PictogramUsageIn,
+)
+from apps.pictograms.services import ORDERINGS, PictogramService
+from core import imagehash
+from core.conditional import conditional, etag_matches, instance_etag, make_etag, not_modified
+from core.exceptions import BadRequestError, ResourceNotFoundError
+from core.media import media_url, media_url_epoch, serve_media
+from core.permissions import check_org_or_superuser, check_role_or_raise, check_roles_or_raise
 from core.schemas import ErrorOut
+from core.uploadhandlers import ARCHIVE_UPLOAD, AUDIO_UPLOAD, IMAGE_UPLOAD, validated_uploads
 
 router = Router(tags=["pictograms"])
 
+MAX_MULTI_GET_IDS = 1000
+
 
 @router.post("", response={201: PictogramOut, 403: ErrorOut, 422: ErrorOut})
 def create_pictogram(request, payload: PictogramCreateIn):
@@ -38,27 +77,313 @@ def create_pictogram(request, payload: PictogramCreateIn):
     return 201, pictogram
 
 
-@router.get("", response=list[PictogramOut])
-@paginate(LimitOffsetPagination)
+def _check_write_scopes(user, org_ids: Sequence[int | None], *, action: str) -> None:
+    """Writes in organizations need member role in each (one query); global pictograms (``None``) need a superuser."""
+    if any(org_id is None for org_id in org_ids):
+        check_org_or_superuser(user, None, min_role=OrgRole.MEMBER, action=f"{action} global pictograms")
+    check_roles_or_raise(user, {org_id for org_id in org_ids if org_id is not None}, min_role=OrgRole.MEMBER)
+
+
+@router.post("/bulk", response={201: list[PictogramOut], 403: ErrorOut, 404: ErrorOut, 422: ErrorOut})
+def bulk_create_pictograms(request, payload: PictogramBulkCreateIn):
+    """Create up to ``MAX_BULK_PICTOGRAMS`` pictograms in one request, all or nothing.
+
+    Same permissions as ``POST /pictograms`` per item, checked with one
+    membership query. Image and sound generation run as one background batch;
+    items with ``generate_image`` need an ``image_url`` fallback.
+    """
+    items = [item.model_dump() for item in payload.items]
+    citizens = CitizenService.get_citizens(item["citizen_id"] for item in items if item["citizen_id"])
+    scopes: list[int | None] = []
+    for item in items:
+        if item["citizen_id"]:
+            citizen_org_id = citizens[item["citizen_id"]].organization_id
+            item["organization_id"] = item["organization_id"] or citizen_org_id
+            scopes.append(citizen_org_id)
+        else:
+            scopes.append(item["organization_id"])
+    _check_write_scopes(request.auth, scopes, action="create")
+
+    return 201, PictogramService.bulk_create_pictograms(items)
+
+
+@router.patch("/bulk", response={200: list[PictogramOut], 403: ErrorOut, 404: ErrorOut, 422: ErrorOut})
+def bulk_update_pictograms(request, payload: PictogramBulkUpdateIn):
+    """Update many pictograms in one statement, all or nothing.
+
+    Each item names a pictogram ``id`` and the fields to change, as in
+    ``PATCH /pictograms/{id}``. Every distinct organization is authorized
+    once; AI image and sound regeneration run as one background batch.
+    """
+    items = [item.model_dump() for item in payload.items]
+    pictograms = PictogramService.get_pictograms([item["id"] for item in items])
+    _check_write_scopes(request.auth, [p.organization_id for p in pictograms], action="update")
+    return 200, PictogramService.bulk_update_pictograms(pictograms, items)
+
+
+@router.post("/bulk-delete", response={200: PictogramBulkDeleteOut, 403: ErrorOut, 422: ErrorOut})
+def bulk_delete_pictograms(request, payload: PictogramBulkDeleteIn):
+    """Delete many pictograms in one batch. IDs that no longer exist are reported as ``missing``.
+
+    Every distinct organization is authorized once; nothing is deleted if
+    any pictogram is not deletable by the caller.
+    """
+    pictograms = PictogramService.get_pictograms(payload.ids)
+    _check_write_scopes(request.auth, [p.organization_id for p in pictograms], action="delete")
+    deleted = PictogramService.bulk_delete_pictograms(pictograms)
+    found = set(deleted)
+    return 200, {"deleted": deleted, "missing": [pk for pk in dict.fromkeys(payload.ids) if pk not in found]}
+
+
+@router.post(
+    "/clone",
+    response={201: PictogramCloneJobOut, 202: PictogramCloneJobOut, 403: ErrorOut, 404: ErrorOut, 422: ErrorOut},
+)
+def clone_pictograms(request, payload: PictogramCloneIn):
+    """Copy an organization's (or citizen's) pictograms into another organization.
+
+    Rows are copied server-side and share the stored files, so no media is
+    re-uploaded. Requires member role in both the source and the target.
+    Returns the clone job: 201 when done, or 202 when a large library is
+    copied in the background; poll ``GET /pictograms/clone/{job_id}``.
+    """
+    source_org_id = payload.source_organization_id
+    if payload.source_citizen_id:
+        source_org_id = CitizenService.get_citizen(payload.source_citizen_id).organization_id
+    check_roles_or_raise(
+        request.auth, {org_id for org_id in (source_org_id, payload.target_organization_id) if org_id},
+        min_role=OrgRole.MEMBER,
+    )
+
+    job = PictogramService.clone_library(
+        user=request.auth,
+        target_organization_id=payload.target_organization_id,
+        source_organization_id=payload.source_organization_id,
+        source_citizen_id=payload.source_citizen_id,
+    )
+    return (201 if job.status == JobStatus.DONE else 202), job
+
+
+@router.get("/clone/{job_id}", response={200: PictogramCloneJobOut, 404: ErrorOut})
+def get_clone_job(request, job_id: int):
+    """Status of a library clone started by the caller."""
+    return 200, PictogramService.get_clone_job(job_id, request.auth)
+
+
+@router.get("", response=PictogramPageOut)
 def list_pictograms(
     request,
+    pagination: Query[LimitOffsetPagination.Input],
     organization_id: int | None = None,
     citizen_id: int | None = None,
     search: str | None = None,
+    ids: str | None = None,
+    ordering: str = "name",
 ):
-    """List pictograms. Optionally filter by citizen, organization, and/or search term."""
+    """List pictograms. Optionally filter by citizen, organization, and/or search term.
+
+    ``ordering=popular`` lists the most used pictograms first, from ranks
+    precomputed out of ``POST /pictograms/usage`` events (see ``apps/pictograms/usage.py``).
+
+    Pages are served from the versioned library cache; see ``apps/pictograms/cache.py``.
+    The same version stamp doubles as the ETag, so revalidation costs no DB query.
+
+    With ``ids=1,2,3`` the given pictograms are returned instead, in input
+    order (unknown IDs omitted; other filters and pagination ignored). Use
+    ``POST /pictograms/lookup`` for lists too long for a URL.
+    """
+    if ids is not None:
+        return _get_many(request, _parse_ids(ids))
+    if ordering not in ORDERINGS:
+        raise BadRequestError(f"ordering must be one of: {', '.join(ORDERINGS)}.")
+
     if citizen_id:
         citizen = CitizenService.get_citizen(citizen_id)
         check_role_or_raise(request.auth, citizen.organization_id, min_role=OrgRole.MEMBER)
-        return PictogramService.list_pictograms(
-            organization_id=citizen.organization_id, citizen_id=citizen_id, search=search
+        organization_id = citizen.organization_id
+    elif organization_id:
+        check_role_or_raise(request.auth, organization_id, min_role=OrgRole.MEMBER)
+
+    limit, offset = pagination.limit, pagination.offset
+    stamp = library_cache.library_stamp(organization_id, citizen_id, popular=ordering == "popular")
+    # Signed media URLs in the body change per expiry bucket; so must the validator.
+    etag = make_etag(
+        "pictograms", organization_id, citizen_id, search, ordering, limit, offset, stamp, media_url_epoch()
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    def build_page() -> dict:
+        qs = PictogramService.list_pictograms(
+            organization_id=organization_id, citizen_id=citizen_id, search=search, ordering=ordering
         )
-    if organization_id:
+        return {
+            "items": [PictogramOut.from_orm(p).model_dump() for p in qs[offset : offset + limit]],
+            "count": qs.count(),
+        }
+
+    page = library_cache.get_library_page(
+        organization_id=organization_id,
+        citizen_id=citizen_id,
+        search=search,
+        limit=limit,
+        offset=offset,
+        build=build_page,
+        stamp=stamp,
+        ordering=ordering,
+    )
+    response = JsonResponse(page)
+    response["ETag"] = etag
+    return response
+
+
+@router.get("/changes", response={200: PictogramChangesOut, 403: ErrorOut, 404: ErrorOut})
+def list_pictogram_changes(
+    request,
+    since: datetime | None = None,
+    organization_id: int | None = None,
+    citizen_id: int | None = None,
+):
+    """Delta sync: pictograms inserted/updated and IDs deleted since the ``since`` cursor.
+
+    Pass the ``cursor`` from the previous response as ``since``. The cursor
+    trails the response by a safety margin, so recent changes can be
+    delivered twice; apply them idempotently. Scoping and permissions match
+    ``GET /pictograms``.
+    """
+    if citizen_id:
+        citizen = CitizenService.get_citizen(citizen_id)
+        check_role_or_raise(request.auth, citizen.organization_id, min_role=OrgRole.MEMBER)
+        organization_id = citizen.organization_id
+    elif organization_id:
+        check_role_or_raise(request.auth, organization_id, min_role=OrgRole.MEMBER)
+
+    upserted, deleted, cursor = PictogramService.list_changes(
+        organization_id=organization_id, citizen_id=citizen_id, since=since
+    )
+    return 200, {"cursor": cursor, "upserted": list(upserted), "deleted": deleted}
+
+
+@router.get("/autocomplete", response={200: list[PictogramSuggestionOut], 400: ErrorOut, 403: ErrorOut, 404: ErrorOut})
+def autocomplete_pictograms(
+    request,
+    q: str = Query(..., min_length=1, max_length=autocomplete.MAX_QUERY_LENGTH),
+    organization_id: int | None = None,
+    citizen_id: int | None = None,
+    limit: int = autocomplete.DEFAULT_LIMIT,
+):
+    """Search-as-you-type name suggestions, tolerant of one typo.
+
+    Served from per-process prefix indexes (see ``apps/pictograms/autocomplete.py``),
+    so keystrokes do not query pictograms. Scoping and permissions match
+    ``GET /pictograms``; exact prefix matches rank first.
+    """
+    if not 1 <= limit <= autocomplete.MAX_LIMIT:
+        raise BadRequestError(f"limit must be between 1 and {autocomplete.MAX_LIMIT}.")
+    if citizen_id:
+        citizen = CitizenService.get_citizen(citizen_id)
+        check_role_or_raise(request.auth, citizen.organization_id, min_role=OrgRole.MEMBER)
+        organization_id = citizen.organization_id
+    elif organization_id:
         check_role_or_raise(request.auth, organization_id, min_role=OrgRole.MEMBER)
-    return PictogramService.list_pictograms(organization_id=organization_id, search=search)
+
+    suggestions = autocomplete.suggest(q, organization_id=organization_id, citizen_id=citizen_id, limit=limit)
+    return 200, [{"id": s.pk, "name": s.name} for s in suggestions]
+
+
+def _parse_ids(raw: str) -> list[int]:
+    """Parse a comma-separated list of pictogram IDs (``"1,2,3"``)."""
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise BadRequestError("ids must be a comma-separated list of integers.") from None
+    if not ids:
+        raise BadRequestError("ids must not be empty.")
+    return ids
 
 
-@router.post("/upload", response={201: PictogramOut, 403: ErrorOut, 422: ErrorOut})
+def _get_many(request, pictogram_ids: list[int]) -> HttpResponse:
+    """Pictograms by ID in input order: one row query plus one membership query for all orgs."""
+    if len(pictogram_ids) > MAX_MULTI_GET_IDS:
+        raise BadRequestError(f"At most {MAX_MULTI_GET_IDS} IDs per request.")
+    pictograms = PictogramService.get_pictograms(pictogram_ids)
+    check_roles_or_raise(
+        request.auth, {p.organization_id for p in pictograms if p.organization_id}, min_role=OrgRole.MEMBER
+    )
+
+    etag = make_etag("pictograms-by-id", [(p.pk, p.updated_at) for p in pictograms], media_url_epoch())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = JsonResponse(
+        {"items": [PictogramOut.from_orm(p).model_dump() for p in pictograms], "count": len(pictograms)}
+    )
+    response["ETag"] = etag
+    return response
+
+
+@router.post("/lookup", response={200: PictogramPageOut, 400: ErrorOut, 403: ErrorOut})
+def lookup_pictograms(request, payload: PictogramLookupIn):
+    """``GET /pictograms?ids=...`` for long ID lists, with the IDs in the body."""
+    return _get_many(request, payload.ids)
+
+
+@router.post("/usage", response={204: None, 403: ErrorOut, 422: ErrorOut})
+def record_pictogram_usage(request, payload: PictogramUsageIn):
+    """Record uses of pictograms (e.g. picked in a picker); repeat an ID to count it again.
+
+    Counts are aggregated in memory and written in batches, feeding
+    ``GET /pictograms?ordering=popular``. Unknown IDs are ignored.
+    """
+    pictograms = PictogramService.get_pictograms(payload.ids)
+    check_roles_or_raise(
+        request.auth, {p.organization_id for p in pictograms if p.organization_id}, min_role=OrgRole.MEMBER
+    )
+    known = {p.pk for p in pictograms}
+    usage.record(pk for pk in payload.ids if pk in known)
+    return 204, None
+
+
+@router.get("/atlas", response={200: PictogramAtlasOut, 400: ErrorOut, 403: ErrorOut})
+def get_pictogram_atlas(request, ids: str, size: int = 64):
+    """Sprite sheet of the requested pictograms' thumbnails plus a frame map.
+
+    Atlases are stored by a hash of their members and rebuilt lazily when any
+    member changes; the ETag is derived from that hash. Pictograms without a
+    stored image (external URLs) are listed in ``missing``.
+    """
+    if size not in atlases.ATLAS_SIZES:
+        raise BadRequestError(f"size must be one of {', '.join(map(str, atlases.ATLAS_SIZES))}.")
+    pictogram_ids = _parse_ids(ids)
+    if len(pictogram_ids) > atlases.MAX_ATLAS_PICTOGRAMS:
+        raise BadRequestError(f"At most {atlases.MAX_ATLAS_PICTOGRAMS} pictograms per atlas.")
+
+    pictograms = PictogramService.get_pictograms(pictogram_ids)
+    check_roles_or_raise(
+        request.auth, {p.organization_id for p in pictograms if p.organization_id}, min_role=OrgRole.MEMBER
+    )
+
+    etag = make_etag("atlas", atlases.atlas_digest(pictograms, size), media_url_epoch())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    atlas = atlases.get_or_build_atlas(pictograms, size)
+    found = {p.pk for p in pictograms}
+    frames: dict[int, AtlasFrameOut] = {pk: AtlasFrameOut(**frame) for pk, frame in atlas.frames.items()}
+    body = PictogramAtlasOut(
+        image_url=media_url(atlas.image_name),
+        size=atlas.size,
+        width=atlas.width,
+        height=atlas.height,
+        frames=frames,
+        missing=atlas.missing + [pk for pk in dict.fromkeys(pictogram_ids) if pk not in found],
+    )
+    response = JsonResponse(body.model_dump())
+    response["ETag"] = etag
+    return response
+
+
+@router.post("/upload", response={201: PictogramUploadOut, 403: ErrorOut, 422: ErrorOut})
+@decorate_view(validated_uploads(image=IMAGE_UPLOAD, sound=AUDIO_UPLOAD))
 def upload_pictogram(
     request,
     image: File[UploadedFile],
@@ -68,7 +393,11 @@ def upload_pictogram(
     sound: File[UploadedFile | None] = None,
     generate_sound: Form[bool] = True,
 ):
-    """Upload a pictogram with an image file and optional sound file."""
+    """Upload a pictogram with an image file and optional sound file.
+
+    ``possible_duplicates`` lists pictograms in the same library scope whose
+    image looks nearly identical, so clients can offer to reuse one.
+    """
     if citizen_id:
         citizen = CitizenService.get_citizen(citizen_id)
         if not organization_id:
@@ -88,7 +417,48 @@ def upload_pictogram(
         sound=sound,
         generate_sound=generate_sound,
     )
-    return 201, pictogram
+    similar = PictogramService.find_similar(
+        pictogram.image_hash, organization_id=organization_id, citizen_id=citizen_id, exclude_id=pictogram.pk
+    )
+    duplicates = [p.pk for p, _distance in similar]
+    return 201, PictogramUploadOut.from_orm(pictogram).model_copy(update={"possible_duplicates": duplicates})
+
+
+@router.post("/import", response={202: PictogramImportJobOut, 403: ErrorOut, 422: ErrorOut})
+@decorate_view(validated_uploads(archive=ARCHIVE_UPLOAD))
+def import_pictograms(
+    request,
+    archive: File[UploadedFile],
+    organization_id: Form[int | None] = None,
+    citizen_id: Form[int | None] = None,
+    generate_sound: Form[bool] = True,
+):
+    """Queue an import of a ZIP of images, with an optional ``manifest.json``/``manifest.csv`` of names and scopes.
+
+    ``organization_id``/``citizen_id`` are the default scope for files the
+    manifest does not mention. Permissions match ``POST /pictograms`` for
+    every scope involved and are checked before the job is queued. Poll
+    ``GET /pictograms/import/{job_id}`` for progress; entries succeed or
+    fail individually. See ``apps/pictograms/imports.py`` for the format.
+    """
+    with imports.open_archive(archive) as zf:
+        plan = imports.plan_import(zf, organization_id=organization_id, citizen_id=citizen_id)
+    _check_write_scopes(request.auth, [entry.organization_id for entry in plan.entries], action="create")
+    job = imports.start_import_job(
+        archive,
+        plan,
+        user=request.auth,
+        organization_id=organization_id,
+        citizen_id=citizen_id,
+        generate_sound=generate_sound,
+    )
+    return 202, job
+
+
+@router.get("/import/{job_id}", response={200: PictogramImportJobOut, 404: ErrorOut})
+def get_import_job(request, job_id: int):
+    """Progress and results of an import started by the caller."""
+    return 200, imports.get_import_job(job_id, request.auth)
 
 
 @router.patch("/{pictogram_id}", response={200: PictogramOut, 403: ErrorOut, 404: ErrorOut, 422: ErrorOut})
@@ -110,6 +480,7 @@ def update_pictogram(request, pictogram_id: int, payload: PictogramUpdateIn):
 
 
 @router.post("/{pictogram_id}/sound", response={200: PictogramOut, 403: ErrorOut, 404: ErrorOut, 422: ErrorOut})
+@decorate_view(validated_uploads(sound=AUDIO_UPLOAD))
 def upload_sound(request, pictogram_id: int, sound: File[UploadedFile]):
     """Upload or replace a sound file on an existing pictogram."""
     pictogram = PictogramService.get_pictogram(pictogram_id)
@@ -124,7 +495,85 @@ def upload_sound(request, pictogram_id: int, sound: File[UploadedFile]):
     return 200, pictogram
 
 
+@router.get("/{pictogram_id}/image", response={200: None, 403: ErrorOut, 404: ErrorOut})
+def get_pictogram_image(request, pictogram_id: int):
+    """Serve the uploaded image file. Same access rules as ``GET /pictograms/{id}``."""
+    pictogram = PictogramService.get_pictogram(pictogram_id)
+    if pictogram.organization_id:
+        check_role_or_raise(request.auth, pictogram.organization_id, min_role=OrgRole.MEMBER)
+    if not pictogram.image:
+        raise ResourceNotFoundError(f"Pictogram {pictogram_id} has no uploaded image.")
+    return serve_media(request, pictogram.image.name)
+
+
+def _sound_language(request, language: str | None) -> str:
+    """The requested TTS language: ``?language=``, else the best supported ``Accept-Language`` match."""
+    supported = settings.PICTOGRAM_SOUND_LANGUAGES
+    if language is not None:
+        language = language.lower()
+        if language not in supported:
+            raise BadRequestError(f"language must be one of: {', '.join(supported)}.")
+        return language
+    for code, _quality in parse_accept_lang_header(request.headers.get("Accept-Language", "")):
+        for candidate in (code, code.split("-")[0]):
+            if candidate in supported:
+                return candidate
+    return settings.PICTOGRAM_SOUND_LANGUAGE
+
+
+@router.get("/{pictogram_id}/sound", response={200: None, 400: ErrorOut, 403: ErrorOut, 404: ErrorOut})
+def get_pictogram_sound(request, pictogram_id: int, language: str | None = None):
+    """Serve the sound file. Same access rules as ``GET /pictograms/{id}``.
+
+    The language is picked by ``?language=`` or ``Accept-Language`` from
+    ``PICTOGRAM_SOUND_LANGUAGES``. Languages other than the default are
+    generated on the first request and stored, so later requests are
+    served like any other file.
+    """
+    pictogram = PictogramService.get_pictogram(pictogram_id)
+    if pictogram.organization_id:
+        check_role_or_raise(request.auth, pictogram.organization_id, min_role=OrgRole.MEMBER)
+    name = PictogramService.get_sound(pictogram, _sound_language(request, language))
+    if name is None:
+        raise ResourceNotFoundError(f"Pictogram {pictogram_id} has no sound.")
+    response = serve_media(request, name)
+    if language is None:
+        patch_vary_headers(response, ["Accept-Language"])
+    return response
+
+
+def _pictogram_etag(pictogram) -> str:
+    return make_etag(instance_etag(pictogram), media_url_epoch())
+
+
+@router.get(
+    "/{pictogram_id}/duplicates",
+    response={200: list[PictogramDuplicateOut], 400: ErrorOut, 403: ErrorOut, 404: ErrorOut},
+)
+def list_duplicates(request, pictogram_id: int, max_distance: int = imagehash.MAX_DISTANCE):
+    """Pictograms whose image is a near-duplicate of this one's, closest first.
+
+    Searches the library visible from the pictogram's own scope (global,
+    plus its organization, plus its citizen). Pictograms without an
+    uploaded image have no duplicates.
+    """
+    if not 0 <= max_distance <= imagehash.MAX_DISTANCE:
+        raise BadRequestError(f"max_distance must be between 0 and {imagehash.MAX_DISTANCE}.")
+    pictogram = PictogramService.get_pictogram(pictogram_id)
+    if pictogram.organization_id:
+        check_role_or_raise(request.auth, pictogram.organization_id, min_role=OrgRole.MEMBER)
+    similar = PictogramService.find_similar(
+        pictogram.image_hash,
+        organization_id=pictogram.organization_id,
+        citizen_id=pictogram.citizen_id,
+        exclude_id=pictogram.pk,
+        max_distance=max_distance,
+    )
+    return 200, [{"pictogram": p, "distance": distance} for p, distance in similar]
+
+
 @router.get("/{pictogram_id}", response={200: PictogramOut, 403: ErrorOut, 404: ErrorOut})
+@conditional(_pictogram_etag)
 def get_pictogram(request, pictogram_id: int):
     """Get a pictogram by ID. Org-scoped requires membership; global is open."""
     pictogram = PictogramService.get_pictogram(pictogram_id)
@@ -5,3 +5,6 @@ class PictogramsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.pictograms"
     verbose_name = "Pictograms"
+
+    def ready(self) -> None:
+        from apps.pictograms import signals  # noqa: F401 — register signal handlers
@@ -0,0 +1,103 @@
+"""Sprite-sheet atlases: many pictogram thumbnails packed into one WebP image.
+
+An atlas is addressed by a hash of its member set (pictogram ID, stored image
+name and ``updated_at``), so editing any member yields a new hash and the
+atlas is regenerated lazily on the next request. The frame map is stored next
+to the image so cache hits never decode pictures.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import math
+from dataclasses import dataclass
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.pictograms.models import Pictogram
+
+logger = logging.getLogger(__name__)
+
+ATLAS_DIR = "pictogram-atlases"
+ATLAS_SIZES = (64, 128)
+MAX_ATLAS_PICTOGRAMS = 256
+
+
+@dataclass
+class Atlas:
+    image_name: str
+    size: int
+    width: int
+    height: int
+    # pictogram ID -> {"x", "y", "w", "h"}
+    frames: dict[int, dict[str, int]]
+    # Pictograms without a locally stored image (external URLs, missing files)
+    missing: list[int]
+
+
+def atlas_digest(pictograms: list[Pictogram], size: int) -> str:
+    members = sorted((p.pk, p.image.name if p.image else "", p.updated_at.isoformat()) for p in pictograms)
+    return hashlib.sha256(json.dumps([size, members]).encode()).hexdigest()
+
+
+def _load(digest: str, size: int) -> Atlas | None:
+    meta_name = f"{ATLAS_DIR}/{digest}.json"
+    if not default_storage.exists(meta_name):
+        return None
+    with default_storage.open(meta_name, "rb") as fh:
+        meta = json.load(fh)
+    return Atlas(
+        image_name=meta["image_name"],
+        size=size,
+        width=meta["width"],
+        height=meta["height"],
+        frames={int(pk): frame for pk, frame in meta["frames"].items()},
+        missing=meta["missing"],
+    )
+
+
+def get_or_build_atlas(pictograms: list[Pictogram], size: int) -> Atlas:
+    """Return the atlas for *pictograms* at *size* px, building and storing it on a miss."""
+    digest = atlas_digest(pictograms, size)
+    atlas = _load(digest, size)
+    if atlas is not None:
+        return atlas
+
+    thumbnails: list[tuple[int, Image.Image]] = []
+    missing: list[int] = []
+    for p in sorted(pictograms, key=lambda p: p.pk):
+        if not p.image:
+            missing.append(p.pk)
+            continue
+        try:
+            with default_storage.open(p.image.name, "rb") as fh:
+                img = ImageOps.exif_transpose(Image.open(fh)).convert("RGBA")
+                img.thumbnail((size, size))
+        except (FileNotFoundError, UnidentifiedImageError, OSError):
+            logger.warning("Skipping pictogram %s in atlas: image unreadable", p.pk)
+            missing.append(p.pk)
+            continue
+        thumbnails.append((p.pk, img))
+
+    columns = max(1, math.ceil(math.sqrt(len(thumbnails))))
+    rows = max(1, math.ceil(len(thumbnails) / columns))
+    sheet = Image.new("RGBA", (columns * size, rows * size), (0, 0, 0, 0))
+    frames: dict[int, dict[str, int]] = {}
+    for index, (pk, img) in enumerate(thumbnails):
+        x, y = (index % columns) * size, (index // columns) * size
+        sheet.paste(img, (x, y))
+        frames[pk] = {"x": x, "y": y, "w": img.width, "h": img.height}
+
+    buf = io.BytesIO()
+    sheet.save(buf, format="WEBP", lossless=True)
+    image_name = default_storage.save(f"{ATLAS_DIR}/{digest}.webp", ContentFile(buf.getvalue()))
+    atlas = Atlas(
+        image_name=image_name, size=size, width=sheet.width, height=sheet.height, frames=frames, missing=missing
+    )
+    meta = {k: v for k, v in vars(atlas).items() if k != "size"}
+    default_storage.save(f"{ATLAS_DIR}/{digest}.json", ContentFile(json.dumps(meta).encode()))
+    logger.info("Built %dpx pictogram atlas %s with %d frames", size, digest, len(frames))
+    return atlas
@@ -0,0 +1,204 @@
+"""In-process, typo-tolerant prefix autocomplete for pictogram names.
+
+Each library scope (global, organization, citizen; see ``cache.py``) gets a
+``PrefixIndex``: a sorted array of ``(key, pk)`` pairs where every word
+start of a name is a key, so ``"app"`` finds ``"Red apple"``. A prefix is a
+contiguous range found with ``bisect``. If too few names match exactly,
+variants of the query one edit away (deletion, insertion, substitution,
+transposition) are tried as prefixes too.
+
+Indexes carry the library cache version they were built at. A read checks
+the versions (one cache round trip) and rebuilds stale scopes with one
+query. Saves and deletes in this process are applied to the index on
+commit instead, if nothing else changed the scope in between.
+"""
+
+import bisect
+import threading
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import partial
+
+from django.db import transaction
+
+from apps.pictograms import cache as library_cache
+from apps.pictograms.models import Pictogram
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# Typos are only tolerated once the query is long enough to be specific, and
+# only up to MAX_FUZZY_LENGTH: the one-edit variants grow with the square of
+# the query length.
+MIN_FUZZY_LENGTH = 3
+MAX_FUZZY_LENGTH = 24
+# Longest accepted query; longer names still match by their first characters.
+MAX_QUERY_LENGTH = 64
+# Per-process bound on indexed scopes (least recently used are dropped).
+MAX_INDEXES = 256
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _keys(name: str) -> list[str]:
+    """Every word-start suffix of the normalized name."""
+    normalized = normalize(name)
+    return [normalized[i:] for i in range(len(normalized)) if i == 0 or normalized[i - 1] == " "]
+
+
+def _edits(query: str, alphabet: set[str]) -> set[str]:
+    """All strings one edit away from *query*."""
+    splits = [(query[:i], query[i:]) for i in range(len(query) + 1)]
+    deletes = {a + b[1:] for a, b in splits if b}
+    transposes = {a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1}
+    replaces = {a + c + b[1:] for a, b in splits if b for c in alphabet}
+    inserts = {a + c + b for a, b in splits for c in alphabet}
+    return (deletes | transposes | replaces | inserts) - {query, ""}
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    pk: int
+    name: str
+    # 0 for an exact prefix match, 1 for a match one edit away
+    distance: int
+
+
+class PrefixIndex:
+    """Sorted ``(key, pk)`` array over the pictogram names of one scope."""
+
+    def __init__(self, rows: list[tuple[int, str]], version: int) -> None:
+        self.version = version
+        self.names: dict[int, str] = dict(rows)
+        self.entries: list[tuple[str, int]] = sorted((key, pk) for pk, name in rows for key in _keys(name))
+        self.alphabet: set[str] = {c for key, _pk in self.entries for c in key}
+
+    def add(self, pk: int, name: str) -> None:
+        self.remove(pk)
+        self.names[pk] = name
+        for key in _keys(name):
+            bisect.insort(self.entries, (key, pk))
+            self.alphabet.update(key)
+
+    def remove(self, pk: int) -> None:
+        name = self.names.pop(pk, None)
+        if name is None:
+            return
+        for key in _keys(name):
+            index = bisect.bisect_left(self.entries, (key, pk))
+            if index < len(self.entries) and self.entries[index] == (key, pk):
+                del self.entries[index]
+
+    def _prefix(self, prefix: str, limit: int, found: dict[int, int], distance: int) -> None:
+        index = bisect.bisect_left(self.entries, (prefix,))
+        while index < len(self.entries) and len(found) < limit:
+            key, pk = self.entries[index]
+            if not key.startswith(prefix):
+                return
+            found.setdefault(pk, distance)
+            index += 1
+
+    def search(self, query: str, limit: int) -> list[Suggestion]:
+        query = normalize(query)
+        found: dict[int, int] = {}
+        self._prefix(query, limit, found, 0)
+        if len(found) < limit and MIN_FUZZY_LENGTH <= len(query) <= MAX_FUZZY_LENGTH:
+            for variant in sorted(_edits(query, self.alphabet)):
+                self._prefix(variant, limit, found, 1)
+                if len(found) >= limit:
+                    break
+        return [Suggestion(pk, self.names[pk], distance) for pk, distance in found.items()]
+
+
+_lock = threading.Lock()
+_indexes: OrderedDict[str, PrefixIndex] = OrderedDict()
+
+
+def _scope_rows(scope: str) -> list[tuple[int, str]]:
+    kind, _, value = scope.partition(":")
+    if kind == "citizen":
+        qs = Pictogram.objects.filter(citizen_id=int(value))
+    elif kind == "org":
+        qs = Pictogram.objects.filter(organization_id=int(value), citizen__isnull=True)
+    else:
+        qs = Pictogram.objects.filter(organization__isnull=True, citizen__isnull=True)
+    return list(qs.values_list("pk", "name"))
+
+
+def _get_index(scope: str, version: int) -> PrefixIndex:
+    with _lock:
+        index = _indexes.get(scope)
+        if index is not None and index.version == version:
+            _indexes.move_to_end(scope)
+            return index
+    # Built outside the lock; a concurrent rebuild of the same scope is harmless.
+    index = PrefixIndex(_scope_rows(scope), version)
+    with _lock:
+        _indexes[scope] = index
+        _indexes.move_to_end(scope)
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def suggest(
+    query: str, *, organization_id: int | None = None, citizen_id: int | None = None, limit: int = DEFAULT_LIMIT
+) -> list[Suggestion]:
+    """Top *limit* names in the library visible to the scope, exact prefix matches first."""
+    scopes = library_cache.library_scopes(organization_id, citizen_id)
+    versions = library_cache.get_versions(scopes)
+    suggestions: list[Suggestion] = []
+    for scope, version in zip(scopes, versions, strict=True):
+        index = _get_index(scope, version)
+        with _lock:
+            suggestions.extend(index.search(query, limit))
+    suggestions.sort(key=lambda s: (s.distance, normalize(s.name), s.pk))
+    return suggestions[:limit]
+
+
+def _apply(scope: str, changes: list[tuple[int, str | None]]) -> None:
+    """Apply one committed write's changes if it is the only write since the index was built.
+
+    ``library_cache.invalidate`` bumps the scope version twice per write
+    (immediately and on commit), so an index at ``v`` that sees ``v + 2``
+    missed nothing else. A bulk write bumps once for all its rows, so its
+    changes must be applied together. Anything else leaves the index
+    stale, to be rebuilt on the next read. A ``None`` name removes the pk.
+    """
+    (current,) = library_cache.get_versions([scope])
+    with _lock:
+        index = _indexes.get(scope)
+        if index is None or current != index.version + 2:
+            return
+        for pk, name in changes:
+            if name is None:
+                index.remove(pk)
+            else:
+                index.add(pk, name)
+        index.version = current
+
+
+def on_saved(pictogram: Pictogram) -> None:
+    scope, pk, name = library_cache.pictogram_scope(pictogram), pictogram.pk, pictogram.name
+    transaction.on_commit(lambda: _apply(scope, [(pk, name)]))
+
+
+def on_deleted(pictogram: Pictogram) -> None:
+    on_deleted_many([pictogram])
+
+
+def on_deleted_many(pictograms: Iterable[Pictogram]) -> None:
+    """Remove pictograms deleted by one write (one cache bump per scope) on commit."""
+    by_scope: dict[str, list[tuple[int, str | None]]] = defaultdict(list)
+    for pictogram in pictograms:
+        by_scope[library_cache.pictogram_scope(pictogram)].append((pictogram.pk, None))
+    for scope, changes in by_scope.items():
+        transaction.on_commit(partial(_apply, scope, changes))
+
+
+def clear() -> None:
+    """Drop all in-process indexes (tests)."""
+    with _lock:
+        _indexes.clear()
@@ -0,0 +1,130 @@
+"""Versioned cache for resolved pictogram libraries.
+
+Every pictogram scope (global, organization, citizen) owns a version counter
+in the cache. Library page keys embed the versions of all scopes the page was
+built from, so bumping a counter makes stale pages unreachable without
+scanning or deleting keys — they simply expire.
+"""
+
+import hashlib
+import time
+from collections.abc import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+GLOBAL_SCOPE = "global"
+# Not a pictogram scope: bumped when popularity ranks are recomputed (see usage.py).
+POPULARITY_SCOPE = "popularity"
+
+
+def org_scope(organization_id: int) -> str:
+    return f"org:{organization_id}"
+
+
+def citizen_scope(citizen_id: int) -> str:
+    return f"citizen:{citizen_id}"
+
+
+def library_scopes(organization_id: int | None = None, citizen_id: int | None = None) -> list[str]:
+    """Scopes read by a library listing. Mirrors the tiers in ``PictogramService.list_pictograms``."""
+    scopes = [GLOBAL_SCOPE]
+    if organization_id:
+        scopes.append(org_scope(organization_id))
+    if citizen_id:
+        scopes.append(citizen_scope(citizen_id))
+    return scopes
+
+
+def pictogram_scope(pictogram) -> str:
+    """The single scope a pictogram belongs to (citizen > org > global)."""
+    if pictogram.citizen_id:
+        return citizen_scope(pictogram.citizen_id)
+    if pictogram.organization_id:
+        return org_scope(pictogram.organization_id)
+    return GLOBAL_SCOPE
+
+
+def _version_key(scope: str) -> str:
+    return f"pictograms:version:{scope}"
+
+
+def _new_version() -> int:
+    # Seeded from the clock so a counter that was evicted never restarts at a
+    # value an older (stale) page key may still be stored under.
+    return time.time_ns()
+
+
+def get_versions(scopes: list[str]) -> list[int]:
+    """Return the current version of each scope, initializing missing counters."""
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_version(), timeout=None)
+        found.update(cache.get_many(missing))
+    return [found[key] for key in keys]
+
+
+def library_stamp(organization_id: int | None = None, citizen_id: int | None = None, *, popular: bool = False) -> str:
+    """Opaque stamp that changes whenever any pictogram visible in the library changes.
+
+    With *popular*, it also changes when popularity ranks are recomputed.
+    """
+    scopes = library_scopes(organization_id, citizen_id)
+    if popular:
+        scopes.append(POPULARITY_SCOPE)
+    versions = get_versions(scopes)
+    return ".".join(str(v) for v in versions)
+
+
+def bump(scopes: Iterable[str]) -> None:
+    """Increment the version counter of each scope."""
+    for scope in set(scopes):
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), timeout=None)
+
+
+def invalidate(scopes: Iterable[str]) -> None:
+    """Bump scopes now and again on commit.
+
+    The immediate bump hides stale pages from this transaction's own reads;
+    the second one discards any page a concurrent reader built from
+    pre-commit data in between.
+    """
+    scopes = set(scopes)
+    bump(scopes)
+    transaction.on_commit(lambda: bump(scopes))
+
+
+def get_library_page(
+    *,
+    organization_id: int | None,
+    citizen_id: int | None,
+    search: str | None,
+    limit: int,
+    offset: int,
+    build: Callable[[], dict],
+    stamp: str | None = None,
+    ordering: str = "name",
+) -> dict:
+    """Return a cached serialized library page, building it with *build* on a miss.
+
+    Pass *stamp* when the caller already fetched it (e.g. to compute an ETag).
+    """
+    stamp = stamp or library_stamp(organization_id, citizen_id, popular=ordering == "popular")
+    search_digest = hashlib.sha256((search or "").encode()).hexdigest()[:16]
+    key = (
+        f"pictograms:library:{organization_id or 0}:{citizen_id or 0}:{search_digest}:{ordering}:"
+        f"{limit}:{offset}:{stamp}"
+    )
+    page: dict | None = cache.get(key)
+    if page is None:
+        page = build()
+        cache.set(key, page, timeout=settings.PICTOGRAM_LIBRARY_CACHE_TIMEOUT)
+    return page
@@ -0,0 +1,372 @@
+"""ZIP imports of whole picture libraries.
+
+An archive holds JPEG/PNG/WebP files plus an optional manifest at its root
+(``manifest.json`` or ``manifest.csv``) mapping file paths to names and
+scopes. Files without a manifest row are named after their file name and
+land in the default scope.
+
+The archive is read from its (spooled) file, one member at a time; at most
+``2 * workers`` decoded images are in memory. Images run through the same
+validate/resize/optimize pipeline as ``/pictograms/upload`` on a small
+thread pool, and rows are inserted with ``bulk_create`` in batches. Each
+entry is reported individually: a bad file never aborts the rest.
+
+Imports requested over HTTP run as a ``PictogramImportJob`` in the
+background (``start_import_job``), since a large archive takes far longer
+than a request may; clients poll the job for progress and results. Like
+any ``defer`` work, a job interrupted by a process exit is left
+unfinished and must be resubmitted.
+"""
+
+import csv
+import io
+import json
+import logging
+import posixpath
+import uuid
+import zipfile
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import IO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile, UploadedFile
+from django.utils import timezone
+
+from apps.citizens.models import Citizen
+from apps.organizations.models import Organization
+from apps.pictograms.models import JobStatus, PictogramImportJob
+from apps.pictograms.services import PictogramService
+from core.background import defer
+from core.exceptions import BusinessValidationError, ResourceNotFoundError
+from core.validators import MAX_IMAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+IMPORT_WORKERS = 4
+IMPORT_BATCH_SIZE = 100
+MAX_IMPORT_ENTRIES = 1000
+MAX_MANIFEST_SIZE = 1024 * 1024
+MANIFEST_NAMES = ("manifest.json", "manifest.csv")
+# Job progress is written every this many finished entries.
+PROGRESS_INTERVAL = 10
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+@dataclass
+class ImportEntry:
+    file: str
+    name: str
+    organization_id: int | None
+    citizen_id: int | None
+
+
+@dataclass
+class EntryResult:
+    file: str
+    pictogram_id: int | None = None
+    error: str = ""
+
+
+@dataclass
+class ImportPlan:
+    entries: list[ImportEntry]
+    # Manifest rows that cannot be imported (e.g. the file is missing)
+    errors: list[EntryResult]
+
+
+def open_archive(file: IO[bytes]) -> zipfile.ZipFile:
+    """Open an uploaded archive. Only the central directory is read up front."""
+    try:
+        return zipfile.ZipFile(file)
+    except zipfile.BadZipFile as e:
+        raise BusinessValidationError("File is not a valid ZIP archive.") from e
+
+
+def _is_hidden(path: str) -> bool:
+    return any(part.startswith(".") or part == "__MACOSX" for part in path.split("/"))
+
+
+def _default_name(path: str) -> str:
+    stem = posixpath.splitext(posixpath.basename(path))[0]
+    return (" ".join(stem.replace("_", " ").replace("-", " ").split()) or stem)[:255]
+
+
+def _optional_int(value, row: int, field: str) -> int | None:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BusinessValidationError(f"Manifest row {row}: {field} must be an integer.") from None
+
+
+def _read_manifest(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> list[dict]:
+    if info.file_size > MAX_MANIFEST_SIZE:
+        raise BusinessValidationError("Manifest must not exceed 1MB.")
+    with archive.open(info) as fh:
+        text = io.TextIOWrapper(fh, encoding="utf-8-sig")
+        try:
+            if info.filename.endswith(".csv"):
+                return list(csv.DictReader(text))
+            data = json.load(text)
+        except (UnicodeDecodeError, ValueError, csv.Error) as e:
+            raise BusinessValidationError(f"Manifest could not be parsed: {e}") from e
+    rows = data.get("pictograms") if isinstance(data, dict) else data
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise BusinessValidationError('Manifest must be a list of objects or {"pictograms": [...]}.')
+    return rows
+
+
+def plan_import(
+    archive: zipfile.ZipFile, *, organization_id: int | None = None, citizen_id: int | None = None
+) -> ImportPlan:
+    """Match the archive's images with its manifest and resolve each entry's scope.
+
+    Citizen-scoped entries without an organization inherit the citizen's
+    organization. Scopes are checked per entry (one query for all citizens,
+    one for all organizations): an entry with an unknown or mismatched
+    citizen or organization becomes an error of its own instead of failing
+    the batch it would be inserted with.
+
+    Raises:
+        BusinessValidationError: If the manifest is malformed or there are too many entries.
+    """
+    members = [info for info in archive.infolist() if not info.is_dir() and not _is_hidden(info.filename)]
+    images = {info.filename for info in members if info.filename.lower().endswith(_IMAGE_EXTENSIONS)}
+    manifest = next((info for info in members if info.filename in MANIFEST_NAMES), None)
+
+    entries: dict[str, ImportEntry] = {}
+    errors: list[EntryResult] = []
+    for row_number, row in enumerate(_read_manifest(archive, manifest) if manifest else [], start=1):
+        path = str(row.get("file") or "").lstrip("/")
+        if path not in images:
+            errors.append(EntryResult(file=path, error=f"Manifest row {row_number}: file not found in archive."))
+            continue
+        row_citizen_id = _optional_int(row.get("citizen_id"), row_number, "citizen_id")
+        row_organization_id = _optional_int(row.get("organization_id"), row_number, "organization_id")
+        entries[path] = ImportEntry(
+            file=path,
+            name=str(row.get("name") or "").strip()[:255] or _default_name(path),
+            organization_id=row_organization_id if "organization_id" in row else organization_id,
+            citizen_id=row_citizen_id if "citizen_id" in row else citizen_id,
+        )
+    for path in sorted(images - entries.keys()):
+        entries[path] = ImportEntry(
+            file=path, name=_default_name(path), organization_id=organization_id, citizen_id=citizen_id
+        )
+
+    if len(entries) > MAX_IMPORT_ENTRIES:
+        raise BusinessValidationError(f"At most {MAX_IMPORT_ENTRIES} images per archive.")
+
+    citizen_orgs = dict(
+        Citizen.objects.filter(id__in={e.citizen_id for e in entries.values() if e.citizen_id}).values_list(
+            "id", "organization_id"
+        )
+    )
+    org_ids = set(
+        Organization.objects.filter(
+            id__in={e.organization_id for e in entries.values() if e.organization_id and not e.citizen_id}
+        ).values_list("id", flat=True)
+    )
+    valid: list[ImportEntry] = []
+    for entry in entries.values():
+        error = _resolve_scope(entry, citizen_orgs, org_ids)
+        if error:
+            errors.append(EntryResult(file=entry.file, error=error))
+        else:
+            valid.append(entry)
+    return ImportPlan(entries=valid, errors=errors)
+
+
+def _resolve_scope(entry: ImportEntry, citizen_orgs: dict[int, int], org_ids: set[int]) -> str:
+    """Fill in a citizen entry's organization; return why the scope is invalid, or ``""``."""
+    if entry.citizen_id:
+        citizen_org = citizen_orgs.get(entry.citizen_id)
+        if citizen_org is None:
+            return f"Citizen {entry.citizen_id} not found."
+        if not entry.organization_id:
+            entry.organization_id = citizen_org
+        elif entry.organization_id != citizen_org:
+            return f"Citizen {entry.citizen_id} does not belong to organization {entry.organization_id}."
+        return ""
+    if entry.organization_id and entry.organization_id not in org_ids:
+        return f"Organization {entry.organization_id} not found."
+    return ""
+
+
+def _read_entry(archive: zipfile.ZipFile, path: str) -> bytes:
+    info = archive.getinfo(path)
+    if info.file_size > MAX_IMAGE_SIZE:
+        raise BusinessValidationError("File size must not exceed 20MB.")
+    try:
+        with archive.open(info) as fh:
+            # The declared size can lie; never decompress more than the cap.
+            data = fh.read(MAX_IMAGE_SIZE + 1)
+    except (zipfile.BadZipFile, RuntimeError, NotImplementedError, OSError) as e:
+        raise BusinessValidationError(f"Archive entry could not be read: {e}") from e
+    if len(data) > MAX_IMAGE_SIZE:
+        raise BusinessValidationError("File size must not exceed 20MB.")
+    return data
+
+
+def _prepare(path: str, data: bytes) -> dict:
+    return PictogramService.prepare_image(SimpleUploadedFile(posixpath.basename(path), data))
+
+
+def run_import(
+    archive: zipfile.ZipFile,
+    plan: ImportPlan,
+    *,
+    generate_sound: bool = True,
+    workers: int = IMPORT_WORKERS,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    on_result: Callable[[EntryResult], None] | None = None,
+) -> list[EntryResult]:
+    """Import every planned entry, returning one result per entry (and per manifest error).
+
+    *on_result* is called as each entry finishes, for progress reporting.
+    """
+    results: list[EntryResult] = []
+    pending: list[tuple[ImportEntry, dict]] = []
+
+    def report(result: EntryResult) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    def flush() -> None:
+        if not pending:
+            return
+        items = [
+            {
+                "name": entry.name,
+                "organization_id": entry.organization_id,
+                "citizen_id": entry.citizen_id,
+                "generate_sound": generate_sound,
+                **fields,
+            }
+            for entry, fields in pending
+        ]
+        try:
+            created = PictogramService.bulk_create_pictograms(items)
+        except (BusinessValidationError, ResourceNotFoundError):
+            # Scopes were checked while planning, so this is rare (e.g. a
+            # citizen deleted meanwhile); retry one by one to pin the error
+            # on the entries that cause it.
+            for (entry, _fields), item in zip(pending, items, strict=True):
+                try:
+                    (pictogram,) = PictogramService.bulk_create_pictograms([item])
+                except (BusinessValidationError, ResourceNotFoundError) as e:
+                    report(EntryResult(file=entry.file, error=str(e)))
+                else:
+                    report(EntryResult(file=entry.file, pictogram_id=pictogram.pk))
+        else:
+            for (entry, _fields), pictogram in zip(pending, created, strict=True):
+                report(EntryResult(file=entry.file, pictogram_id=pictogram.pk))
+        pending.clear()
+
+    def collect(entry: ImportEntry, future: Future) -> None:
+        try:
+            pending.append((entry, future.result()))
+        except BusinessValidationError as e:
+            report(EntryResult(file=entry.file, error=str(e)))
+            return
+        if len(pending) >= batch_size:
+            flush()
+
+    for error in plan.errors:
+        report(error)
+
+    # Members are read on this thread (a ZipFile is not safe for concurrent
+    # reads); only decoding and re-encoding happen on the pool.
+    in_flight: deque[tuple[ImportEntry, Future]] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pictogram-import") as pool:
+        for entry in plan.entries:
+            try:
+                data = _read_entry(archive, entry.file)
+            except BusinessValidationError as e:
+                report(EntryResult(file=entry.file, error=str(e)))
+                continue
+            in_flight.append((entry, pool.submit(_prepare, entry.file, data)))
+            if len(in_flight) >= 2 * workers:
+                collect(*in_flight.popleft())
+        while in_flight:
+            collect(*in_flight.popleft())
+    flush()
+
+    created = sum(1 for r in results if r.pictogram_id)
+    logger.info("Imported %d pictogram(s) from archive; %d failed", created, len(results) - created)
+    return results
+
+
+def start_import_job(
+    archive: UploadedFile,
+    plan: ImportPlan,
+    *,
+    user,
+    organization_id: int | None = None,
+    citizen_id: int | None = None,
+    generate_sound: bool = True,
+) -> PictogramImportJob:
+    """Store an already planned (and authorized) archive and queue its import."""
+    job = PictogramImportJob(
+        created_by=user,
+        organization_id=organization_id,
+        citizen_id=citizen_id,
+        generate_sound=generate_sound,
+        total=len(plan.entries) + len(plan.errors),
+    )
+    archive.seek(0)
+    job.archive.save(f"{uuid.uuid4().hex}.zip", archive, save=False)
+    job.save()
+    defer(run_import_job, job.pk)
+    return job
+
+
+def run_import_job(job_id: int) -> None:
+    """Run a queued import, recording progress as entries finish and the results at the end."""
+    job = PictogramImportJob.objects.get(pk=job_id)
+    job.status = JobStatus.RUNNING
+    job.save(update_fields=["status"])
+    processed = failed = 0
+
+    def progress(result: EntryResult) -> None:
+        nonlocal processed, failed
+        processed += 1
+        failed += bool(result.error)
+        if processed % PROGRESS_INTERVAL == 0:
+            PictogramImportJob.objects.filter(pk=job_id).update(processed=processed, failed=failed)
+
+    archive_name = job.archive.name
+    try:
+        with default_storage.open(archive_name, "rb") as fh, open_archive(fh) as archive:
+            plan = plan_import(archive, organization_id=job.organization_id, citizen_id=job.citizen_id)
+            results = run_import(archive, plan, generate_sound=job.generate_sound, on_result=progress)
+    except (BusinessValidationError, OSError) as e:
+        job.status, job.error = JobStatus.FAILED, str(e)
+    except Exception:
+        job.status, job.error = JobStatus.FAILED, "The import failed unexpectedly."
+        raise
+    else:
+        job.status, job.results = JobStatus.DONE, [asdict(result) for result in results]
+    finally:
+        job.processed, job.failed = processed, failed
+        job.finished_at = timezone.now()
+        job.archive = ""
+        job.save()
+        default_storage.delete(archive_name)
+
+
+def get_import_job(job_id: int, user) -> PictogramImportJob:
+    """An import job, visible only to the user who started it (and superusers).
+
+    Raises:
+        ResourceNotFoundError: If the job does not exist or belongs to someone else.
+    """
+    job = PictogramImportJob.objects.filter(pk=job_id).first()
+    if job is None or (job.created_by_id != user.id and not user.is_superuser):
+        raise ResourceNotFoundError(f"Import job {job_id} not found.")
+    return job
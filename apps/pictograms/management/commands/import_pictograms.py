@@ -0,0 +1,56 @@
+"""Import a ZIP archive of pictogram images (see ``apps/pictograms/imports.py``)."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.pictograms import imports
+from core.exceptions import BusinessValidationError, ResourceNotFoundError
+
+
+class Command(BaseCommand):
+    help = "Import pictograms from a ZIP of images with an optional manifest.json / manifest.csv."
+
+    def add_arguments(self, parser):
+        parser.add_argument("archive", help="Path to the ZIP archive.")
+        parser.add_argument("--organization-id", type=int, help="Default organization for entries.")
+        parser.add_argument("--citizen-id", type=int, help="Default citizen for entries.")
+        parser.add_argument("--no-sound", action="store_true", help="Do not generate TTS sounds.")
+        parser.add_argument(
+            "--workers", type=int, default=imports.IMPORT_WORKERS, help="Images processed in parallel (default: 4)."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=imports.IMPORT_BATCH_SIZE, help="Rows per insert (default: 100)."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["archive"], "rb") as fh, imports.open_archive(fh) as archive:
+                plan = imports.plan_import(
+                    archive, organization_id=options["organization_id"], citizen_id=options["citizen_id"]
+                )
+                total = len(plan.entries) + len(plan.errors)
+                self.stdout.write(f"Importing {len(plan.entries)} image(s).")
+                done = 0
+
+                def progress(result: imports.EntryResult) -> None:
+                    nonlocal done
+                    done += 1
+                    if result.error:
+                        self.stderr.write(f"[{done}/{total}] {result.file}: {result.error}")
+                    else:
+                        self.stdout.write(f"[{done}/{total}] {result.file} -> pictogram {result.pictogram_id}")
+
+                results = imports.run_import(
+                    archive,
+                    plan,
+                    generate_sound=not options["no_sound"],
+                    workers=options["workers"],
+                    batch_size=options["batch_size"],
+                    on_result=progress,
+                )
+        except OSError as e:
+            raise CommandError(f"Could not read {options['archive']}: {e}") from e
+        except (BusinessValidationError, ResourceNotFoundError) as e:
+            raise CommandError(str(e)) from e
+
+        created = sum(1 for r in results if r.pictogram_id)
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} pictogram(s); {len(results) - created} failed."))
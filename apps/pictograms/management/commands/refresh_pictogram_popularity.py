@@ -0,0 +1,18 @@
+"""Recompute pictogram popularity ranks from usage counters (see ``apps/pictograms/usage.py``)."""
+
+from django.core.management.base import BaseCommand
+
+from apps.pictograms import usage
+
+
+class Command(BaseCommand):
+    help = "Rebuild pictogram popularity ranks from recent usage and prune expired usage buckets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window-days", type=int, help="Days of usage to rank by (default: PICTOGRAM_POPULARITY_WINDOW_DAYS)."
+        )
+
+    def handle(self, *args, **options):
+        ranked = usage.refresh_ranks(options["window_days"])
+        self.stdout.write(self.style.SUCCESS(f"Ranked {ranked} pictogram(s)."))
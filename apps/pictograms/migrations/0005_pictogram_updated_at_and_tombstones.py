@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictograms', '0004_pictogram_citizen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PictogramTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pictogram_id', models.BigIntegerField()),
+                ('organization_id', models.BigIntegerField(blank=True, null=True)),
+                ('citizen_id', models.BigIntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'pictogram_tombstones',
+                'ordering': ['deleted_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='pictogram',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
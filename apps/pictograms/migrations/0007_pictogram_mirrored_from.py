@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictograms', '0006_pictogram_placeholders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pictogram',
+            name='mirrored_from',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictograms', '0007_pictogram_mirrored_from'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pictogram',
+            name='image_hash',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='pictogram',
+            name='image_hash_b0',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pictogram',
+            name='image_hash_b1',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pictogram',
+            name='image_hash_b2',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pictogram',
+            name='image_hash_b3',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
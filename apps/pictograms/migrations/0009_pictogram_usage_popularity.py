@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictograms', '0008_pictogram_image_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PictogramPopularity',
+            fields=[
+                ('pictogram', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popularity', serialize=False, to='pictograms.pictogram')),
+                ('score', models.PositiveIntegerField(db_index=True, default=0)),
+            ],
+            options={
+                'db_table': 'pictogram_popularity',
+            },
+        ),
+        migrations.CreateModel(
+            name='PictogramUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('pictogram', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage', to='pictograms.pictogram')),
+            ],
+            options={
+                'db_table': 'pictogram_usage',
+                'constraints': [models.UniqueConstraint(fields=('pictogram', 'day'), name='unique_pictogram_usage_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictograms', '0009_pictogram_usage_popularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PictogramSound',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=16)),
+                ('sound', models.FileField(upload_to='pictograms/sounds/%Y/%m/%d/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('pictogram', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sound_variants', to='pictograms.pictogram')),
+            ],
+            options={
+                'db_table': 'pictogram_sounds',
+                'constraints': [models.UniqueConstraint(fields=('pictogram', 'language'), name='unique_pictogram_sound_language')],
+            },
+        ),
+    ]
@@ -4,9 +4,12 @@ Pictograms are visual aids used for communication with autistic children.
 They can be global (organization=None), org-scoped, or citizen-scoped.
 """
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
 
+from core.media import media_url
+
 
 class Pictogram(models.Model):
     """A visual aid image used across GIRAF apps."""
@@ -25,6 +28,18 @@ class Pictogram(models.Model):
         null=True,
         blank=True,
     )
+    # Source URL when `image` is a background-mirrored copy of `image_url`; empty for uploads.
+    mirrored_from = models.CharField(max_length=500, blank=True, default="")
+    # Placeholders derived from `image` (see core/placeholders.py); empty for URL-only pictograms.
+    blurhash = models.CharField(max_length=64, blank=True, default="")
+    dominant_color = models.CharField(max_length=7, blank=True, default="")
+    # Perceptual hash of `image` (see core/imagehash.py) plus its bands, each
+    # indexed so near-duplicates are found by equality lookups, not a scan.
+    image_hash = models.CharField(max_length=16, blank=True, default="")
+    image_hash_b0 = models.IntegerField(null=True, blank=True, db_index=True)
+    image_hash_b1 = models.IntegerField(null=True, blank=True, db_index=True)
+    image_hash_b2 = models.IntegerField(null=True, blank=True, db_index=True)
+    image_hash_b3 = models.IntegerField(null=True, blank=True, db_index=True)
     organization = models.ForeignKey(
         "organizations.Organization",
         on_delete=models.CASCADE,
@@ -40,6 +55,7 @@ class Pictogram(models.Model):
         blank=True,
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = "pictograms"
@@ -55,16 +71,16 @@ class Pictogram(models.Model):
 
     @property
     def effective_image_url(self) -> str:
-        """Return uploaded image URL if available, otherwise the stored image_url."""
+        """Return uploaded image URL (signed if MEDIA_SIGNED_URLS) if available, otherwise the stored image_url."""
         if self.image:
-            return str(self.image.url)
+            return media_url(self.image.name)
         return self.image_url
 
     @property
     def effective_sound_url(self) -> str:
-        """Return uploaded sound URL if available, otherwise empty string."""
+        """Return uploaded sound URL (signed if MEDIA_SIGNED_URLS) if available, otherwise empty string."""
         if self.sound:
-            return str(self.sound.url)
+            return media_url(self.sound.name)
         return ""
 
     def clean(self):
@@ -78,3 +94,146 @@ class Pictogram(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+
+
+class PictogramSound(models.Model):
+    """TTS of a pictogram's name in a language other than ``PICTOGRAM_SOUND_LANGUAGE``.
+
+    Generated on first request and kept until the name changes; the default
+    language lives in ``Pictogram.sound``.
+    """
+
+    pictogram = models.ForeignKey(Pictogram, on_delete=models.CASCADE, related_name="sound_variants")
+    language = models.CharField(max_length=16)
+    sound = models.FileField(upload_to="pictograms/sounds/%Y/%m/%d/")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "pictogram_sounds"
+        constraints = [
+            models.UniqueConstraint(fields=["pictogram", "language"], name="unique_pictogram_sound_language")
+        ]
+
+    def __str__(self) -> str:
+        return f"Pictogram {self.pictogram_id} sound ({self.language})"
+
+
+class PictogramTombstone(models.Model):
+    """Record of a deleted pictogram so clients can sync deletions.
+
+    Scope columns are plain integers rather than foreign keys: the tombstone
+    must outlive the pictogram, and deleting an org or citizen makes its
+    tombstones irrelevant anyway.
+    """
+
+    pictogram_id = models.BigIntegerField()
+    organization_id = models.BigIntegerField(null=True, blank=True)
+    citizen_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = "pictogram_tombstones"
+        ordering = ["deleted_at"]
+
+    def __str__(self) -> str:
+        return f"Pictogram {self.pictogram_id} deleted at {self.deleted_at}"
+
+
+class PictogramUsage(models.Model):
+    """How often a pictogram was used on one day.
+
+    Written in batches by ``apps/pictograms/usage.py`` rather than per event,
+    so usage never touches the ``pictograms`` table itself.
+    """
+
+    pictogram = models.ForeignKey(Pictogram, on_delete=models.CASCADE, related_name="usage")
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "pictogram_usage"
+        constraints = [models.UniqueConstraint(fields=["pictogram", "day"], name="unique_pictogram_usage_day")]
+
+    def __str__(self) -> str:
+        return f"Pictogram {self.pictogram_id} used {self.count}x on {self.day}"
+
+
+class PictogramPopularity(models.Model):
+    """Precomputed usage score backing ``ordering=popular``; rebuilt from ``PictogramUsage``."""
+
+    pictogram = models.OneToOneField(Pictogram, on_delete=models.CASCADE, primary_key=True, related_name="popularity")
+    score = models.PositiveIntegerField(default=0, db_index=True)
+
+    class Meta:
+        db_table = "pictogram_popularity"
+
+    def __str__(self) -> str:
+        return f"Pictogram {self.pictogram_id}: {self.score}"
+
+
+class JobStatus(models.TextChoices):
+    """Lifecycle of a background job (library imports and clones)."""
+
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
+
+
+class PictogramImportJob(models.Model):
+    """A ZIP library import running in the background (see ``apps/pictograms/imports.py``).
+
+    The uploaded archive is kept in storage until the job finishes. Progress
+    counters are updated as entries complete; ``results`` holds one
+    ``{"file", "pictogram_id", "error"}`` object per entry once done.
+    """
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    archive = models.FileField(upload_to="imports/%Y/%m/%d/", blank=True)
+    # Default scope for entries the manifest does not mention
+    organization_id = models.BigIntegerField(null=True, blank=True)
+    citizen_id = models.BigIntegerField(null=True, blank=True)
+    generate_sound = models.BooleanField(default=True)
+    status = models.CharField(max_length=16, choices=JobStatus.choices, default=JobStatus.PENDING)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    results = models.JSONField(default=list, blank=True)
+    # Why the whole job failed (e.g. the archive became unreadable)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "pictogram_import_jobs"
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Import {self.pk} ({self.status})"
+
+
+class PictogramCloneJob(models.Model):
+    """A library clone (see ``PictogramService.clone_library``), tracked so clients can poll it.
+
+    Large libraries are copied in the background; small ones finish before
+    the request returns. ``copied`` is the number of rows written.
+    """
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    target_organization_id = models.BigIntegerField()
+    source_organization_id = models.BigIntegerField(null=True, blank=True)
+    source_citizen_id = models.BigIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=16, choices=JobStatus.choices, default=JobStatus.PENDING)
+    total = models.PositiveIntegerField(default=0)
+    copied = models.PositiveIntegerField(default=0)
+    # Why the clone failed
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "pictogram_clone_jobs"
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Clone {self.pk} ({self.status})"
@@ -0,0 +1,117 @@
+"""Offline media packs: one ZIP with a library's pictograms, images and sounds.
+
+A pack is addressed by the SHA-256 of its manifest, so an unchanged library
+maps to the same stored archive and is only ever built once. Building copies
+each media file into the archive in chunks; neither the archive nor any
+single file is held in memory.
+"""
+
+import hashlib
+import json
+import logging
+import posixpath
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from apps.pictograms.services import PictogramService
+
+logger = logging.getLogger(__name__)
+
+PACK_DIR = "pictogram-packs"
+MANIFEST_NAME = "manifest.json"
+_COPY_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class PackPlan:
+    """Manifest plus the storage files to copy into the archive."""
+
+    manifest: dict
+    # (archive path, storage name) pairs
+    files: list[tuple[str, str]]
+
+    @property
+    def digest(self) -> str:
+        canonical = json.dumps(self.manifest, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @property
+    def storage_name(self) -> str:
+        return f"{PACK_DIR}/{self.digest}.zip"
+
+
+def _archive_path(folder: str, pk: int, storage_name: str) -> str:
+    return f"{folder}/{pk}{posixpath.splitext(storage_name)[1]}"
+
+
+def plan_pack(*, organization_id: int | None, citizen_id: int | None) -> PackPlan:
+    """Build the manifest for a library scope (one query, no file access)."""
+    pictograms = PictogramService.list_pictograms(organization_id=organization_id, citizen_id=citizen_id).order_by(
+        "pk"
+    )
+    entries = []
+    files: list[tuple[str, str]] = []
+    for p in pictograms:
+        entry = {
+            "id": p.pk,
+            "name": p.name,
+            "organization_id": p.organization_id,
+            "citizen_id": p.citizen_id,
+            "updated_at": p.updated_at.isoformat(),
+            "image": None,
+            "image_url": "" if p.image else p.image_url,
+            "sound": None,
+            # Storage names make the digest change when a file is replaced.
+            "source": [p.image.name if p.image else "", p.sound.name if p.sound else ""],
+        }
+        if p.image:
+            image_path = _archive_path("images", p.pk, p.image.name)
+            entry["image"] = image_path
+            files.append((image_path, p.image.name))
+        if p.sound:
+            sound_path = _archive_path("sounds", p.pk, p.sound.name)
+            entry["sound"] = sound_path
+            files.append((sound_path, p.sound.name))
+        entries.append(entry)
+    return PackPlan(manifest={"version": 1, "pictograms": entries}, files=files)
+
+
+def get_or_build_pack(plan: PackPlan) -> str:
+    """Return the storage name of the pack for *plan*, building it on first request."""
+    if default_storage.exists(plan.storage_name):
+        return plan.storage_name
+
+    missing: set[str] = set()
+    with tempfile.TemporaryFile() as tmp:
+        # Media is already compressed; only the manifest is deflated.
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as archive:
+            for arcname, storage_name in plan.files:
+                try:
+                    with default_storage.open(storage_name, "rb") as src, archive.open(arcname, "w") as dest:
+                        shutil.copyfileobj(src, dest, _COPY_CHUNK_SIZE)
+                except FileNotFoundError:
+                    logger.warning("Media file %s missing while building pack %s", storage_name, plan.digest)
+                    missing.add(arcname)
+
+            manifest = {
+                "version": plan.manifest["version"],
+                "pictograms": [
+                    {
+                        **{k: v for k, v in entry.items() if k != "source"},
+                        "image": entry["image"] if entry["image"] not in missing else None,
+                        "sound": entry["sound"] if entry["sound"] not in missing else None,
+                    }
+                    for entry in plan.manifest["pictograms"]
+                ],
+            }
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest), compress_type=zipfile.ZIP_DEFLATED)
+        tmp.seek(0)
+        saved_name = default_storage.save(plan.storage_name, File(tmp))
+
+    logger.info("Built pictogram pack %s (%d files)", saved_name, len(plan.files) - len(missing))
+    return saved_name
@@ -2,19 +2,28 @@
 
 import ipaddress
 import socket
+from datetime import datetime
 from urllib.parse import urlparse
 
 from ninja import Schema
 from pydantic import Field, field_validator
 
+from core import dns
+
+MAX_BULK_PICTOGRAMS = 500
+MAX_USAGE_EVENTS = 1000
+
 
 def _validate_image_url(v: str) -> str:
     """Allow empty string or valid http(s) URLs with non-private hosts only.
 
-    NOTE: DNS is resolved at validation time. A malicious DNS server could return
-    a public IP during validation, then switch to a private IP before the actual
-    fetch (DNS rebinding). For full protection, the fetch path should also
-    validate resolved IPs. Acceptable risk for this deployment.
+    NOTE: DNS is resolved at validation time only as early feedback. The server
+    never fetches through this check: mirroring (core.clients.external)
+    re-resolves and pins the connection to a checked IP, so DNS rebinding
+    between validation and fetch cannot reach internal addresses.
+
+    Lookups go through ``core.dns``: cached per process and bounded by
+    ``DNS_RESOLVE_TIMEOUT``, so slow DNS cannot stall the request.
     """
     if not v:
         return v
@@ -23,13 +32,12 @@ def _validate_image_url(v: str) -> str:
         raise ValueError("Only http and https URLs are allowed.")
     if parsed.hostname:
         try:
-            # getaddrinfo resolves both A (IPv4) and AAAA (IPv6) records
-            for _family, _type, _proto, _canonname, sockaddr in socket.getaddrinfo(parsed.hostname, None):
-                ip = ipaddress.ip_address(sockaddr[0])
+            for address in dns.resolve(parsed.hostname):
+                ip = ipaddress.ip_address(address)
                 if ip.is_private or ip.is_loopback or ip.is_link_local:
                     raise ValueError("URLs pointing to internal/private addresses are not allowed.")
         except socket.gaierror:
-            pass  # Unresolvable host will fail at fetch time
+            pass  # Unresolvable or timed-out host will fail at fetch time
     return v
 
 
@@ -44,6 +52,26 @@ class PictogramCreateIn(Schema):
     _validate_url = field_validator("image_url")(_validate_image_url)
 
 
+class PictogramBulkCreateIn(Schema):
+    items: list[PictogramCreateIn] = Field(min_length=1, max_length=MAX_BULK_PICTOGRAMS)
+
+
+class PictogramCloneIn(Schema):
+    target_organization_id: int
+    source_organization_id: int | None = None
+    source_citizen_id: int | None = None
+
+
+class PictogramCloneJobOut(Schema):
+    id: int
+    status: str
+    # Pictograms to copy, and how many were copied once done
+    total: int
+    copied: int
+    # Set when the clone failed
+    error: str
+
+
 class PictogramUpdateIn(Schema):
     name: str | None = None
     image_url: str | None = None
@@ -58,11 +86,42 @@ class PictogramUpdateIn(Schema):
         return v
 
 
+class PictogramBulkUpdateItem(Schema):
+    id: int
+    name: str | None = Field(default=None, min_length=1, max_length=255)
+    image_url: str | None = Field(default=None, max_length=500)
+    generate_image: bool = False
+    regenerate_sound: bool = False
+
+    @field_validator("image_url")
+    @classmethod
+    def validate_url(cls, v: str | None) -> str | None:
+        if v is not None:
+            _validate_image_url(v)
+        return v
+
+
+class PictogramBulkUpdateIn(Schema):
+    items: list[PictogramBulkUpdateItem] = Field(min_length=1, max_length=MAX_BULK_PICTOGRAMS)
+
+
+class PictogramBulkDeleteIn(Schema):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BULK_PICTOGRAMS)
+
+
+class PictogramBulkDeleteOut(Schema):
+    deleted: list[int]
+    # Requested IDs that did not exist (already deleted)
+    missing: list[int]
+
+
 class PictogramOut(Schema):
     id: int
     name: str
     image_url: str
     sound_url: str
+    blurhash: str
+    dominant_color: str
     organization_id: int | None
     citizen_id: int | None
 
@@ -73,3 +132,87 @@ class PictogramOut(Schema):
     @staticmethod
     def resolve_sound_url(obj):
         return obj.effective_sound_url
+
+
+class PictogramUploadOut(PictogramOut):
+    # IDs of visually near-identical pictograms already in the library scope
+    possible_duplicates: list[int] = []
+
+
+class PictogramDuplicateOut(Schema):
+    pictogram: PictogramOut
+    # Differing bits between the perceptual image hashes (0 = identical)
+    distance: int
+
+
+class PictogramLookupIn(Schema):
+    ids: list[int] = Field(min_length=1)
+
+
+class PictogramUsageIn(Schema):
+    # One entry per use; repeat an ID to count it several times
+    ids: list[int] = Field(min_length=1, max_length=MAX_USAGE_EVENTS)
+
+
+class PictogramSuggestionOut(Schema):
+    id: int
+    name: str
+
+
+class PictogramPageOut(Schema):
+    items: list[PictogramOut]
+    count: int
+
+
+class PictogramChangesOut(Schema):
+    cursor: datetime
+    upserted: list[PictogramOut]
+    deleted: list[int]
+
+
+class AtlasFrameOut(Schema):
+    x: int
+    y: int
+    w: int
+    h: int
+
+
+class PictogramAtlasOut(Schema):
+    image_url: str
+    size: int
+    width: int
+    height: int
+    frames: dict[int, AtlasFrameOut]
+    missing: list[int]
+
+
+class ImportedPictogramOut(Schema):
+    file: str
+    pictogram_id: int
+
+
+class ImportErrorOut(Schema):
+    file: str
+    error: str
+
+
+class PictogramImportJobOut(Schema):
+    id: int
+    status: str
+    # Entries in the archive, and how many have finished / failed so far
+    total: int
+    processed: int
+    failed: int
+    # Per-entry outcomes, filled in when the job is done
+    created: list[ImportedPictogramOut]
+    errors: list[ImportErrorOut]
+    # Set when the whole job failed
+    error: str
+
+    @staticmethod
+    def resolve_created(obj):
+        return [result for result in obj.results if result["pictogram_id"]]
+
+    @staticmethod
+    def resolve_errors(obj):
+        return [result for result in obj.results if result["error"]]
@@ -3,26 +3,69 @@
 import logging
 import threading
 import uuid
+from datetime import datetime, timedelta
+from typing import Any
 
 import httpx
 from django.conf import settings as django_settings
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.files.base import ContentFile
-from django.core.files.uploadedfile import UploadedFile
-from django.db import connection, transaction
-from django.db.models import Q, QuerySet
-
-from apps.pictograms.models import Pictogram
+from django.core.files.uploadedfile import SimpleUploadedFile, UploadedFile
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+from PIL import UnidentifiedImageError
+
+from apps.pictograms import cache as library_cache
+from apps.pictograms import signals
+from apps.pictograms.models import (
+    JobStatus,
+    Pictogram,
+    PictogramCloneJob,
+    PictogramSound,
+    PictogramTombstone,
+)
+from core import imagehash
+from core.background import defer
+from core.clients.external import fetch_public_url
 from core.clients.giraf_ai import GirafAIClient
 from core.exceptions import (
     BusinessValidationError,
+    ExternalFetchError,
     GirafAIUnavailableError,
     ResourceNotFoundError,
 )
-from core.validators import resize_image, validate_audio_file, validate_image_upload
+from core.media import content_addressed_name
+from core.placeholders import compute_placeholders
+from core.validators import (
+    MAX_IMAGE_SIZE,
+    audio_extension,
+    optimize_image,
+    resize_image,
+    validate_audio_file,
+    validate_image_upload,
+)
 
 logger = logging.getLogger(__name__)
 
+# Library clones with more rows than this run as a background job.
+CLONE_SYNC_LIMIT = 500
+# An unfinished clone job older than this is presumed lost (e.g. to a worker
+# restart) and no longer stands in for a repeated request.
+CLONE_JOB_STALE_AFTER = timedelta(minutes=15)
+
+# Library listing orders: alphabetical, or most used first (see usage.py).
+ORDERINGS = ("name", "popular")
+
+_HASH_BAND_FIELDS = tuple(f"image_hash_b{i}" for i in range(imagehash.BANDS))
+# Fields derived from the uploaded image, set (and cleared) together.
+IMAGE_FIELDS = ("image", "blurhash", "dominant_color", "image_hash", *_HASH_BAND_FIELDS)
+_NO_IMAGE = {"image": None, "blurhash": "", "dominant_color": "", "image_hash": ""} | dict.fromkeys(_HASH_BAND_FIELDS)
+
+# One lock per (pictogram, language) sound variant being generated in this process.
+_sound_locks: dict[tuple[int, str], threading.Lock] = {}
+_sound_locks_guard = threading.Lock()
+
 
 class PictogramService:
     @staticmethod
@@ -35,9 +78,10 @@ class PictogramService:
         """
         try:
             client = GirafAIClient()
-            audio_bytes = client.generate_tts(name)
+            audio_bytes = client.generate_tts(name, language=django_settings.PICTOGRAM_SOUND_LANGUAGE)
             pictogram = Pictogram.objects.get(pk=pk)
-            pictogram.sound.save(f"{pk}.wav", ContentFile(audio_bytes), save=True)
+            audio = ContentFile(audio_bytes)
+            pictogram.sound.save(content_addressed_name(audio, ".wav"), audio, save=True)
         except Pictogram.DoesNotExist:
             logger.warning("Pictogram %s deleted before TTS completed", pk)
         except GirafAIUnavailableError:
@@ -72,6 +116,127 @@ class PictogramService:
             ).start()
         )
 
+    @staticmethod
+    def _image_fields(image: UploadedFile) -> dict:
+        """Model fields to set for a new image file: the file, its placeholders and perceptual hash."""
+        try:
+            blurhash, dominant_color = compute_placeholders(image)
+            image_hash = imagehash.compute_dhash(image)
+        except (UnidentifiedImageError, OSError):
+            logger.warning("Could not compute placeholders for image %s", image.name)
+            return {**_NO_IMAGE, "image": image}
+        return {
+            "image": image,
+            "blurhash": blurhash,
+            "dominant_color": dominant_color,
+            "image_hash": image_hash,
+            **dict(zip(_HASH_BAND_FIELDS, imagehash.bands(image_hash), strict=True)),
+        }
+
+    @staticmethod
+    def prepare_image(image: UploadedFile) -> dict:
+        """Validate, resize and optimize an uploaded image; return its model fields.
+
+        Raises:
+            BusinessValidationError: If file type, size, or content is invalid.
+        """
+        mime_type = validate_image_upload(image)
+        image = optimize_image(resize_image(image, max_dimension=512, mime_type=mime_type))
+        return PictogramService._image_fields(image)
+
+    @staticmethod
+    def mirror_external_image(pictogram_id: int, image_url: str) -> bool:
+        """Download *image_url* and store it as the pictogram's local image.
+
+        Runs in the background; returns False (and logs) when the URL cannot be
+        fetched or is not a valid image, leaving the pictogram on the external
+        URL. Skipped if the pictogram was deleted, got an image, or had its
+        image_url changed while the download was in flight.
+        """
+        try:
+            data = fetch_public_url(image_url, max_bytes=MAX_IMAGE_SIZE)
+            image_fields = PictogramService.prepare_image(SimpleUploadedFile(f"{uuid.uuid4().hex}.img", data))
+        except (ExternalFetchError, BusinessValidationError) as exc:
+            logger.warning("Could not mirror image for pictogram %s: %s", pictogram_id, exc)
+            return False
+
+        with transaction.atomic():
+            pictogram = Pictogram.objects.select_for_update().filter(pk=pictogram_id).first()
+            if pictogram is None or pictogram.image or pictogram.image_url != image_url:
+                return False
+            for field, value in image_fields.items():
+                setattr(pictogram, field, value)
+            pictogram.mirrored_from = image_url
+            pictogram.save()
+        logger.info("Mirrored external image for pictogram %s (%d bytes)", pictogram_id, image_fields["image"].size)
+        return True
+
+    @staticmethod
+    def _schedule_mirror(pictogram: Pictogram) -> None:
+        """Mirror an external-only image locally if PICTOGRAM_MIRROR_EXTERNAL_IMAGES is on."""
+        if not getattr(django_settings, "PICTOGRAM_MIRROR_EXTERNAL_IMAGES", False):
+            return
+        if pictogram.image or not pictogram.image_url:
+            return
+        defer(PictogramService.mirror_external_image, pictogram.pk, pictogram.image_url)
+
+    @staticmethod
+    def get_sound(pictogram: Pictogram, language: str) -> str | None:
+        """Storage name of *pictogram*'s sound in *language*, generating it on first request.
+
+        ``PICTOGRAM_SOUND_LANGUAGE`` is the pictogram's own ``sound``. Other
+        languages are TTS variants generated synchronously once per
+        (pictogram, language) and stored as ``PictogramSound`` rows;
+        concurrent first requests in a process wait for a single generation.
+        Returns None if there is no sound and giraf-ai cannot make one.
+        """
+        if language == django_settings.PICTOGRAM_SOUND_LANGUAGE:
+            return pictogram.sound.name or None
+        key = (pictogram.pk, language)
+        with _sound_locks_guard:
+            lock = _sound_locks.setdefault(key, threading.Lock())
+        with lock:
+            try:
+                variant = PictogramSound.objects.filter(pictogram=pictogram, language=language).first()
+                if variant is not None:
+                    stored: str = variant.sound.name
+                    return stored
+                try:
+                    audio_bytes = GirafAIClient().generate_tts(pictogram.name, language=language)
+                except GirafAIUnavailableError as exc:
+                    logger.warning("giraf-ai unavailable for %s TTS of pictogram %s: %s", language, pictogram.pk, exc)
+                    return None
+                except (httpx.HTTPError, ValueError, KeyError):
+                    logger.exception("Unexpected error generating %s TTS for pictogram %s", language, pictogram.pk)
+                    return None
+                audio = ContentFile(audio_bytes)
+                variant = PictogramSound(pictogram=pictogram, language=language)
+                variant.sound.save(content_addressed_name(audio, ".wav"), audio, save=False)
+                try:
+                    with transaction.atomic():
+                        variant.save()
+                except IntegrityError:
+                    # Another process stored this variant first.
+                    variant = PictogramSound.objects.get(pictogram=pictogram, language=language)
+                stored = variant.sound.name
+                return stored
+            finally:
+                with _sound_locks_guard:
+                    _sound_locks.pop(key, None)
+
+    @staticmethod
+    def _drop_sound_variants(pictogram_ids: list[int]) -> None:
+        """Forget generated sound variants (after a rename or regeneration); they are remade on demand."""
+        if pictogram_ids:
+            PictogramSound.objects.filter(pictogram_id__in=pictogram_ids).delete()
+
+    @staticmethod
+    def _prepare_sound(sound: UploadedFile) -> UploadedFile:
+        """Validate a sound upload and give it a content-addressed name (served as immutable)."""
+        mime_type = validate_audio_file(sound)
+        sound.name = content_addressed_name(sound, audio_extension(mime_type))
+        return sound
+
     @staticmethod
     def _validate_citizen_org(citizen_id: int, organization_id: int | None) -> None:
         """Validate that a citizen exists and belongs to the specified organization."""
@@ -112,13 +277,14 @@ class PictogramService:
 
         # If AI image generation is requested without a fallback URL,
         # generate the image first so the model never hits the DB without one.
-        image_content: ContentFile | None = None
+        image_fields: dict = {}
         if generate_image:
             image_bytes = PictogramService._try_generate_image_bytes(name)
             if image_bytes:
-                image_content = ContentFile(image_bytes, name=f"{uuid.uuid4().hex}.png")
+                image_content = optimize_image(ContentFile(image_bytes, name=f"{uuid.uuid4().hex}.png"))
+                image_fields = PictogramService._image_fields(image_content)
 
-        if generate_image and not image_url and not image_content:
+        if generate_image and not image_url and not image_fields:
             raise BusinessValidationError(
                 "Image generation failed and no image_url was provided."
             )
@@ -127,43 +293,341 @@ class PictogramService:
             pictogram = Pictogram.objects.create(
                 name=name,
                 image_url=image_url,
-                image=image_content,
                 organization_id=organization_id,
                 citizen_id=citizen_id,
+                **image_fields,
             )
         except DjangoValidationError as e:
             raise BusinessValidationError(" ".join(e.messages)) from e
 
+        PictogramService._schedule_mirror(pictogram)
         if generate_sound:
             PictogramService._schedule_sound_generation(pictogram)
 
         return pictogram
 
     @staticmethod
-    def list_pictograms(
-        organization_id: int | None = None,
-        citizen_id: int | None = None,
-        search: str | None = None,
-    ) -> QuerySet[Pictogram]:
+    def _generate_assets_batch(images: list[tuple[int, str]], sounds: list[tuple[int, str]]) -> None:
+        """Generate AI images and TTS sounds for ``(pk, name)`` pairs, one after another.
+
+        Runs as a single background job for a bulk write, instead of one
+        thread per pictogram. Failures are logged per pictogram and skipped.
+        """
+        for pk, name in images:
+            image_bytes = PictogramService._try_generate_image_bytes(name)
+            if not image_bytes:
+                continue
+            optimized = optimize_image(ContentFile(image_bytes, name=f"{uuid.uuid4().hex}.png"))
+            pictogram = Pictogram.objects.filter(pk=pk).first()
+            if pictogram is None:
+                continue
+            for field, value in PictogramService._image_fields(optimized).items():
+                setattr(pictogram, field, value)
+            pictogram.mirrored_from = ""
+            pictogram.save()
+        for pk, name in sounds:
+            PictogramService._generate_sound_for_pk(pk, name)
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_create_pictograms(items: list[dict]) -> list[Pictogram]:
+        """Create many pictograms with a constant number of queries.
+
+        Each item takes the keyword arguments of ``create_pictogram``, plus
+        optionally the ``IMAGE_FIELDS`` returned by ``prepare_image``. Citizen
+        and organization references are checked with one ``IN`` query each,
+        rows are inserted with ``bulk_create``, and image/sound generation is
+        queued as one background batch. Because images are generated after
+        the insert, items with ``generate_image`` must also carry an
+        ``image_url`` fallback.
+        """
+        from apps.citizens.models import Citizen
+        from apps.organizations.models import Organization
+
+        citizen_orgs = dict(
+            Citizen.objects.filter(id__in={i["citizen_id"] for i in items if i.get("citizen_id")}).values_list(
+                "id", "organization_id"
+            )
+        )
+        org_ids = set(
+            Organization.objects.filter(
+                id__in={i["organization_id"] for i in items if i.get("organization_id")}
+            ).values_list("id", flat=True)
+        )
+
+        pictograms = []
+        for index, item in enumerate(items):
+            citizen_id, organization_id = item.get("citizen_id"), item.get("organization_id")
+            if citizen_id:
+                if citizen_id not in citizen_orgs:
+                    raise ResourceNotFoundError(f"Citizen {citizen_id} not found.")
+                if not organization_id:
+                    raise BusinessValidationError(f"Item {index}: citizen-scoped pictograms require an organization.")
+                if citizen_orgs[citizen_id] != organization_id:
+                    raise BusinessValidationError(
+                        f"Item {index}: citizen does not belong to the specified organization."
+                    )
+            if organization_id and organization_id not in org_ids:
+                raise BusinessValidationError(f"Item {index}: organization {organization_id} does not exist.")
+            if item.get("generate_image") and not item.get("image_url"):
+                raise BusinessValidationError(
+                    f"Item {index}: bulk image generation requires an image_url fallback."
+                )
+
+            pictogram = Pictogram(
+                name=item["name"],
+                image_url=item.get("image_url", ""),
+                organization_id=organization_id,
+                citizen_id=citizen_id,
+                **{field: item[field] for field in IMAGE_FIELDS if field in item},
+            )
+            try:
+                # References were checked above; skip the per-row FK queries of full_clean().
+                pictogram.clean_fields(exclude=["organization", "citizen"])
+                pictogram.clean()
+            except DjangoValidationError as e:
+                raise BusinessValidationError(f"Item {index}: {' '.join(e.messages)}") from e
+            pictograms.append(pictogram)
+
+        # bulk_create bypasses post_save, so bump the library caches here.
+        created = Pictogram.objects.bulk_create(pictograms)
+        library_cache.invalidate(library_cache.pictogram_scope(p) for p in created)
+
+        for pictogram, item in zip(created, items, strict=True):
+            if not item.get("generate_image"):
+                PictogramService._schedule_mirror(pictogram)
+        images = [(p.pk, p.name) for p, item in zip(created, items, strict=True) if item.get("generate_image")]
+        sounds = [(p.pk, p.name) for p, item in zip(created, items, strict=True) if item.get("generate_sound", True)]
+        if images or sounds:
+            defer(PictogramService._generate_assets_batch, images, sounds)
+        return created
+
+    @staticmethod
+    def _clone_rows(
+        source_organization_id: int | None, source_citizen_id: int | None, target_organization_id: int
+    ) -> int:
+        """Copy a scope's pictogram rows into an organization with one ``INSERT ... SELECT``.
+
+        Copies share the source's stored image and sound files: pictogram
+        files are never deleted in place (``gc_media`` only removes files no
+        row references), so no bytes need to be duplicated.
+        """
+        fields = [f for f in Pictogram._meta.concrete_fields if not f.primary_key]
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        overrides: dict[str, tuple[str, list[Any]]] = {
+            "organization": ("%s", [target_organization_id]),
+            "citizen": ("NULL", []),
+            "created_at": ("%s", [now]),
+            "updated_at": ("%s", [now]),
+        }
+        qn = connection.ops.quote_name
+        select: list[str] = []
+        params: list[Any] = []
+        for field in fields:
+            expression, values = overrides.get(field.name, (qn(field.column), []))
+            select.append(expression)
+            params.extend(values)
+
+        if source_citizen_id:
+            where = f"{qn('citizen_id')} = %s"
+            params.append(source_citizen_id)
+        else:
+            where = f"{qn('organization_id')} = %s AND {qn('citizen_id')} IS NULL"
+            params.append(source_organization_id)
+        table = qn(Pictogram._meta.db_table)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(qn(f.column) for f in fields)}) "
+            f"SELECT {', '.join(select)} FROM {table} WHERE {where}"
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            count: int = cursor.rowcount
+            library_cache.invalidate([library_cache.org_scope(target_organization_id)])
+        logger.info(
+            "Cloned %d pictogram(s) from org %s / citizen %s into org %s",
+            count, source_organization_id, source_citizen_id, target_organization_id,
+        )
+        return count
+
+    @staticmethod
+    def clone_library(
+        *,
+        user,
+        target_organization_id: int,
+        source_organization_id: int | None = None,
+        source_citizen_id: int | None = None,
+    ) -> PictogramCloneJob:
+        """Copy an organization's (or a citizen's) pictograms into another organization.
+
+        Organization sources copy their org-level pictograms; citizen sources
+        copy the citizen's personal ones. Copies become org-level pictograms
+        of the target. Every clone is recorded as a ``PictogramCloneJob``;
+        libraries above ``CLONE_SYNC_LIMIT`` rows are cloned in the background
+        after the request commits, so the returned job is still pending.
+        Repeating a request while the same clone is unfinished returns that
+        job instead of copying twice.
+        """
+        if source_citizen_id and not source_organization_id:
+            source = Pictogram.objects.filter(citizen_id=source_citizen_id)
+        elif source_organization_id and not source_citizen_id:
+            source = Pictogram.objects.filter(organization_id=source_organization_id, citizen__isnull=True)
+        else:
+            raise BusinessValidationError("Specify exactly one of source_organization_id or source_citizen_id.")
+        if source_organization_id == target_organization_id:
+            raise BusinessValidationError("Source and target organization must differ.")
+
+        scope = {
+            "target_organization_id": target_organization_id,
+            "source_organization_id": source_organization_id,
+            "source_citizen_id": source_citizen_id,
+        }
+        active = PictogramCloneJob.objects.filter(
+            **scope,
+            status__in=[JobStatus.PENDING, JobStatus.RUNNING],
+            created_at__gte=timezone.now() - CLONE_JOB_STALE_AFTER,
+        ).first()
+        if active is not None:
+            return active
+
+        job = PictogramCloneJob.objects.create(created_by=user, total=source.count(), **scope)
+        if job.total > CLONE_SYNC_LIMIT:
+            defer(PictogramService.run_clone_job, job.pk)
+            return job
+        return PictogramService.run_clone_job(job.pk)
+
+    @staticmethod
+    def run_clone_job(job_id: int) -> PictogramCloneJob:
+        """Run a clone job, recording its outcome on the job."""
+        job = PictogramCloneJob.objects.get(pk=job_id)
+        job.status = JobStatus.RUNNING
+        job.save(update_fields=["status"])
+        try:
+            job.copied = PictogramService._clone_rows(
+                job.source_organization_id, job.source_citizen_id, job.target_organization_id
+            )
+        except Exception:
+            job.status, job.error = JobStatus.FAILED, "The clone failed unexpectedly."
+            raise
+        else:
+            job.status = JobStatus.DONE
+        finally:
+            job.finished_at = timezone.now()
+            job.save()
+        return job
+
+    @staticmethod
+    def get_clone_job(job_id: int, user) -> PictogramCloneJob:
+        """A clone job, visible only to the user who started it (and superusers).
+
+        A job left unfinished past ``CLONE_JOB_STALE_AFTER`` is reported as
+        failed, so clients know to start it again.
+
+        Raises:
+            ResourceNotFoundError: If the job does not exist or belongs to someone else.
+        """
+        job = PictogramCloneJob.objects.filter(pk=job_id).first()
+        if job is None or (job.created_by_id != user.id and not user.is_superuser):
+            raise ResourceNotFoundError(f"Clone job {job_id} not found.")
+        if job.finished_at is None and job.created_at < timezone.now() - CLONE_JOB_STALE_AFTER:
+            job.status, job.error = JobStatus.FAILED, "The clone was interrupted; start it again."
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at"])
+        return job
+
+    @staticmethod
+    def _scope_filter(organization_id: int | None = None, citizen_id: int | None = None) -> Q:
+        """Q matching the pictograms visible in a library scope."""
         if citizen_id:
             # Three-tier: global + org + citizen
-            qs = Pictogram.objects.filter(
+            return (
                 Q(organization__isnull=True, citizen__isnull=True)
                 | Q(organization_id=organization_id, citizen__isnull=True)
                 | Q(organization_id=organization_id, citizen_id=citizen_id)
             )
-        elif organization_id:
+        if organization_id:
             # Two-tier: global + org (exclude citizen-scoped)
-            qs = Pictogram.objects.filter(
-                Q(organization_id=organization_id, citizen__isnull=True)
-                | Q(organization__isnull=True, citizen__isnull=True)
+            return Q(organization_id=organization_id, citizen__isnull=True) | Q(
+                organization__isnull=True, citizen__isnull=True
             )
-        else:
-            qs = Pictogram.objects.filter(organization__isnull=True, citizen__isnull=True)
+        return Q(organization__isnull=True, citizen__isnull=True)
+
+    @staticmethod
+    def list_pictograms(
+        organization_id: int | None = None,
+        citizen_id: int | None = None,
+        search: str | None = None,
+        ordering: str = "name",
+    ) -> QuerySet[Pictogram]:
+        """Pictograms visible in a library scope.
+
+        ``ordering="popular"`` sorts by the precomputed popularity score
+        (unranked pictograms last, then by name).
+        """
+        qs = Pictogram.objects.filter(PictogramService._scope_filter(organization_id, citizen_id))
         if search:
             qs = qs.filter(name__icontains=search)
+        if ordering == "popular":
+            qs = qs.order_by(F("popularity__score").desc(nulls_last=True), "name", "pk")
         return qs
 
+    @staticmethod
+    def list_grade_pictograms(
+        organization_id: int, citizen_ids: list[int]
+    ) -> tuple[list[Pictogram], dict[int, list[Pictogram]]]:
+        """Pictogram sets of a grade's citizens, sharing the common tiers.
+
+        Returns ``(shared, by_citizen)``: the global and organization tiers
+        once, plus each citizen's own pictograms (possibly empty). One query
+        for all citizens instead of one library listing per child.
+        """
+        by_citizen: dict[int, list[Pictogram]] = {citizen_id: [] for citizen_id in citizen_ids}
+        shared: list[Pictogram] = []
+        qs = Pictogram.objects.filter(
+            PictogramService._scope_filter(organization_id)
+            | Q(organization_id=organization_id, citizen_id__in=citizen_ids)
+        )
+        for pictogram in qs:
+            if pictogram.citizen_id:
+                by_citizen[pictogram.citizen_id].append(pictogram)
+            else:
+                shared.append(pictogram)
+        return shared, by_citizen
+
+    @staticmethod
+    def list_changes(
+        *,
+        organization_id: int | None = None,
+        citizen_id: int | None = None,
+        since: datetime | None = None,
+    ) -> tuple[QuerySet[Pictogram], list[int], datetime]:
+        """Return pictograms changed and IDs deleted in a scope since *since*.
+
+        Returns ``(upserted, deleted_ids, cursor)``. ``updated_at`` and
+        ``deleted_at`` are stamped when a row is written, not when its
+        transaction commits, so a write stamped just before this query may
+        only become visible after it. The cursor therefore lags the query by
+        ``PICTOGRAM_CHANGES_CURSOR_MARGIN`` seconds (longer than any pictogram
+        write transaction): recent changes are reported again on the next
+        call instead of being lost, and clients apply changes idempotently.
+        Without *since*, every pictogram in scope is returned and no deletions.
+        """
+        cursor = timezone.now() - timedelta(seconds=django_settings.PICTOGRAM_CHANGES_CURSOR_MARGIN)
+        upserted = PictogramService.list_pictograms(organization_id=organization_id, citizen_id=citizen_id)
+        if since is None:
+            return upserted, [], cursor
+
+        tombstone_scope = Q(organization_id__isnull=True, citizen_id__isnull=True)
+        if organization_id:
+            tombstone_scope |= Q(organization_id=organization_id, citizen_id__isnull=True)
+        if citizen_id:
+            tombstone_scope |= Q(organization_id=organization_id, citizen_id=citizen_id)
+        deleted_ids = list(
+            PictogramTombstone.objects.filter(tombstone_scope, deleted_at__gte=since)
+            .values_list("pictogram_id", flat=True)
+            .distinct()
+        )
+        return upserted.filter(updated_at__gte=since), deleted_ids, cursor
+
     @staticmethod
     def get_pictogram(pictogram_id: int) -> Pictogram:
         try:
@@ -171,6 +635,38 @@ class PictogramService:
         except Pictogram.DoesNotExist as e:
             raise ResourceNotFoundError(f"Pictogram {pictogram_id} not found.") from e
 
+    @staticmethod
+    def get_pictograms(pictogram_ids: list[int]) -> list[Pictogram]:
+        """Fetch pictograms in one query, preserving input order. Unknown IDs are skipped."""
+        by_id = Pictogram.objects.in_bulk(pictogram_ids)
+        return [by_id[pk] for pk in dict.fromkeys(pictogram_ids) if pk in by_id]
+
+    @staticmethod
+    def find_similar(
+        image_hash: str,
+        *,
+        organization_id: int | None = None,
+        citizen_id: int | None = None,
+        exclude_id: int | None = None,
+        max_distance: int = imagehash.MAX_DISTANCE,
+    ) -> list[tuple[Pictogram, int]]:
+        """Pictograms in a library scope whose image is within *max_distance* bits of *image_hash*.
+
+        Candidates are fetched with one query on the indexed hash bands (see
+        ``core/imagehash.py``), so only rows sharing a band are compared.
+        Returns ``(pictogram, distance)`` pairs, closest first.
+        """
+        if not image_hash:
+            return []
+        shares_band = Q()
+        for field, value in zip(_HASH_BAND_FIELDS, imagehash.bands(image_hash), strict=True):
+            shares_band |= Q(**{field: value})
+        qs = Pictogram.objects.filter(PictogramService._scope_filter(organization_id, citizen_id), shares_band)
+        if exclude_id is not None:
+            qs = qs.exclude(pk=exclude_id)
+        matches = [(p, imagehash.distance(image_hash, p.image_hash)) for p in qs]
+        return sorted(((p, d) for p, d in matches if d <= max_distance), key=lambda m: (m[1], m[0].pk))
+
     @staticmethod
     @transaction.atomic
     def upload_pictogram(
@@ -190,17 +686,16 @@ class PictogramService:
         if citizen_id:
             PictogramService._validate_citizen_org(citizen_id, organization_id)
 
-        mime_type = validate_image_upload(image)
-        image = resize_image(image, max_dimension=512, mime_type=mime_type)
+        image_fields = PictogramService.prepare_image(image)
         if sound is not None:
-            validate_audio_file(sound)
+            PictogramService._prepare_sound(sound)
 
         pictogram = Pictogram.objects.create(
             name=name,
-            image=image,
             sound=sound,
             organization_id=organization_id,
             citizen_id=citizen_id,
+            **image_fields,
         )
 
         if sound is None and generate_sound:
@@ -222,29 +717,115 @@ class PictogramService:
         """Update a pictogram's fields. Supports name, image_url, sound upload, and AI regeneration."""
         pictogram = PictogramService.get_pictogram(pictogram_id)
 
+        name_changed = name is not None and name != pictogram.name
         if name is not None:
             pictogram.name = name
-        if image_url is not None:
+        url_changed = False
+        if image_url is not None and image_url != pictogram.image_url:
+            url_changed = True
             pictogram.image_url = image_url
+            # A mirrored copy belongs to the old URL; drop it so the new one is used.
+            if pictogram.mirrored_from:
+                for field, value in {**_NO_IMAGE, "mirrored_from": ""}.items():
+                    setattr(pictogram, field, value)
 
         if sound is not None:
-            validate_audio_file(sound)
-            pictogram.sound = sound
+            pictogram.sound = PictogramService._prepare_sound(sound)
 
         if generate_image:
             image_bytes = PictogramService._try_generate_image_bytes(pictogram.name)
             if image_bytes:
-                pictogram.image.save(
-                    f"{pictogram.pk}.png", ContentFile(image_bytes), save=False
-                )
+                optimized = optimize_image(ContentFile(image_bytes, name=f"{pictogram.pk}.png"))
+                for field, value in PictogramService._image_fields(optimized).items():
+                    setattr(pictogram, field, value)
+                pictogram.mirrored_from = ""
 
         pictogram.save()
 
+        if url_changed:
+            PictogramService._schedule_mirror(pictogram)
+
+        if name_changed or regenerate_sound:
+            PictogramService._drop_sound_variants([pictogram.pk])
+
         if regenerate_sound and sound is None:
             PictogramService._schedule_sound_generation(pictogram)
 
         return pictogram
 
+    @staticmethod
+    @transaction.atomic
+    def bulk_update_pictograms(pictograms: list[Pictogram], items: list[dict]) -> list[Pictogram]:
+        """Apply per-pictogram changes with one ``bulk_update`` statement.
+
+        *pictograms* are the (already authorized) rows; each item has an
+        ``id`` plus any of ``name``, ``image_url``, ``generate_image`` and
+        ``regenerate_sound``. Generation is queued as one background batch.
+
+        Raises:
+            ResourceNotFoundError: If an item's pictogram is not in *pictograms*.
+            BusinessValidationError: If a change leaves a pictogram invalid.
+        """
+        by_id = {p.pk: p for p in pictograms}
+        now = timezone.now()
+        url_changed, images, sounds, renamed = [], [], [], []
+        for item in items:
+            pictogram = by_id.get(item["id"])
+            if pictogram is None:
+                raise ResourceNotFoundError(f"Pictogram {item['id']} not found.")
+            if item.get("name") is not None and item["name"] != pictogram.name:
+                pictogram.name = item["name"]
+                renamed.append(pictogram.pk)
+            image_url = item.get("image_url")
+            if image_url is not None and image_url != pictogram.image_url:
+                pictogram.image_url = image_url
+                if pictogram.mirrored_from:
+                    for field, value in {**_NO_IMAGE, "mirrored_from": ""}.items():
+                        setattr(pictogram, field, value)
+                url_changed.append(pictogram)
+            try:
+                pictogram.clean_fields(exclude=["organization", "citizen"])
+                pictogram.clean()
+            except DjangoValidationError as e:
+                raise BusinessValidationError(f"Pictogram {pictogram.pk}: {' '.join(e.messages)}") from e
+            # bulk_update does not run auto_now; delta sync relies on updated_at.
+            pictogram.updated_at = now
+            if item.get("generate_image"):
+                images.append((pictogram.pk, pictogram.name))
+            if item.get("regenerate_sound"):
+                sounds.append((pictogram.pk, pictogram.name))
+
+        updated = [by_id[pk] for pk in dict.fromkeys(item["id"] for item in items)]
+        Pictogram.objects.bulk_update(
+            updated, ["name", "image_url", *IMAGE_FIELDS, "mirrored_from", "updated_at"]
+        )
+        library_cache.invalidate(library_cache.pictogram_scope(p) for p in updated)
+        PictogramService._drop_sound_variants([*renamed, *(pk for pk, _name in sounds)])
+
+        for pictogram in url_changed:
+            PictogramService._schedule_mirror(pictogram)
+        if images or sounds:
+            defer(PictogramService._generate_assets_batch, images, sounds)
+        return updated
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_delete_pictograms(pictograms: list[Pictogram]) -> list[int]:
+        """Delete (already authorized) pictograms with one queryset ``delete()``.
+
+        Django's collector cascades to whatever references pictograms, so
+        dependent tables need no listing here. The ``post_delete`` handlers
+        are batched: one tombstone ``bulk_create`` and one cache bump for the
+        whole set. Returns the deleted IDs.
+        """
+        if not pictograms:
+            return []
+        ids = [p.pk for p in pictograms]
+        with signals.batched_delete_effects() as deleted:
+            Pictogram.objects.filter(pk__in=ids).delete()
+        found = {p.pk for p in deleted}
+        return [pk for pk in ids if pk in found]
+
     @staticmethod
     @transaction.atomic
     def delete_pictogram(*, pictogram_id: int) -> None:
@@ -0,0 +1,84 @@
+"""Signal handlers keeping derived pictogram state in sync with writes."""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.pictograms import autocomplete
+from apps.pictograms import cache as library_cache
+from apps.pictograms.models import Pictogram, PictogramTombstone
+
+_batch = threading.local()
+
+
+@contextmanager
+def batched_delete_effects() -> Iterator[list[Pictogram]]:
+    """Batch the ``post_delete`` side effects of a bulk delete made inside the block.
+
+    The handlers below only note each deleted pictogram (the yielded list);
+    on exit its tombstones are written with one ``bulk_create`` and the
+    library caches are bumped once, before autocomplete is updated.
+    """
+    deleted: list[Pictogram] = []
+    _batch.deleted = deleted
+    try:
+        yield deleted
+    finally:
+        del _batch.deleted
+    if not deleted:
+        return
+    PictogramTombstone.objects.bulk_create(
+        PictogramTombstone(pictogram_id=p.pk, organization_id=p.organization_id, citizen_id=p.citizen_id)
+        for p in deleted
+    )
+    library_cache.invalidate(library_cache.pictogram_scope(p) for p in deleted)
+    autocomplete.on_deleted_many(deleted)
+
+
+def _batching() -> bool:
+    return hasattr(_batch, "deleted")
+
+
+@receiver(post_save, sender=Pictogram, dispatch_uid="pictograms_invalidate_library_on_save")
+def invalidate_library_on_save(sender, instance: Pictogram, **kwargs) -> None:
+    library_cache.invalidate([library_cache.pictogram_scope(instance)])
+
+
+@receiver(post_delete, sender=Pictogram, dispatch_uid="pictograms_invalidate_library_on_delete")
+def invalidate_library_on_delete(sender, instance: Pictogram, **kwargs) -> None:
+    if _batching():
+        return
+    library_cache.invalidate([library_cache.pictogram_scope(instance)])
+
+
+@receiver(post_delete, sender=Pictogram, dispatch_uid="pictograms_record_tombstone")
+def record_tombstone(sender, instance: Pictogram, **kwargs) -> None:
+    """Leave a tombstone so delta-sync clients learn about the deletion (incl. cascades)."""
+    if _batching():
+        # The collector clears the pk after the signals; keep a detached copy.
+        _batch.deleted.append(
+            Pictogram(pk=instance.pk, organization_id=instance.organization_id, citizen_id=instance.citizen_id)
+        )
+        return
+    PictogramTombstone.objects.create(
+        pictogram_id=instance.pk,
+        organization_id=instance.organization_id,
+        citizen_id=instance.citizen_id,
+    )
+
+
+# Registered after the cache invalidation handlers: autocomplete relies on
+# their on-commit version bump running first.
+@receiver(post_save, sender=Pictogram, dispatch_uid="pictograms_autocomplete_on_save")
+def update_autocomplete_on_save(sender, instance: Pictogram, **kwargs) -> None:
+    autocomplete.on_saved(instance)
+
+
+@receiver(post_delete, sender=Pictogram, dispatch_uid="pictograms_autocomplete_on_delete")
+def update_autocomplete_on_delete(sender, instance: Pictogram, **kwargs) -> None:
+    if _batching():
+        return
+    autocomplete.on_deleted(instance)
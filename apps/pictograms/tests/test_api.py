@@ -2,7 +2,7 @@
 
 import pytest
 
-from apps.pictograms.tests.utils import make_test_audio, make_test_image
+from apps.pictograms.tests.utils import make_pattern_image, make_test_audio, make_test_image
 from apps.users.tests.factories import UserFactory
 from conftest import auth_header_for_user
 
@@ -148,6 +148,306 @@ class TestPictogramAPI:
         assert not Pictogram.objects.filter(id=p.id).exists()
 
 
+@pytest.mark.django_db
+class TestPictogramListCache:
+    def test_list_is_paginated(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        for name in ("A", "B", "C"):
+            Pictogram.objects.create(name=name, image_url="https://example.com/p.png", organization=org)
+
+        headers = auth_header_for_user(member)
+        response = client.get(f"/api/v1/pictograms?organization_id={org.id}&limit=2&offset=1", **headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 3
+        assert [p["name"] for p in data["items"]] == ["B", "C"]
+
+    def test_repeated_list_served_from_cache(self, client, org, member, django_assert_max_num_queries):
+        from apps.pictograms.models import Pictogram
+
+        Pictogram.objects.create(name="Cached", image_url="https://example.com/c.png", organization=org)
+        headers = auth_header_for_user(member)
+        url = f"/api/v1/pictograms?organization_id={org.id}"
+        first = client.get(url, **headers)
+
+        # Only the auth user lookup and the membership check remain.
+        with django_assert_max_num_queries(2):
+            second = client.get(url, **headers)
+        assert second.json() == first.json()
+
+    def test_create_invalidates_cached_list(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        headers = auth_header_for_user(member)
+        url = f"/api/v1/pictograms?organization_id={org.id}"
+        assert client.get(url, **headers).json()["count"] == 0
+
+        Pictogram.objects.create(name="Fresh", image_url="https://example.com/f.png", organization=org)
+        names = [p["name"] for p in client.get(url, **headers).json()["items"]]
+        assert names == ["Fresh"]
+
+    def test_permission_checked_on_cache_hit(self, client, org, member, non_member):
+        url = f"/api/v1/pictograms?organization_id={org.id}"
+        assert client.get(url, **auth_header_for_user(member)).status_code == 200
+        assert client.get(url, **auth_header_for_user(non_member)).status_code == 403
+
+
+@pytest.mark.django_db
+class TestPictogramMultiGet:
+    def _make(self, org):
+        from apps.pictograms.models import Pictogram
+
+        org_p = Pictogram.objects.create(name="Org", image_url="https://example.com/o.png", organization=org)
+        global_p = Pictogram.objects.create(name="Global", image_url="https://example.com/g.png")
+        return org_p, global_p
+
+    def test_returns_pictograms_in_input_order(self, client, org, member, django_assert_max_num_queries):
+        org_p, global_p = self._make(org)
+        headers = auth_header_for_user(member)
+        # user lookup + pictogram rows + one membership query
+        with django_assert_max_num_queries(3):
+            response = client.get(f"/api/v1/pictograms?ids={global_p.id},999999,{org_p.id}", **headers)
+        assert response.status_code == 200
+        assert [p["id"] for p in response.json()["items"]] == [global_p.id, org_p.id]
+
+    def test_post_variant(self, client, org, member):
+        org_p, global_p = self._make(org)
+        response = client.post(
+            "/api/v1/pictograms/lookup",
+            data={"ids": [org_p.id, global_p.id]},
+            content_type="application/json",
+            **auth_header_for_user(member),
+        )
+        assert response.status_code == 200
+        assert response.json()["count"] == 2
+
+    def test_requires_membership_of_every_org(self, client, org, non_member):
+        org_p, global_p = self._make(org)
+        response = client.get(f"/api/v1/pictograms?ids={global_p.id},{org_p.id}", **auth_header_for_user(non_member))
+        assert response.status_code == 403
+
+    def test_revalidation_returns_304(self, client, org, member):
+        org_p, _global_p = self._make(org)
+        headers = auth_header_for_user(member)
+        first = client.get(f"/api/v1/pictograms?ids={org_p.id}", **headers)
+        second = client.get(f"/api/v1/pictograms?ids={org_p.id}", HTTP_IF_NONE_MATCH=first["ETag"], **headers)
+        assert second.status_code == 304
+
+    def test_rejects_malformed_ids(self, client, member):
+        response = client.get("/api/v1/pictograms?ids=1,x", **auth_header_for_user(member))
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestPictogramConditionalGet:
+    def test_list_304_until_scope_changes(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        headers = auth_header_for_user(member)
+        url = f"/api/v1/pictograms?organization_id={org.id}"
+        etag = client.get(url, **headers)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag, **headers).status_code == 304
+
+        Pictogram.objects.create(name="New", image_url="https://example.com/n.png", organization=org)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag, **headers)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_list_etag_differs_per_query(self, client, org, member):
+        headers = auth_header_for_user(member)
+        etag = client.get(f"/api/v1/pictograms?organization_id={org.id}", **headers)["ETag"]
+        url = f"/api/v1/pictograms?organization_id={org.id}&search=x"
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag, **headers)
+        assert response.status_code == 200
+
+    def test_detail_304(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="Happy", image_url="https://h.com/h.png", organization=org)
+        headers = auth_header_for_user(member)
+        etag = client.get(f"/api/v1/pictograms/{p.id}", **headers)["ETag"]
+        response = client.get(f"/api/v1/pictograms/{p.id}", HTTP_IF_NONE_MATCH=etag, **headers)
+        assert response.status_code == 304
+
+    def test_detail_etag_changes_after_patch(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="Happy", image_url="https://h.com/h.png", organization=org)
+        headers = auth_header_for_user(member)
+        etag = client.get(f"/api/v1/pictograms/{p.id}", **headers)["ETag"]
+        client.patch(f"/api/v1/pictograms/{p.id}", data={"name": "Glad"}, content_type="application/json", **headers)
+        response = client.get(f"/api/v1/pictograms/{p.id}", HTTP_IF_NONE_MATCH=etag, **headers)
+        assert response.status_code == 200
+        assert response.json()["name"] == "Glad"
+
+
+@pytest.mark.django_db
+class TestPictogramMediaAPI:
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = ""
+
+    def test_member_gets_image_and_sound(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="P", image=make_test_image(), sound=make_test_audio(), organization=org)
+        headers = auth_header_for_user(member)
+
+        image = client.get(f"/api/v1/pictograms/{p.id}/image", **headers)
+        assert image.status_code == 200
+        assert b"".join(image.streaming_content) == p.image.open("rb").read()
+        sound = client.get(f"/api/v1/pictograms/{p.id}/sound", **headers)
+        assert sound.status_code == 200
+        assert sound["Content-Type"] == "audio/mpeg"
+
+    def test_sound_language_from_query_or_accept_language(self, client, org, member):
+        from unittest.mock import patch
+
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="P", image=make_test_image(), sound=make_test_audio(), organization=org)
+        headers = auth_header_for_user(member)
+        with patch("apps.pictograms.services.GirafAIClient") as mock_client:
+            mock_client.return_value.generate_tts.return_value = b"RIFF-english"
+            by_query = client.get(f"/api/v1/pictograms/{p.id}/sound?language=en", **headers)
+            by_header = client.get(
+                f"/api/v1/pictograms/{p.id}/sound", HTTP_ACCEPT_LANGUAGE="fr;q=0.9, en-GB;q=0.8", **headers
+            )
+        assert b"".join(by_query.streaming_content) == b"RIFF-english"
+        assert b"".join(by_header.streaming_content) == b"RIFF-english"
+        assert "Accept-Language" in by_header["Vary"]
+        mock_client.return_value.generate_tts.assert_called_once_with("P", language="en")
+
+        default = client.get(f"/api/v1/pictograms/{p.id}/sound", HTTP_ACCEPT_LANGUAGE="fr", **headers)
+        assert b"".join(default.streaming_content) == p.sound.open("rb").read()
+
+    def test_unsupported_sound_language(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="P", image=make_test_image(), sound=make_test_audio(), organization=org)
+        response = client.get(f"/api/v1/pictograms/{p.id}/sound?language=xx", **auth_header_for_user(member))
+        assert response.status_code == 400
+
+    def test_uploaded_sound_is_content_addressed_and_resumable(self, client, org, member):
+        from apps.pictograms.services import PictogramService
+
+        p = PictogramService.upload_pictogram(
+            name="P", image=make_test_image(), sound=make_test_audio(size=4096), organization_id=org.id
+        )
+        headers = auth_header_for_user(member)
+
+        response = client.get(f"/api/v1/pictograms/{p.id}/sound", HTTP_RANGE="bytes=1024-", **headers)
+        assert response.status_code == 206
+        assert response["Content-Range"] == "bytes 1024-4095/4096"
+        assert response["ETag"].strip('"') in p.sound.name
+        # The URL keeps serving the current sound, which can be replaced.
+        assert "immutable" not in response["Cache-Control"]
+        assert "no-cache" in response["Cache-Control"]
+
+    def test_accel_redirect_when_configured(self, client, settings, org, member):
+        from apps.pictograms.models import Pictogram
+
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media"
+        p = Pictogram.objects.create(name="P", image=make_test_image(), organization=org)
+        response = client.get(f"/api/v1/pictograms/{p.id}/image", **auth_header_for_user(member))
+        assert response["X-Accel-Redirect"] == f"/protected-media/{p.image.name}"
+
+    def test_non_member_denied(self, client, org, non_member):
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="P", image=make_test_image(), organization=org)
+        response = client.get(f"/api/v1/pictograms/{p.id}/image", **auth_header_for_user(non_member))
+        assert response.status_code == 403
+
+    def test_url_only_pictogram_has_no_image_file(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="P", image_url="https://example.com/p.png", organization=org)
+        response = client.get(f"/api/v1/pictograms/{p.id}/image", **auth_header_for_user(member))
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestSignedMediaAPI:
+    @pytest.fixture(autouse=True)
+    def _signed_media(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = ""
+        settings.MEDIA_SIGNED_URLS = True
+
+    def test_signed_url_served_without_auth_or_queries(self, client, org, member, django_assert_num_queries):
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="P", image=make_test_image(), organization=org)
+        image_url = client.get(f"/api/v1/pictograms/{p.id}", **auth_header_for_user(member)).json()["image_url"]
+        assert "sig=" in image_url
+
+        with django_assert_num_queries(0):
+            response = client.get(image_url)
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == p.image.open("rb").read()
+        assert "max-age" in response["Cache-Control"]
+
+    def test_signed_url_of_content_addressed_file_is_immutable(self, client, org, member):
+        from apps.pictograms.services import PictogramService
+
+        p = PictogramService.upload_pictogram(
+            name="P", image=make_test_image(), sound=make_test_audio(), organization_id=org.id
+        )
+        sound_url = client.get(f"/api/v1/pictograms/{p.id}", **auth_header_for_user(member)).json()["sound_url"]
+        response = client.get(sound_url)
+        assert response.status_code == 200
+        assert "immutable" in response["Cache-Control"]
+
+    def test_tampered_signature_rejected(self, client, org):
+        from apps.pictograms.models import Pictogram
+
+        p = Pictogram.objects.create(name="P", image=make_test_image(), organization=org)
+        other = Pictogram.objects.create(name="Q", image=make_test_image(), organization=org)
+        query = p.effective_image_url.split("?", 1)[1]
+        response = client.get(f"/api/v1/media/{other.image.name}?{query}")
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestPictogramChangesAPI:
+    @pytest.fixture(autouse=True)
+    def _no_cursor_margin(self, settings):
+        settings.PICTOGRAM_CHANGES_CURSOR_MARGIN = 0
+
+    def test_initial_sync_then_delta(self, client, org, member):
+        from apps.pictograms.models import Pictogram
+
+        kept = Pictogram.objects.create(name="Kept", image_url="https://example.com/k.png", organization=org)
+        doomed = Pictogram.objects.create(name="Doomed", image_url="https://example.com/d.png", organization=org)
+        headers = auth_header_for_user(member)
+
+        first = client.get(f"/api/v1/pictograms/changes?organization_id={org.id}", **headers)
+        assert first.status_code == 200
+        assert {p["name"] for p in first.json()["upserted"]} == {"Kept", "Doomed"}
+        cursor = first.json()["cursor"]
+
+        doomed_id = doomed.id
+        doomed.delete()
+        Pictogram.objects.create(name="Added", image_url="https://example.com/a.png", organization=org)
+
+        second = client.get(
+            "/api/v1/pictograms/changes", {"organization_id": org.id, "since": cursor}, **headers
+        )
+        assert second.status_code == 200
+        data = second.json()
+        assert [p["name"] for p in data["upserted"]] == ["Added"]
+        assert data["deleted"] == [doomed_id]
+        assert kept.id not in data["deleted"]
+
+    def test_non_member_denied(self, client, org, non_member):
+        headers = auth_header_for_user(non_member)
+        response = client.get(f"/api/v1/pictograms/changes?organization_id={org.id}", **headers)
+        assert response.status_code == 403
+
+
 @pytest.mark.django_db
 class TestPictogramPatch:
     def test_patch_name(self, client, org, owner):
@@ -271,6 +571,174 @@ class TestPictogramUpload:
         )
         assert response.status_code == 403
 
+    def test_upload_rejects_bad_magic_while_streaming(self, client, owner, org):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        headers = auth_header_for_user(owner)
+        gif = SimpleUploadedFile("anim.gif", b"GIF89a" + b"\x00" * 64, content_type="image/gif")
+        response = client.post(
+            "/api/v1/pictograms/upload",
+            data={"name": "Gif", "image": gif, "organization_id": org.id, "generate_sound": False},
+            **headers,
+        )
+        assert response.status_code == 422
+        assert "not a valid image" in response.json()["detail"]
+
+
+@pytest.mark.django_db
+class TestPictogramBulkCreateAPI:
+    def _post(self, client, user, items):
+        return client.post(
+            "/api/v1/pictograms/bulk",
+            data={"items": items},
+            content_type="application/json",
+            **auth_header_for_user(user),
+        )
+
+    def test_creates_all_items(self, client, org, member, citizen):
+        items = [
+            {"name": "Org", "image_url": "https://example.com/a.png", "organization_id": org.id},
+            {"name": "Citizen", "image_url": "https://example.com/b.png", "citizen_id": citizen.id},
+        ]
+        items = [{**item, "generate_sound": False} for item in items]
+        response = self._post(client, member, items)
+        assert response.status_code == 201
+        data = response.json()
+        assert [p["name"] for p in data] == ["Org", "Citizen"]
+        assert data[1]["organization_id"] == org.id
+
+    def test_non_member_is_rejected(self, client, org, non_member):
+        items = [{"name": "X", "image_url": "https://example.com/a.png", "organization_id": org.id}]
+        assert self._post(client, non_member, items).status_code == 403
+
+    def test_global_items_require_superuser(self, client, member):
+        items = [{"name": "Global", "image_url": "https://example.com/a.png"}]
+        assert self._post(client, member, items).status_code == 403
+
+    def test_unknown_citizen_is_404(self, client, member):
+        items = [{"name": "X", "image_url": "https://example.com/a.png", "citizen_id": 999999}]
+        assert self._post(client, member, items).status_code == 404
+
+    def test_empty_batch_is_rejected(self, client, member):
+        assert self._post(client, member, []).status_code == 422
+
+
+@pytest.mark.django_db
+class TestPictogramCloneAPI:
+    def test_member_of_both_orgs_can_clone(self, client, org, second_org, member):
+        from apps.organizations.models import Membership, OrgRole
+        from apps.pictograms.models import Pictogram
+
+        Membership.objects.create(user=member, organization=second_org, role=OrgRole.MEMBER)
+        Pictogram.objects.create(name="Apple", image_url="https://example.com/a.png", organization=org)
+        response = client.post(
+            "/api/v1/pictograms/clone",
+            data={"source_organization_id": org.id, "target_organization_id": second_org.id},
+            content_type="application/json",
+            **auth_header_for_user(member),
+        )
+        assert response.status_code == 201
+        job = response.json()
+        assert (job["status"], job["total"], job["copied"]) == ("done", 1, 1)
+        assert Pictogram.objects.filter(organization=second_org, name="Apple").exists()
+
+        response = client.get(f"/api/v1/pictograms/clone/{job['id']}", **auth_header_for_user(member))
+        assert response.status_code == 200
+        assert response.json()["status"] == "done"
+
+    def test_requires_membership_in_target(self, client, org, second_org, member):
+        response = client.post(
+            "/api/v1/pictograms/clone",
+            data={"source_organization_id": org.id, "target_organization_id": second_org.id},
+            content_type="application/json",
+            **auth_header_for_user(member),
+        )
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestPictogramBulkWriteAPI:
+    def _make(self, org, n=3):
+        from apps.pictograms.models import Pictogram
+
+        return [
+            Pictogram.objects.create(name=f"P{i}", image_url=f"https://example.com/{i}.png", organization=org)
+            for i in range(n)
+        ]
+
+    def test_bulk_delete_records_tombstones(self, client, org, member, django_assert_max_num_queries):
+        from apps.pictograms.models import Pictogram, PictogramTombstone
+
+        pictograms = self._make(org, n=5)
+        ids = [p.id for p in pictograms]
+        headers = auth_header_for_user(member)
+        # The collector adds a SELECT of the rows and one DELETE per dependent table.
+        with django_assert_max_num_queries(12):
+            response = client.post(
+                "/api/v1/pictograms/bulk-delete",
+                data={"ids": [*ids, 999999]},
+                content_type="application/json",
+                **headers,
+            )
+        assert response.status_code == 200
+        assert response.json() == {"deleted": ids, "missing": [999999]}
+        assert not Pictogram.objects.exists()
+        assert sorted(PictogramTombstone.objects.values_list("pictogram_id", flat=True)) == ids
+
+    def test_bulk_delete_is_all_or_nothing_on_permissions(self, client, org, second_org, member):
+        from apps.pictograms.models import Pictogram
+
+        own = self._make(org, n=1)[0]
+        other = Pictogram.objects.create(name="Other", image_url="https://example.com/o.png", organization=second_org)
+        response = client.post(
+            "/api/v1/pictograms/bulk-delete",
+            data={"ids": [own.id, other.id]},
+            content_type="application/json",
+            **auth_header_for_user(member),
+        )
+        assert response.status_code == 403
+        assert Pictogram.objects.count() == 2
+
+    def test_bulk_update_applies_changes(self, client, org, member):
+        first, second, _third = self._make(org)
+        response = client.patch(
+            "/api/v1/pictograms/bulk",
+            data={
+                "items": [
+                    {"id": first.id, "name": "Renamed"},
+                    {"id": second.id, "image_url": "https://example.com/new.png"},
+                ]
+            },
+            content_type="application/json",
+            **auth_header_for_user(member),
+        )
+        assert response.status_code == 200
+        assert [p["name"] for p in response.json()] == ["Renamed", "P1"]
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.name == "Renamed"
+        assert first.updated_at > first.created_at
+        assert second.image_url == "https://example.com/new.png"
+
+    def test_bulk_update_rejects_removing_only_image_source(self, client, org, member):
+        (pictogram,) = self._make(org, n=1)
+        response = client.patch(
+            "/api/v1/pictograms/bulk",
+            data={"items": [{"id": pictogram.id, "image_url": ""}]},
+            content_type="application/json",
+            **auth_header_for_user(member),
+        )
+        assert response.status_code == 422
+
+    def test_bulk_update_unknown_id_is_404(self, client, member):
+        response = client.patch(
+            "/api/v1/pictograms/bulk",
+            data={"items": [{"id": 999999, "name": "X"}]},
+            content_type="application/json",
+            **auth_header_for_user(member),
+        )
+        assert response.status_code == 404
+
 
 @pytest.mark.django_db
 class TestPictogramPermissions:
@@ -427,3 +895,51 @@ class TestPictogramCitizenScopeAPI:
         headers = auth_header_for_user(non_member)
         response = client.get(f"/api/v1/pictograms?citizen_id={citizen.id}", **headers)
         assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestPictogramDuplicates:
+    def _upload(self, client, headers, org, name, seed=0, size=64):
+        return client.post(
+            "/api/v1/pictograms/upload",
+            data={
+                "name": name,
+                "image": make_pattern_image(seed, size),
+                "organization_id": org.id,
+                "generate_sound": False,
+            },
+            **headers,
+        ).json()
+
+    def test_upload_reports_possible_duplicates(self, client, org, member):
+        headers = auth_header_for_user(member)
+        first = self._upload(client, headers, org, "First")
+        assert first["possible_duplicates"] == []
+
+        second = self._upload(client, headers, org, "Second", size=128)
+        assert second["possible_duplicates"] == [first["id"]]
+
+        other = self._upload(client, headers, org, "Other", seed=1)
+        assert other["possible_duplicates"] == []
+
+    def test_list_duplicates(self, client, org, member):
+        headers = auth_header_for_user(member)
+        first = self._upload(client, headers, org, "First")
+        second = self._upload(client, headers, org, "Second", size=128)
+
+        response = client.get(f"/api/v1/pictograms/{first['id']}/duplicates", **headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert [d["pictogram"]["id"] for d in body] == [second["id"]]
+        assert body[0]["distance"] >= 0
+
+    def test_list_duplicates_requires_membership(self, client, org, member, non_member):
+        first = self._upload(client, auth_header_for_user(member), org, "First")
+        response = client.get(f"/api/v1/pictograms/{first['id']}/duplicates", **auth_header_for_user(non_member))
+        assert response.status_code == 403
+
+    def test_list_duplicates_rejects_unsupported_distance(self, client, org, member):
+        headers = auth_header_for_user(member)
+        first = self._upload(client, headers, org, "First")
+        response = client.get(f"/api/v1/pictograms/{first['id']}/duplicates?max_distance=10", **headers)
+        assert response.status_code == 400
@@ -0,0 +1,80 @@
+"""Tests for pictogram sprite-sheet atlases."""
+
+import pytest
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from apps.pictograms import atlas as atlases
+from apps.pictograms.models import Pictogram
+from apps.pictograms.tests.utils import make_test_image
+from conftest import auth_header_for_user
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.django_db
+class TestGetOrBuildAtlas:
+    def test_packs_thumbnails_into_grid(self, org):
+        pictograms = [
+            Pictogram.objects.create(name=f"P{i}", image=make_test_image(), organization=org) for i in range(3)
+        ]
+        external = Pictogram.objects.create(name="Ext", image_url="https://example.com/e.png", organization=org)
+
+        atlas = atlases.get_or_build_atlas([*pictograms, external], 64)
+        assert (atlas.width, atlas.height) == (128, 128)
+        assert set(atlas.frames) == {p.pk for p in pictograms}
+        assert atlas.missing == [external.pk]
+        with default_storage.open(atlas.image_name, "rb") as fh:
+            assert Image.open(fh).format == "WEBP"
+
+    def test_reuses_stored_atlas(self, org):
+        p = Pictogram.objects.create(name="P", image=make_test_image(), organization=org)
+        first = atlases.get_or_build_atlas([p], 128)
+        second = atlases.get_or_build_atlas([p], 128)
+        assert second == first
+
+    def test_digest_changes_when_member_changes(self, org):
+        p = Pictogram.objects.create(name="P", image=make_test_image(), organization=org)
+        digest = atlases.atlas_digest([p], 64)
+        assert atlases.atlas_digest([p], 128) != digest
+
+        p.name = "Renamed"
+        p.save()
+        assert atlases.atlas_digest([p], 64) != digest
+
+
+@pytest.mark.django_db
+class TestPictogramAtlasAPI:
+    def test_returns_atlas_with_etag(self, client, org, member):
+        a = Pictogram.objects.create(name="A", image=make_test_image(), organization=org)
+        b = Pictogram.objects.create(name="B", image=make_test_image())
+        headers = auth_header_for_user(member)
+
+        response = client.get(f"/api/v1/pictograms/atlas?ids={a.id},{b.id},999999&size=64", **headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["frames"]) == {str(a.id), str(b.id)}
+        assert data["missing"] == [999999]
+        assert data["image_url"].endswith(".webp")
+
+        url = f"/api/v1/pictograms/atlas?ids={a.id},{b.id},999999&size=64"
+        assert client.get(url, HTTP_IF_NONE_MATCH=response["ETag"], **headers).status_code == 304
+
+    def test_invalid_ids_rejected(self, client, member):
+        headers = auth_header_for_user(member)
+        response = client.get("/api/v1/pictograms/atlas?ids=1,x", **headers)
+        assert response.status_code == 400
+
+    def test_invalid_size_rejected(self, client, member):
+        headers = auth_header_for_user(member)
+        response = client.get("/api/v1/pictograms/atlas?ids=1&size=100", **headers)
+        assert response.status_code == 400
+
+    def test_non_member_denied(self, client, org, non_member):
+        p = Pictogram.objects.create(name="A", image=make_test_image(), organization=org)
+        headers = auth_header_for_user(non_member)
+        response = client.get(f"/api/v1/pictograms/atlas?ids={p.id}", **headers)
+        assert response.status_code == 403
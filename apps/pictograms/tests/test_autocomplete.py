@@ -0,0 +1,146 @@
+"""Tests for in-process pictogram name autocomplete."""
+
+import pytest
+
+from apps.pictograms import autocomplete
+from apps.pictograms.models import Pictogram
+from apps.pictograms.services import PictogramService
+from conftest import auth_header_for_user
+
+URL = "https://example.com/p.png"
+
+
+@pytest.fixture(autouse=True)
+def _clear_indexes():
+    autocomplete.clear()
+    yield
+    autocomplete.clear()
+
+
+def names(suggestions):
+    return [s.name for s in suggestions]
+
+
+class TestPrefixIndex:
+    def _index(self, *names):
+        return autocomplete.PrefixIndex(list(enumerate(names, start=1)), version=1)
+
+    def test_matches_any_word_start(self):
+        index = self._index("Red apple", "Apricot", "Pineapple")
+        # Ordered by the matching key: "apple" < "apricot"
+        assert names(index.search("ap", 10)) == ["Red apple", "Apricot"]
+
+    def test_tolerates_one_typo(self):
+        index = self._index("Breakfast", "Bread")
+        results = index.search("brekf", 10)
+        assert [(s.name, s.distance) for s in results] == [("Breakfast", 1)]
+
+    def test_short_queries_are_not_fuzzy(self):
+        assert self._index("Cat").search("xa", 10) == []
+
+    def test_add_and_remove(self):
+        index = self._index("Cat")
+        index.add(2, "Car")
+        index.add(1, "Dog")
+        assert names(index.search("ca", 10)) == ["Car"]
+        index.remove(2)
+        assert index.search("ca", 10) == []
+
+    def test_long_queries_are_not_fuzzy(self):
+        long_name = "x" * (autocomplete.MAX_FUZZY_LENGTH + 1)
+        index = self._index(long_name)
+        assert index.search(long_name[:-1] + "y", 10) == []
+        assert names(index.search(long_name, 10)) == [long_name]
+
+    def test_limit(self):
+        index = self._index(*(f"Item {i}" for i in range(20)))
+        assert len(index.search("item", 5)) == 5
+
+
+@pytest.mark.django_db
+class TestSuggest:
+    def test_merges_global_org_and_citizen_tiers(self, org, second_org, citizen):
+        Pictogram.objects.create(name="Apple", image_url=URL)
+        Pictogram.objects.create(name="Apron", image_url=URL, organization=org)
+        Pictogram.objects.create(name="April trip", image_url=URL, organization=org, citizen=citizen)
+        Pictogram.objects.create(name="Apricot", image_url=URL, organization=second_org)
+
+        assert names(autocomplete.suggest("ap", organization_id=org.id)) == ["Apple", "Apron"]
+        assert names(autocomplete.suggest("ap", organization_id=org.id, citizen_id=citizen.id)) == [
+            "Apple",
+            "April trip",
+            "Apron",
+        ]
+
+    def test_exact_matches_rank_before_typos(self, org):
+        Pictogram.objects.create(name="Bake", image_url=URL, organization=org)
+        Pictogram.objects.create(name="Bike", image_url=URL, organization=org)
+        results = autocomplete.suggest("bik", organization_id=org.id)
+        assert [(s.name, s.distance) for s in results] == [("Bike", 0), ("Bake", 1)]
+
+    def test_warm_index_does_not_query(self, org, django_assert_num_queries):
+        Pictogram.objects.create(name="Apple", image_url=URL, organization=org)
+        autocomplete.suggest("ap", organization_id=org.id)
+        with django_assert_num_queries(0):
+            assert names(autocomplete.suggest("app", organization_id=org.id)) == ["Apple"]
+
+    def test_committed_save_updates_index_in_place(
+        self, org, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        apple = Pictogram.objects.create(name="Apple", image_url=URL, organization=org)
+        autocomplete.suggest("a", organization_id=org.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            PictogramService.update_pictogram(pictogram_id=apple.pk, name="Avocado")
+        with django_assert_num_queries(0):
+            assert names(autocomplete.suggest("av", organization_id=org.id)) == ["Avocado"]
+            assert autocomplete.suggest("app", organization_id=org.id) == []
+
+    def test_bulk_writes_trigger_rebuild(self, org):
+        autocomplete.suggest("x", organization_id=org.id)
+        PictogramService.bulk_create_pictograms(
+            [{"name": "Xylophone", "image_url": URL, "organization_id": org.id, "generate_sound": False}]
+        )
+        assert names(autocomplete.suggest("xy", organization_id=org.id)) == ["Xylophone"]
+
+    def test_bulk_delete_removes_suggestions(
+        self, org, citizen, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        deleted = [
+            Pictogram.objects.create(name=name, image_url=URL, organization=org) for name in ("Apple", "Apricot")
+        ]
+        deleted.append(Pictogram.objects.create(name="April", image_url=URL, organization=org, citizen=citizen))
+        Pictogram.objects.create(name="Apron", image_url=URL, organization=org)
+        autocomplete.suggest("a", organization_id=org.id, citizen_id=citizen.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            PictogramService.bulk_delete_pictograms(deleted)
+        with django_assert_num_queries(0):
+            # Applied in place, so the indexes are current without a rebuild.
+            assert names(autocomplete.suggest("ap", organization_id=org.id, citizen_id=citizen.id)) == ["Apron"]
+
+
+@pytest.mark.django_db
+class TestAutocompleteAPI:
+    def test_returns_suggestions(self, client, org, member):
+        Pictogram.objects.create(name="Happy", image_url=URL, organization=org)
+        response = client.get(
+            f"/api/v1/pictograms/autocomplete?q=hap&organization_id={org.id}", **auth_header_for_user(member)
+        )
+        assert response.status_code == 200
+        assert [s["name"] for s in response.json()] == ["Happy"]
+
+    def test_non_member_is_rejected(self, client, org, non_member):
+        response = client.get(
+            f"/api/v1/pictograms/autocomplete?q=hap&organization_id={org.id}", **auth_header_for_user(non_member)
+        )
+        assert response.status_code == 403
+
+    def test_query_length_is_bounded(self, client, member):
+        q = "a" * (autocomplete.MAX_QUERY_LENGTH + 1)
+        response = client.get(f"/api/v1/pictograms/autocomplete?q={q}", **auth_header_for_user(member))
+        assert response.status_code == 422
+
+    def test_limit_is_bounded(self, client, member):
+        response = client.get("/api/v1/pictograms/autocomplete?q=a&limit=500", **auth_header_for_user(member))
+        assert response.status_code == 400
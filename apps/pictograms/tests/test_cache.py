@@ -0,0 +1,104 @@
+"""Tests for the versioned pictogram library cache."""
+
+import pytest
+
+from apps.pictograms import cache as library_cache
+from apps.pictograms.models import Pictogram
+
+
+class TestLibraryScopes:
+    def test_global_only(self):
+        assert library_cache.library_scopes() == ["global"]
+
+    def test_citizen_includes_all_tiers(self):
+        assert library_cache.library_scopes(organization_id=3, citizen_id=7) == ["global", "org:3", "citizen:7"]
+
+    def test_pictogram_scope_prefers_citizen(self):
+        p = Pictogram(name="P", organization_id=3, citizen_id=7)
+        assert library_cache.pictogram_scope(p) == "citizen:7"
+
+
+class TestVersionStamps:
+    def test_stamp_is_stable_without_writes(self):
+        assert library_cache.library_stamp(1) == library_cache.library_stamp(1)
+
+    def test_bump_changes_only_affected_stamps(self):
+        org_stamp = library_cache.library_stamp(1)
+        other_stamp = library_cache.library_stamp(2)
+        library_cache.bump(["org:1"])
+        assert library_cache.library_stamp(1) != org_stamp
+        assert library_cache.library_stamp(2) == other_stamp
+
+    def test_global_bump_changes_every_stamp(self):
+        stamp = library_cache.library_stamp(1, 5)
+        library_cache.bump(["global"])
+        assert library_cache.library_stamp(1, 5) != stamp
+
+
+class TestGetLibraryPage:
+    def _page(self, build, **overrides):
+        kwargs = {"organization_id": 1, "citizen_id": None, "search": None, "limit": 10, "offset": 0}
+        kwargs.update(overrides)
+        return library_cache.get_library_page(build=build, **kwargs)
+
+    def test_builds_once_then_hits(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"items": [], "count": 0}
+
+        self._page(build)
+        self._page(build)
+        assert len(calls) == 1
+
+    def test_key_includes_search_and_offset(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"items": [], "count": 0}
+
+        self._page(build)
+        self._page(build, search="cat")
+        self._page(build, offset=10)
+        assert len(calls) == 3
+
+    def test_bump_invalidates_page(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"items": [], "count": len(calls)}
+
+        self._page(build)
+        library_cache.bump(["org:1"])
+        assert self._page(build)["count"] == 2
+
+
+@pytest.mark.django_db
+class TestSignalInvalidation:
+    def test_create_bumps_scope(self, org):
+        stamp = library_cache.library_stamp(org.id)
+        Pictogram.objects.create(name="New", image_url="https://example.com/n.png", organization=org)
+        assert library_cache.library_stamp(org.id) != stamp
+
+    def test_update_bumps_scope(self, org):
+        p = Pictogram.objects.create(name="Old", image_url="https://example.com/o.png", organization=org)
+        stamp = library_cache.library_stamp(org.id)
+        p.name = "Renamed"
+        p.save()
+        assert library_cache.library_stamp(org.id) != stamp
+
+    def test_delete_bumps_scope(self, org):
+        p = Pictogram.objects.create(name="Gone", image_url="https://example.com/g.png", organization=org)
+        stamp = library_cache.library_stamp(org.id)
+        p.delete()
+        assert library_cache.library_stamp(org.id) != stamp
+
+    def test_citizen_write_leaves_org_stamp_alone(self, org, citizen):
+        stamp = library_cache.library_stamp(org.id)
+        Pictogram.objects.create(
+            name="Mine", image_url="https://example.com/m.png", organization=org, citizen=citizen
+        )
+        assert library_cache.library_stamp(org.id) == stamp
@@ -0,0 +1,91 @@
+"""Tests for pictogram management commands."""
+
+import zipfile
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.pictograms.models import Pictogram
+from apps.pictograms.tests.utils import make_test_image
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.django_db
+class TestBackfillPlaceholders:
+    def test_fills_missing_placeholders(self, org):
+        p = Pictogram.objects.create(name="Img", image=make_test_image(), organization=org)
+        url_only = Pictogram.objects.create(name="Url", image_url="https://example.com/u.png", organization=org)
+
+        call_command("backfill_placeholders")
+
+        p.refresh_from_db()
+        url_only.refresh_from_db()
+        assert p.blurhash
+        assert p.dominant_color == "#ff0000"
+        assert len(p.image_hash) == 16
+        assert p.image_hash_b0 is not None
+        assert url_only.blurhash == ""
+
+    def test_bumps_updated_at_of_changed_rows_only(self, org):
+        p = Pictogram.objects.create(name="Img", image=make_test_image(), organization=org)
+        stamp = p.updated_at
+
+        call_command("backfill_placeholders")
+        p.refresh_from_db()
+        assert p.updated_at > stamp
+
+        stamp = p.updated_at
+        call_command("backfill_placeholders", "--force")
+        p.refresh_from_db()
+        assert p.updated_at == stamp
+
+    def test_skips_rows_with_placeholders_unless_forced(self, org):
+        p = Pictogram.objects.create(
+            name="Img", image=make_test_image(), organization=org, blurhash="keep", image_hash="0" * 16
+        )
+
+        call_command("backfill_placeholders")
+        p.refresh_from_db()
+        assert p.blurhash == "keep"
+
+        call_command("backfill_placeholders", "--force")
+        p.refresh_from_db()
+        assert p.blurhash != "keep"
+
+    def test_fills_missing_hash_when_placeholders_exist(self, org):
+        p = Pictogram.objects.create(name="Img", image=make_test_image(), organization=org, blurhash="keep")
+
+        call_command("backfill_placeholders")
+        p.refresh_from_db()
+        assert len(p.image_hash) == 16
+
+    def test_missing_file_is_reported(self, org):
+        p = Pictogram.objects.create(name="Img", image=make_test_image(), organization=org)
+        p.image.storage.delete(p.image.name)
+
+        call_command("backfill_placeholders")
+        p.refresh_from_db()
+        assert p.blurhash == ""
+
+
+@pytest.mark.django_db
+class TestImportPictograms:
+    def test_imports_archive(self, org, tmp_path):
+        path = tmp_path / "library.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("cat.png", make_test_image().read())
+        out = StringIO()
+
+        call_command("import_pictograms", str(path), "--organization-id", str(org.id), "--no-sound", stdout=out)
+
+        assert Pictogram.objects.get(organization=org).name == "cat"
+        assert "[1/1] cat.png -> pictogram" in out.getvalue()
+
+    def test_missing_file_is_a_command_error(self, tmp_path):
+        with pytest.raises(CommandError, match="Could not read"):
+            call_command("import_pictograms", str(tmp_path / "nope.zip"))
@@ -0,0 +1,139 @@
+"""Tests for ZIP library imports."""
+
+import io
+import json
+import zipfile
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from apps.pictograms import imports
+from apps.pictograms.models import Pictogram, PictogramImportJob
+from apps.pictograms.tests.utils import make_test_image
+from conftest import auth_header_for_user
+from core.exceptions import BusinessValidationError
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def make_archive(files: dict[str, bytes]) -> io.BytesIO:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    buf.seek(0)
+    return buf
+
+
+def png() -> bytes:
+    data: bytes = make_test_image().read()
+    return data
+
+
+@pytest.mark.django_db
+class TestPlanImport:
+    def test_names_default_to_file_names(self, org):
+        archive = imports.open_archive(make_archive({"food/red_apple.png": png(), "notes.txt": b"skip"}))
+        plan = imports.plan_import(archive, organization_id=org.id)
+        assert [(e.file, e.name, e.organization_id) for e in plan.entries] == [
+            ("food/red_apple.png", "red apple", org.id)
+        ]
+
+    def test_json_manifest_sets_names_and_scopes(self, org, citizen):
+        manifest = {"pictograms": [{"file": "a.png", "name": "Apple", "citizen_id": citizen.id}, {"file": "gone.png"}]}
+        archive = imports.open_archive(make_archive({"a.png": png(), "manifest.json": json.dumps(manifest).encode()}))
+        plan = imports.plan_import(archive)
+        entry = plan.entries[0]
+        assert (entry.name, entry.citizen_id, entry.organization_id) == ("Apple", citizen.id, org.id)
+        assert plan.errors[0].file == "gone.png"
+
+    def test_csv_manifest(self, org):
+        manifest = f"file,name,organization_id\nb.png,Ball,{org.id}\n".encode()
+        archive = imports.open_archive(make_archive({"b.png": png(), "manifest.csv": manifest}))
+        plan = imports.plan_import(archive)
+        assert [(e.name, e.organization_id) for e in plan.entries] == [("Ball", org.id)]
+
+    def test_hidden_files_are_ignored(self, org):
+        archive = imports.open_archive(make_archive({"__MACOSX/._a.png": b"junk", ".thumb.png": png()}))
+        assert imports.plan_import(archive, organization_id=org.id).entries == []
+
+    def test_not_a_zip(self):
+        with pytest.raises(BusinessValidationError, match="not a valid ZIP"):
+            imports.open_archive(io.BytesIO(b"nope"))
+
+
+@pytest.mark.django_db
+class TestRunImport:
+    def test_imports_valid_entries_and_reports_bad_ones(self, org):
+        archive = imports.open_archive(make_archive({"a.png": png(), "b.png": png(), "broken.png": b"not an image"}))
+        plan = imports.plan_import(archive, organization_id=org.id)
+        seen = []
+        results = imports.run_import(archive, plan, generate_sound=False, batch_size=1, on_result=seen.append)
+
+        assert len(seen) == 3
+        errors = {r.file: r.error for r in results if r.error}
+        assert errors == {"broken.png": "File is not a valid image."}
+        created = Pictogram.objects.filter(organization=org).order_by("name")
+        assert [p.name for p in created] == ["a", "b"]
+        assert all(p.image and p.dominant_color == "#ff0000" for p in created)
+
+    def test_scope_errors_are_reported_per_entry(self, org, second_org, citizen):
+        manifest = [
+            {"file": "a.png", "citizen_id": citizen.id, "organization_id": second_org.id},
+            {"file": "b.png"},
+            {"file": "c.png", "citizen_id": 999999},
+        ]
+        files = {"a.png": png(), "b.png": png(), "c.png": png(), "manifest.json": json.dumps(manifest).encode()}
+        archive = imports.open_archive(make_archive(files))
+        plan = imports.plan_import(archive, organization_id=org.id)
+        results = imports.run_import(archive, plan, generate_sound=False)
+
+        errors = {r.file: r.error for r in results if r.error}
+        assert errors == {
+            "a.png": f"Citizen {citizen.id} does not belong to organization {second_org.id}.",
+            "c.png": "Citizen 999999 not found.",
+        }
+        assert [r.file for r in results if r.pictogram_id] == ["b.png"]
+
+
+@pytest.mark.django_db
+class TestImportAPI:
+    def _post(self, client, user, archive, **data):
+        upload = SimpleUploadedFile("library.zip", archive.read(), content_type="application/zip")
+        return client.post(
+            "/api/v1/pictograms/import",
+            data={"archive": upload, "generate_sound": False, **data},
+            **auth_header_for_user(user),
+        )
+
+    def test_import_runs_as_a_job(self, client, org, member):
+        response = self._post(client, member, make_archive({"a.png": png(), "x.png": b"bad"}), organization_id=org.id)
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        response = client.get(f"/api/v1/pictograms/import/{job_id}", **auth_header_for_user(member))
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["status"], data["total"], data["processed"], data["failed"]) == ("done", 2, 2, 1)
+        assert [c["file"] for c in data["created"]] == ["a.png"]
+        assert [e["file"] for e in data["errors"]] == ["x.png"]
+        assert not PictogramImportJob.objects.get(pk=job_id).archive
+
+    def test_job_is_private_to_its_creator(self, client, org, member, owner):
+        response = self._post(client, member, make_archive({"a.png": png()}), organization_id=org.id)
+        job_id = response.json()["id"]
+        response = client.get(f"/api/v1/pictograms/import/{job_id}", **auth_header_for_user(owner))
+        assert response.status_code == 404
+
+    def test_non_member_is_rejected(self, client, org, non_member):
+        response = self._post(client, non_member, make_archive({"a.png": png()}), organization_id=org.id)
+        assert response.status_code == 403
+        assert not Pictogram.objects.exists()
+        assert not PictogramImportJob.objects.exists()
+
+    def test_rejects_non_zip_upload(self, client, org, member):
+        response = self._post(client, member, io.BytesIO(png()), organization_id=org.id)
+        assert response.status_code == 422
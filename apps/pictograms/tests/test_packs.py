@@ -0,0 +1,72 @@
+"""Tests for offline pictogram media packs."""
+
+import io
+import json
+import zipfile
+
+import pytest
+from django.core.files.storage import default_storage
+
+from apps.pictograms import packs
+from apps.pictograms.models import Pictogram
+from apps.pictograms.tests.utils import make_test_audio, make_test_image
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.django_db
+class TestPlanPack:
+    def test_manifest_lists_citizen_library(self, org, citizen, second_org):
+        Pictogram.objects.create(name="Global", image_url="https://example.com/g.png")
+        Pictogram.objects.create(name="Org", image=make_test_image(), sound=make_test_audio(), organization=org)
+        Pictogram.objects.create(name="Mine", image_url="https://example.com/m.png", organization=org, citizen=citizen)
+        Pictogram.objects.create(name="Elsewhere", image_url="https://example.com/e.png", organization=second_org)
+
+        plan = packs.plan_pack(organization_id=org.id, citizen_id=citizen.id)
+        names = {e["name"] for e in plan.manifest["pictograms"]}
+        assert names == {"Global", "Org", "Mine"}
+        assert len(plan.files) == 2
+
+    def test_digest_changes_when_pictogram_changes(self, org):
+        p = Pictogram.objects.create(name="Before", image_url="https://example.com/b.png", organization=org)
+        digest = packs.plan_pack(organization_id=org.id, citizen_id=None).digest
+        assert packs.plan_pack(organization_id=org.id, citizen_id=None).digest == digest
+
+        p.name = "After"
+        p.save()
+        assert packs.plan_pack(organization_id=org.id, citizen_id=None).digest != digest
+
+
+@pytest.mark.django_db
+class TestGetOrBuildPack:
+    def test_archive_contains_manifest_and_media(self, org):
+        p = Pictogram.objects.create(name="Org", image=make_test_image(), sound=make_test_audio(), organization=org)
+        plan = packs.plan_pack(organization_id=org.id, citizen_id=None)
+
+        name = packs.get_or_build_pack(plan)
+        with default_storage.open(name, "rb") as fh, zipfile.ZipFile(io.BytesIO(fh.read())) as archive:
+            manifest = json.loads(archive.read(packs.MANIFEST_NAME))
+            entry = manifest["pictograms"][0]
+            assert entry["id"] == p.pk
+            assert archive.read(entry["image"]) == p.image.open("rb").read()
+            assert entry["sound"] in archive.namelist()
+            assert "source" not in entry
+
+    def test_reuses_existing_pack(self, org):
+        Pictogram.objects.create(name="Org", image=make_test_image(), organization=org)
+        plan = packs.plan_pack(organization_id=org.id, citizen_id=None)
+        first = packs.get_or_build_pack(plan)
+        assert packs.get_or_build_pack(plan) == first
+
+    def test_missing_file_is_dropped_from_manifest(self, org):
+        p = Pictogram.objects.create(name="Org", image=make_test_image(), organization=org)
+        default_storage.delete(p.image.name)
+        plan = packs.plan_pack(organization_id=org.id, citizen_id=None)
+
+        name = packs.get_or_build_pack(plan)
+        with default_storage.open(name, "rb") as fh, zipfile.ZipFile(io.BytesIO(fh.read())) as archive:
+            manifest = json.loads(archive.read(packs.MANIFEST_NAME))
+            assert manifest["pictograms"][0]["image"] is None
@@ -32,7 +32,7 @@ class TestValidateImageUrl:
         with pytest.raises(ValidationError, match="http and https"):
             PictogramCreateIn(name="test", image_url="ftp://evil.com/file")
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_rejects_loopback_ip(self, mock_getaddrinfo):
         mock_getaddrinfo.return_value = [
             (socket.AF_INET, socket.SOCK_STREAM, 0, "", ("127.0.0.1", 0)),
@@ -40,7 +40,7 @@ class TestValidateImageUrl:
         with pytest.raises(ValidationError, match="internal/private"):
             PictogramCreateIn(name="test", image_url="http://127.0.0.1/secret")
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_rejects_private_10_network(self, mock_getaddrinfo):
         mock_getaddrinfo.return_value = [
             (socket.AF_INET, socket.SOCK_STREAM, 0, "", ("10.0.0.1", 0)),
@@ -48,7 +48,7 @@ class TestValidateImageUrl:
         with pytest.raises(ValidationError, match="internal/private"):
             PictogramCreateIn(name="test", image_url="http://internal.corp/data")
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_rejects_link_local_metadata(self, mock_getaddrinfo):
         mock_getaddrinfo.return_value = [
             (socket.AF_INET, socket.SOCK_STREAM, 0, "", ("169.254.169.254", 0)),
@@ -56,7 +56,7 @@ class TestValidateImageUrl:
         with pytest.raises(ValidationError, match="internal/private"):
             PictogramCreateIn(name="test", image_url="http://169.254.169.254/latest/meta-data/")
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_rejects_private_192_168(self, mock_getaddrinfo):
         mock_getaddrinfo.return_value = [
             (socket.AF_INET, socket.SOCK_STREAM, 0, "", ("192.168.1.1", 0)),
@@ -64,7 +64,7 @@ class TestValidateImageUrl:
         with pytest.raises(ValidationError, match="internal/private"):
             PictogramCreateIn(name="test", image_url="http://192.168.1.1/admin")
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_rejects_ipv6_loopback(self, mock_getaddrinfo):
         mock_getaddrinfo.return_value = [
             (socket.AF_INET6, socket.SOCK_STREAM, 0, "", ("::1", 0, 0, 0)),
@@ -72,7 +72,7 @@ class TestValidateImageUrl:
         with pytest.raises(ValidationError, match="internal/private"):
             PictogramCreateIn(name="test", image_url="http://ipv6-loopback.evil.com/")
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_rejects_if_any_resolved_ip_is_private(self, mock_getaddrinfo):
         """If DNS returns both public and private IPs, reject."""
         mock_getaddrinfo.return_value = [
@@ -82,14 +82,14 @@ class TestValidateImageUrl:
         with pytest.raises(ValidationError, match="internal/private"):
             PictogramCreateIn(name="test", image_url="http://dual-homed.evil.com/")
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_unresolvable_host_passes(self, mock_getaddrinfo):
         """Unresolvable hostnames pass validation; they'll fail at fetch time."""
         mock_getaddrinfo.side_effect = socket.gaierror("Name or service not known")
         schema = PictogramCreateIn(name="test", image_url="http://doesnt-exist.invalid/img.png")
         assert schema.image_url == "http://doesnt-exist.invalid/img.png"
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_public_ip_passes(self, mock_getaddrinfo):
         mock_getaddrinfo.return_value = [
             (socket.AF_INET, socket.SOCK_STREAM, 0, "", ("93.184.216.34", 0)),
@@ -113,7 +113,7 @@ class TestPictogramUpdateInImageUrl:
         with pytest.raises(ValidationError, match="http and https"):
             PictogramUpdateIn(image_url="file:///etc/passwd")
 
-    @patch("apps.pictograms.schemas.socket.getaddrinfo")
+    @patch("core.dns.socket.getaddrinfo")
     def test_rejects_private_ip(self, mock_getaddrinfo):
         mock_getaddrinfo.return_value = [
             (socket.AF_INET, socket.SOCK_STREAM, 0, "", ("10.0.0.1", 0)),
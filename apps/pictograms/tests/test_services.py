@@ -5,11 +5,13 @@ from unittest.mock import patch
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
 from PIL import Image
 
 from apps.pictograms.services import PictogramService
-from apps.pictograms.tests.utils import make_test_audio, make_test_image
-from core.exceptions import BusinessValidationError
+from apps.pictograms.tests.utils import make_pattern_image, make_test_audio, make_test_image
+from core import imagehash
+from core.exceptions import BusinessValidationError, ExternalFetchError
 
 
 @pytest.mark.django_db
@@ -38,6 +40,16 @@ class TestPictogramServiceUpload:
         assert p.pk is not None
         assert p.name == "Valid"
 
+    def test_upload_sets_placeholders(self):
+        p = PictogramService.upload_pictogram(name="Red", image=make_test_image(), generate_sound=False)
+        assert len(p.blurhash) == 28
+        assert p.dominant_color == "#ff0000"
+
+    def test_upload_sets_image_hash_and_bands(self):
+        p = PictogramService.upload_pictogram(name="Pattern", image=make_pattern_image(), generate_sound=False)
+        assert len(p.image_hash) == 16
+        assert [p.image_hash_b0, p.image_hash_b1, p.image_hash_b2, p.image_hash_b3] == imagehash.bands(p.image_hash)
+
     def test_upload_with_sound_file(self):
         image = make_test_image()
         sound = make_test_audio()
@@ -92,7 +104,7 @@ class TestPictogramServiceCreate:
             name="AI Sound", image_url="https://example.com/img.png", generate_sound=True
         )
         assert p.pk is not None
-        mock_instance.generate_tts.assert_called_once_with("AI Sound")
+        mock_instance.generate_tts.assert_called_once_with("AI Sound", language="da")
         p.refresh_from_db()
         assert p.sound
 
@@ -398,3 +410,404 @@ class TestPictogramServiceCitizenScope:
         names = [p.name for p in results]
         assert "Global" in names
         assert "Citizen Pic" not in names
+
+
+@pytest.mark.django_db
+class TestPictogramServiceChanges:
+    @pytest.fixture(autouse=True)
+    def _no_cursor_margin(self, settings):
+        settings.PICTOGRAM_CHANGES_CURSOR_MARGIN = 0
+
+    def test_without_since_returns_full_scope(self, org):
+        PictogramService.create_pictogram(name="Global", image_url="http://g.png", generate_sound=False)
+        PictogramService.create_pictogram(
+            name="Org", image_url="http://o.png", organization_id=org.id, generate_sound=False
+        )
+        upserted, deleted, _cursor = PictogramService.list_changes(organization_id=org.id)
+        assert {p.name for p in upserted} == {"Global", "Org"}
+        assert deleted == []
+
+    def test_only_changes_after_cursor(self, org):
+        old = PictogramService.create_pictogram(
+            name="Old", image_url="http://o.png", organization_id=org.id, generate_sound=False
+        )
+        _, _, cursor = PictogramService.list_changes(organization_id=org.id)
+
+        PictogramService.create_pictogram(
+            name="New", image_url="http://n.png", organization_id=org.id, generate_sound=False
+        )
+        upserted, _, _ = PictogramService.list_changes(organization_id=org.id, since=cursor)
+        assert [p.name for p in upserted] == ["New"]
+
+        PictogramService.update_pictogram(pictogram_id=old.pk, name="Old renamed")
+        upserted, _, _ = PictogramService.list_changes(organization_id=org.id, since=cursor)
+        assert {p.name for p in upserted} == {"New", "Old renamed"}
+
+    def test_cursor_margin_covers_late_commits(self, org, settings):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from apps.pictograms.models import Pictogram
+
+        settings.PICTOGRAM_CHANGES_CURSOR_MARGIN = 60
+        _, _, cursor = PictogramService.list_changes(organization_id=org.id)
+        assert cursor < timezone.now() - timedelta(seconds=59)
+
+        # Stamped before the previous query ran, but committed only after it.
+        late = PictogramService.create_pictogram(
+            name="Late", image_url="http://l.png", organization_id=org.id, generate_sound=False
+        )
+        Pictogram.objects.filter(pk=late.pk).update(updated_at=timezone.now() - timedelta(seconds=30))
+
+        upserted, _, _ = PictogramService.list_changes(organization_id=org.id, since=cursor)
+        assert [p.name for p in upserted] == ["Late"]
+
+    def test_deletion_recorded_as_tombstone(self, org):
+        p = PictogramService.create_pictogram(
+            name="Doomed", image_url="http://d.png", organization_id=org.id, generate_sound=False
+        )
+        _, _, cursor = PictogramService.list_changes(organization_id=org.id)
+        PictogramService.delete_pictogram(pictogram_id=p.pk)
+
+        upserted, deleted, _ = PictogramService.list_changes(organization_id=org.id, since=cursor)
+        assert list(upserted) == []
+        assert deleted == [p.pk]
+
+    def test_tombstones_respect_scope(self, org, second_org, citizen):
+        _, _, cursor = PictogramService.list_changes(organization_id=org.id)
+        other = PictogramService.create_pictogram(
+            name="Other", image_url="http://x.png", organization_id=second_org.id, generate_sound=False
+        )
+        mine = PictogramService.create_pictogram(
+            name="Citizen",
+            image_url="http://c.png",
+            organization_id=org.id,
+            citizen_id=citizen.id,
+            generate_sound=False,
+        )
+        PictogramService.delete_pictogram(pictogram_id=other.pk)
+        PictogramService.delete_pictogram(pictogram_id=mine.pk)
+
+        _, org_deleted, _ = PictogramService.list_changes(organization_id=org.id, since=cursor)
+        _, citizen_deleted, _ = PictogramService.list_changes(
+            organization_id=org.id, citizen_id=citizen.id, since=cursor
+        )
+        assert org_deleted == []
+        assert citizen_deleted == [mine.pk]
+
+    def test_cascade_delete_leaves_tombstones(self, org, citizen):
+        from apps.pictograms.models import PictogramTombstone
+
+        p = PictogramService.create_pictogram(
+            name="Cascade",
+            image_url="http://c.png",
+            organization_id=org.id,
+            citizen_id=citizen.id,
+            generate_sound=False,
+        )
+        citizen_id = citizen.id
+        citizen.delete()
+        assert PictogramTombstone.objects.filter(pictogram_id=p.pk, citizen_id=citizen_id).exists()
+
+
+@pytest.mark.django_db
+class TestPictogramServiceMirror:
+    URL = "https://example.com/cat.png"
+
+    @pytest.fixture(autouse=True)
+    def _mirror_on(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.PICTOGRAM_MIRROR_EXTERNAL_IMAGES = True
+
+    def test_create_mirrors_external_image(self):
+        with patch("apps.pictograms.services.fetch_public_url", return_value=make_test_image().read()) as fetch:
+            p = PictogramService.create_pictogram(name="Cat", image_url=self.URL, generate_sound=False)
+        fetch.assert_called_once()
+        p.refresh_from_db()
+        assert p.image
+        assert p.mirrored_from == self.URL
+        assert p.dominant_color == "#ff0000"
+        assert p.image_url == self.URL
+
+    def test_fetch_failure_keeps_external_url(self):
+        with patch("apps.pictograms.services.fetch_public_url", side_effect=ExternalFetchError("blocked")):
+            p = PictogramService.create_pictogram(name="Cat", image_url=self.URL, generate_sound=False)
+        p.refresh_from_db()
+        assert not p.image
+        assert p.effective_image_url == self.URL
+
+    def test_invalid_image_is_not_stored(self):
+        with patch("apps.pictograms.services.fetch_public_url", return_value=b"<html>nope</html>"):
+            p = PictogramService.create_pictogram(name="Cat", image_url=self.URL, generate_sound=False)
+        p.refresh_from_db()
+        assert not p.image
+
+    def test_disabled_by_default(self, settings):
+        settings.PICTOGRAM_MIRROR_EXTERNAL_IMAGES = False
+        with patch("apps.pictograms.services.fetch_public_url") as fetch:
+            PictogramService.create_pictogram(name="Cat", image_url=self.URL, generate_sound=False)
+        fetch.assert_not_called()
+
+    def test_stale_url_is_not_applied(self):
+        with patch("apps.pictograms.services.fetch_public_url", side_effect=ExternalFetchError("down")):
+            p = PictogramService.create_pictogram(name="Cat", image_url=self.URL, generate_sound=False)
+        with patch("apps.pictograms.services.fetch_public_url", return_value=make_test_image().read()):
+            assert PictogramService.mirror_external_image(p.pk, "https://example.com/old.png") is False
+        p.refresh_from_db()
+        assert not p.image
+
+    def test_changing_url_replaces_mirrored_copy(self):
+        new_url = "https://example.com/dog.png"
+        with patch("apps.pictograms.services.fetch_public_url", return_value=make_test_image().read()):
+            p = PictogramService.create_pictogram(name="Cat", image_url=self.URL, generate_sound=False)
+        p.refresh_from_db()
+        assert p.image
+        with patch("apps.pictograms.services.fetch_public_url", side_effect=ExternalFetchError("down")):
+            p = PictogramService.update_pictogram(pictogram_id=p.pk, image_url=new_url)
+        p.refresh_from_db()
+        assert not p.image
+        assert p.mirrored_from == ""
+        assert p.effective_image_url == new_url
+
+
+@pytest.mark.django_db
+class TestPictogramServiceBulkCreate:
+    def _items(self, n, **extra):
+        return [
+            {"name": f"P{i}", "image_url": f"https://example.com/{i}.png", "generate_sound": False, **extra}
+            for i in range(n)
+        ]
+
+    def test_query_count_is_independent_of_batch_size(self, org, citizen, django_assert_max_num_queries):
+        items = self._items(50, organization_id=org.id, citizen_id=citizen.id)
+        # savepoint + citizen lookup + organization lookup + one INSERT + release
+        with django_assert_max_num_queries(5):
+            created = PictogramService.bulk_create_pictograms(items)
+        assert len(created) == 50
+        assert all(p.pk for p in created)
+
+    def test_rejects_citizen_from_other_org(self, citizen, second_org):
+        items = self._items(2, organization_id=second_org.id, citizen_id=citizen.id)
+        with pytest.raises(BusinessValidationError, match="Item 0: citizen does not belong"):
+            PictogramService.bulk_create_pictograms(items)
+
+    def test_invalid_item_rolls_back_batch(self, org):
+        from apps.pictograms.models import Pictogram
+
+        items = [*self._items(2, organization_id=org.id), {"name": "No image", "organization_id": org.id}]
+        with pytest.raises(BusinessValidationError, match="Item 2: A pictogram must have"):
+            PictogramService.bulk_create_pictograms(items)
+        assert not Pictogram.objects.exists()
+
+    def test_generate_image_requires_fallback_url(self, org):
+        items = [{"name": "AI", "organization_id": org.id, "generate_image": True}]
+        with pytest.raises(BusinessValidationError, match="image_url fallback"):
+            PictogramService.bulk_create_pictograms(items)
+
+    @patch("apps.pictograms.services.GirafAIClient")
+    def test_generation_runs_as_one_batch(self, mock_client, org):
+        mock_client.return_value.generate_tts.return_value = b"\xff\xfb\x90\x00" * 100
+        items = self._items(3, organization_id=org.id, generate_sound=True)
+        created = PictogramService.bulk_create_pictograms(items)
+        assert mock_client.return_value.generate_tts.call_count == 3
+        for p in created:
+            p.refresh_from_db()
+            assert p.sound
+
+
+@pytest.mark.django_db
+class TestPictogramServiceClone:
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_clones_org_pictograms_sharing_files(self, owner, org, second_org, citizen):
+        from apps.pictograms.models import Pictogram
+
+        uploaded = PictogramService.upload_pictogram(
+            name="Apple", image=make_test_image(), organization_id=org.id, generate_sound=False
+        )
+        Pictogram.objects.create(name="Ball", image_url="https://example.com/b.png", organization=org)
+        Pictogram.objects.create(name="Own", image_url="https://example.com/p.png", organization=org, citizen=citizen)
+        Pictogram.objects.create(name="Global", image_url="https://example.com/g.png")
+
+        job = PictogramService.clone_library(
+            user=owner, target_organization_id=second_org.id, source_organization_id=org.id
+        )
+
+        assert (job.status, job.total, job.copied) == ("done", 2, 2)
+        copies = Pictogram.objects.filter(organization=second_org).order_by("name")
+        assert [p.name for p in copies] == ["Apple", "Ball"]
+        apple = copies[0]
+        assert apple.pk != uploaded.pk
+        assert apple.image.name == uploaded.image.name
+        assert apple.blurhash == uploaded.blurhash
+        assert apple.citizen_id is None
+
+    def test_clones_citizen_pictograms_as_org_pictograms(self, owner, org, second_org, citizen):
+        from apps.pictograms.models import Pictogram
+
+        Pictogram.objects.create(name="Mine", image_url="https://example.com/m.png", organization=org, citizen=citizen)
+        job = PictogramService.clone_library(
+            user=owner, target_organization_id=second_org.id, source_citizen_id=citizen.id
+        )
+        assert job.copied == 1
+        copy = Pictogram.objects.get(organization=second_org)
+        assert copy.citizen_id is None
+
+    def test_large_libraries_are_cloned_in_background(self, owner, org, second_org):
+        from apps.pictograms.models import Pictogram
+
+        Pictogram.objects.bulk_create(
+            Pictogram(name=f"P{i}", image_url="https://example.com/p.png", organization=org) for i in range(3)
+        )
+        with (
+            patch("apps.pictograms.services.CLONE_SYNC_LIMIT", 2),
+            patch("apps.pictograms.services.defer") as defer,
+        ):
+            job = PictogramService.clone_library(
+                user=owner, target_organization_id=second_org.id, source_organization_id=org.id
+            )
+            again = PictogramService.clone_library(
+                user=owner, target_organization_id=second_org.id, source_organization_id=org.id
+            )
+        assert (job.status, job.total) == ("pending", 3)
+        assert again.pk == job.pk
+        defer.assert_called_once_with(PictogramService.run_clone_job, job.pk)
+
+        job = PictogramService.run_clone_job(job.pk)
+        assert (job.status, job.copied) == ("done", 3)
+        assert Pictogram.objects.filter(organization=second_org).count() == 3
+
+    def test_lost_job_is_reported_failed(self, owner, org, second_org):
+        from apps.pictograms.models import PictogramCloneJob
+        from apps.pictograms.services import CLONE_JOB_STALE_AFTER
+
+        job = PictogramCloneJob.objects.create(
+            created_by=owner, target_organization_id=second_org.id, source_organization_id=org.id
+        )
+        PictogramCloneJob.objects.filter(pk=job.pk).update(created_at=timezone.now() - CLONE_JOB_STALE_AFTER * 2)
+        assert PictogramService.get_clone_job(job.pk, owner).status == "failed"
+
+    def test_requires_exactly_one_source(self, owner, org, second_org, citizen):
+        with pytest.raises(BusinessValidationError, match="exactly one"):
+            PictogramService.clone_library(
+                user=owner,
+                target_organization_id=second_org.id,
+                source_organization_id=org.id,
+                source_citizen_id=citizen.id,
+            )
+
+
+@pytest.mark.django_db
+class TestPictogramServiceBulkUpdate:
+    def test_regeneration_runs_as_one_batch(self, org):
+        from apps.pictograms.models import Pictogram
+
+        pictograms = [
+            Pictogram.objects.create(name=f"P{i}", image_url="https://example.com/p.png", organization=org)
+            for i in range(3)
+        ]
+        items = [{"id": p.pk, "regenerate_sound": True} for p in pictograms]
+        with patch("apps.pictograms.services.defer") as defer:
+            PictogramService.bulk_update_pictograms(pictograms, items)
+        defer.assert_called_once_with(
+            PictogramService._generate_assets_batch, [], [(p.pk, p.name) for p in pictograms]
+        )
+
+
+@pytest.mark.django_db
+class TestPictogramServiceFindSimilar:
+    def _upload(self, name, seed=0, size=64, **scope):
+        return PictogramService.upload_pictogram(
+            name=name, image=make_pattern_image(seed, size), generate_sound=False, **scope
+        )
+
+    def test_finds_resized_copy_and_skips_different_image(self, org):
+        original = self._upload("Original", organization_id=org.id)
+        copy = self._upload("Copy", size=200, organization_id=org.id)
+        self._upload("Other", seed=1, organization_id=org.id)
+
+        similar = PictogramService.find_similar(original.image_hash, organization_id=org.id, exclude_id=original.pk)
+        assert [(p.pk, d) for p, d in similar] == [(copy.pk, imagehash.distance(original.image_hash, copy.image_hash))]
+
+    def test_respects_library_scope(self, org, second_org):
+        original = self._upload("Mine", organization_id=org.id)
+        self._upload("Theirs", organization_id=second_org.id)
+        shared = self._upload("Global")
+
+        similar = PictogramService.find_similar(original.image_hash, organization_id=org.id, exclude_id=original.pk)
+        assert [p.pk for p, _d in similar] == [shared.pk]
+
+    def test_empty_hash_matches_nothing(self, org):
+        from apps.pictograms.models import Pictogram
+
+        Pictogram.objects.create(name="Url", image_url="https://example.com/p.png", organization=org)
+        assert PictogramService.find_similar("", organization_id=org.id) == []
+
+    def test_url_change_clears_hash_of_mirrored_image(self, org):
+        p = self._upload("Mirrored", organization_id=org.id)
+        type(p).objects.filter(pk=p.pk).update(mirrored_from="https://example.com/old.png")
+
+        updated = PictogramService.update_pictogram(pictogram_id=p.pk, image_url="https://example.com/new.png")
+        assert updated.image_hash == ""
+        assert updated.image_hash_b0 is None
+
+
+
+@pytest.mark.django_db
+class TestPictogramServiceSoundVariants:
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def _pictogram(self, org):
+        from apps.pictograms.models import Pictogram
+
+        return Pictogram.objects.create(
+            name="Apple", image_url="https://example.com/a.png", sound=make_test_audio(), organization=org
+        )
+
+    def test_default_language_is_the_pictogram_sound(self, org):
+        p = self._pictogram(org)
+        with patch("apps.pictograms.services.GirafAIClient") as mock_client:
+            assert PictogramService.get_sound(p, "da") == p.sound.name
+        mock_client.assert_not_called()
+
+    @patch("apps.pictograms.services.GirafAIClient")
+    def test_variant_is_generated_once(self, mock_client, org):
+        from apps.pictograms.models import PictogramSound
+
+        mock_client.return_value.generate_tts.return_value = b"RIFF-english"
+        p = self._pictogram(org)
+
+        first = PictogramService.get_sound(p, "en")
+        second = PictogramService.get_sound(p, "en")
+        assert first == second
+        assert first != p.sound.name
+        mock_client.return_value.generate_tts.assert_called_once_with("Apple", language="en")
+        assert PictogramSound.objects.get(pictogram=p, language="en").sound.read() == b"RIFF-english"
+
+    @patch("apps.pictograms.services.GirafAIClient")
+    def test_unavailable_ai_yields_no_variant(self, mock_client, org):
+        from apps.pictograms.models import PictogramSound
+        from core.exceptions import GirafAIUnavailableError
+
+        mock_client.return_value.generate_tts.side_effect = GirafAIUnavailableError("down")
+        p = self._pictogram(org)
+        assert PictogramService.get_sound(p, "en") is None
+        assert not PictogramSound.objects.exists()
+
+    @patch("apps.pictograms.services.GirafAIClient")
+    def test_rename_drops_variants(self, mock_client, org):
+        from apps.pictograms.models import PictogramSound
+
+        mock_client.return_value.generate_tts.return_value = b"RIFF-english"
+        p = self._pictogram(org)
+        PictogramService.get_sound(p, "en")
+
+        PictogramService.update_pictogram(pictogram_id=p.pk, name="Apple")
+        assert PictogramSound.objects.exists()
+        PictogramService.update_pictogram(pictogram_id=p.pk, name="Pear")
+        assert not PictogramSound.objects.exists()
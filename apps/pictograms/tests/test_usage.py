@@ -0,0 +1,165 @@
+"""Tests for write-behind pictogram usage counters and popularity ranking."""
+
+import threading
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.pictograms import usage
+from apps.pictograms.models import Pictogram, PictogramPopularity, PictogramUsage
+from apps.pictograms.services import PictogramService
+from conftest import auth_header_for_user
+
+URL = "https://example.com/p.png"
+
+
+@pytest.fixture(autouse=True)
+def _reset_counters():
+    usage.reset()
+    yield
+    usage.reset()
+
+
+def _pictograms(org, *names):
+    return [Pictogram.objects.create(name=name, image_url=URL, organization=org) for name in names]
+
+
+@pytest.mark.django_db
+class TestUsageCounters:
+    def test_record_does_not_write_until_flushed(self, org):
+        (p,) = _pictograms(org, "Apple")
+        usage.record([p.pk, p.pk])
+        assert not PictogramUsage.objects.exists()
+
+        assert usage.flush() == 1
+        assert PictogramUsage.objects.get(pictogram=p, day=timezone.localdate()).count == 2
+
+    def test_flush_adds_to_existing_bucket(self, org):
+        a, b = _pictograms(org, "Apple", "Banana")
+        usage.record([a.pk])
+        usage.flush()
+        usage.record([a.pk, a.pk, b.pk])
+        usage.flush()
+
+        counts = dict(PictogramUsage.objects.values_list("pictogram__name", "count"))
+        assert counts == {"Apple": 3, "Banana": 1}
+
+    def test_flush_is_batched(self, org, django_assert_max_num_queries):
+        pictograms = _pictograms(org, *(f"P{i}" for i in range(20)))
+        usage.record(p.pk for p in pictograms)
+        # savepoint + existence check + one upsert + release
+        with django_assert_max_num_queries(4):
+            assert usage.flush() == 20
+
+    def test_flush_drops_deleted_pictograms(self, org):
+        a, b = _pictograms(org, "Apple", "Banana")
+        usage.record([a.pk, b.pk])
+        b.delete()
+        assert usage.flush() == 1
+
+    def test_flushes_automatically_when_interval_elapsed(self, org, settings):
+        settings.PICTOGRAM_USAGE_FLUSH_INTERVAL = 0
+        (p,) = _pictograms(org, "Apple")
+        usage.record([p.pk])
+        assert PictogramUsage.objects.get(pictogram=p).count == 1
+
+    def test_timer_flushes_without_further_records(self, settings, monkeypatch):
+        settings.BACKGROUND_TASKS_SYNC = False
+        settings.PICTOGRAM_USAGE_FLUSH_INTERVAL = 1
+        flushed = threading.Event()
+        monkeypatch.setattr(usage, "flush", flushed.set)
+        monkeypatch.setattr(usage, "_last_flush", 0.0)
+
+        usage.record([1])
+        assert flushed.wait(5)
+
+    def test_flush_on_exit_writes_pending(self, org):
+        (p,) = _pictograms(org, "Apple")
+        usage.record([p.pk])
+        usage.flush_on_exit()
+        assert PictogramUsage.objects.get(pictogram=p).count == 1
+
+    def test_flushes_automatically_when_too_many_pending(self, org, settings):
+        settings.PICTOGRAM_USAGE_MAX_PENDING = 2
+        a, b = _pictograms(org, "Apple", "Banana")
+        usage.record([a.pk])
+        assert not PictogramUsage.objects.exists()
+        usage.record([b.pk])
+        assert PictogramUsage.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestPopularityRanking:
+    def test_refresh_ranks_sums_window_and_prunes_old_buckets(self, org):
+        a, b = _pictograms(org, "Apple", "Banana")
+        today = timezone.localdate()
+        PictogramUsage.objects.create(pictogram=a, day=today, count=2)
+        PictogramUsage.objects.create(pictogram=a, day=today - timedelta(days=1), count=2)
+        PictogramUsage.objects.create(pictogram=b, day=today, count=3)
+        PictogramUsage.objects.create(pictogram=b, day=today - timedelta(days=40), count=100)
+
+        assert usage.refresh_ranks(window_days=30) == 2
+        assert dict(PictogramPopularity.objects.values_list("pictogram__name", "score")) == {"Apple": 4, "Banana": 3}
+        assert PictogramUsage.objects.count() == 3
+
+    def test_popular_ordering_puts_unranked_last(self, org):
+        _apple, b, c = _pictograms(org, "Apple", "Banana", "Cherry")
+        PictogramPopularity.objects.create(pictogram=c, score=5)
+        PictogramPopularity.objects.create(pictogram=b, score=1)
+
+        qs = PictogramService.list_pictograms(organization_id=org.id, ordering="popular")
+        assert [p.name for p in qs] == ["Cherry", "Banana", "Apple"]
+
+    def test_bulk_delete_removes_usage(self, org):
+        (p,) = _pictograms(org, "Apple")
+        PictogramUsage.objects.create(pictogram=p, day=timezone.localdate(), count=1)
+        PictogramPopularity.objects.create(pictogram=p, score=1)
+
+        assert PictogramService.bulk_delete_pictograms([p]) == [p.pk]
+        assert not PictogramUsage.objects.exists()
+        assert not PictogramPopularity.objects.exists()
+
+    def test_command_refreshes_ranks(self, org):
+        (p,) = _pictograms(org, "Apple")
+        PictogramUsage.objects.create(pictogram=p, day=timezone.localdate(), count=7)
+        call_command("refresh_pictogram_popularity")
+        assert PictogramPopularity.objects.get(pictogram=p).score == 7
+
+
+@pytest.mark.django_db
+class TestUsageAPI:
+    def test_record_usage_and_list_popular(self, client, org, member):
+        headers = auth_header_for_user(member)
+        a, b = _pictograms(org, "Apple", "Banana")
+
+        response = client.get(f"/api/v1/pictograms?organization_id={org.id}&ordering=popular", **headers)
+        assert [p["name"] for p in response.json()["items"]] == ["Apple", "Banana"]
+
+        response = client.post(
+            "/api/v1/pictograms/usage", data={"ids": [b.pk, b.pk, a.pk]}, content_type="application/json", **headers
+        )
+        assert response.status_code == 204
+        usage.flush()
+        usage.refresh_ranks()
+
+        # The ranking refresh invalidates cached popular pages.
+        response = client.get(f"/api/v1/pictograms?organization_id={org.id}&ordering=popular", **headers)
+        assert [p["name"] for p in response.json()["items"]] == ["Banana", "Apple"]
+
+    def test_record_usage_requires_membership(self, client, org, non_member):
+        (p,) = _pictograms(org, "Apple")
+        response = client.post(
+            "/api/v1/pictograms/usage",
+            data={"ids": [p.pk]},
+            content_type="application/json",
+            **auth_header_for_user(non_member),
+        )
+        assert response.status_code == 403
+
+    def test_unknown_ordering_is_rejected(self, client, org, member):
+        response = client.get(
+            f"/api/v1/pictograms?organization_id={org.id}&ordering=newest", **auth_header_for_user(member)
+        )
+        assert response.status_code == 400
@@ -1,6 +1,7 @@
 """Shared test utilities for pictogram tests."""
 
 import io
+import random
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from PIL import Image
@@ -18,3 +19,14 @@ def make_test_image(fmt="PNG", name="test.png") -> SimpleUploadedFile:
 def make_test_audio(name="test.mp3", size=1024) -> SimpleUploadedFile:
     """Create a minimal audio file for testing."""
     return SimpleUploadedFile(name, b"\xff" * size, content_type="audio/mpeg")
+
+
+def make_pattern_image(seed=0, size=64, name="pattern.png") -> SimpleUploadedFile:
+    """Create a PNG of random gray blocks; different seeds give perceptually different images."""
+    rng = random.Random(seed)
+    pattern = Image.new("L", (9, 8))
+    pattern.putdata([rng.randrange(256) for _ in range(9 * 8)])
+    buf = io.BytesIO()
+    pattern.resize((size, size), Image.Resampling.NEAREST).convert("RGB").save(buf, format="PNG")
+    buf.seek(0)
+    return SimpleUploadedFile(name, buf.read(), content_type="image/png")
@@ -0,0 +1,167 @@
+"""Write-behind usage counters and popularity ranks for pictograms.
+
+``record`` only increments an in-process counter keyed by ``(pictogram, day)``.
+The counters are flushed to ``PictogramUsage`` as batched upserts that add
+to the stored count: by a per-process timer thread (started by the first
+``record``) every ``PICTOGRAM_USAGE_FLUSH_INTERVAL`` seconds, by ``record``
+itself once ``PICTOGRAM_USAGE_MAX_PENDING`` counters are pending, and by
+gunicorn's ``worker_exit`` hook. A busy picker thus costs a handful of
+writes per minute instead of one per view. Counts are still lost if a
+process dies without a clean exit, which is acceptable for a ranking signal.
+
+``refresh_ranks`` rebuilds ``PictogramPopularity`` from the recent buckets
+with one ``INSERT ... SELECT`` and bumps ``POPULARITY_SCOPE``, the cache
+version that ``ordering=popular`` library pages are keyed on.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.pictograms import cache as library_cache
+from apps.pictograms.models import Pictogram, PictogramPopularity, PictogramUsage
+from core.background import defer
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 500
+
+_lock = threading.Lock()
+_pending: Counter[tuple[int, date]] = Counter()
+_last_flush = time.monotonic()
+_flush_scheduled = False
+_flusher: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def _flush_logged() -> None:
+    """``flush`` for threads outside a request: log failures and release the connection."""
+    try:
+        flush()
+    except Exception:
+        logger.exception("Flushing pictogram usage counters failed")
+    finally:
+        connection.close()
+
+
+def _flush_periodically(stop: threading.Event) -> None:
+    interval = getattr(settings, "PICTOGRAM_USAGE_FLUSH_INTERVAL", 60)
+    while not stop.wait(max(interval, 1)):
+        if time.monotonic() - _last_flush >= interval:
+            _flush_logged()
+
+
+def _ensure_flusher() -> None:
+    """Start this process's flush timer. Called lazily, so every forked worker gets its own."""
+    global _flusher
+    if getattr(settings, "BACKGROUND_TASKS_SYNC", False) or (_flusher is not None and _flusher.is_alive()):
+        return
+    _flusher = threading.Thread(target=_flush_periodically, args=(_stop,), name="usage-flush", daemon=True)
+    _flusher.start()
+
+
+def record(pictogram_ids: Iterable[int]) -> None:
+    """Count one use of each ID (repeat an ID to count it several times)."""
+    global _flush_scheduled
+    day = timezone.localdate()
+    with _lock:
+        _ensure_flusher()
+        _pending.update((pk, day) for pk in pictogram_ids)
+        due = (
+            len(_pending) >= getattr(settings, "PICTOGRAM_USAGE_MAX_PENDING", 5000)
+            or time.monotonic() - _last_flush >= getattr(settings, "PICTOGRAM_USAGE_FLUSH_INTERVAL", 60)
+        )
+        if not due or _flush_scheduled:
+            return
+        _flush_scheduled = True
+    defer(flush)
+
+
+def _upsert(rows: list[tuple[int, date, int]]) -> None:
+    qn = connection.ops.quote_name
+    table = qn(PictogramUsage._meta.db_table)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), FLUSH_BATCH_SIZE):
+            batch = rows[start : start + FLUSH_BATCH_SIZE]
+            cursor.execute(
+                f"INSERT INTO {table} ({qn('pictogram_id')}, {qn('day')}, {qn('count')}) "
+                f"VALUES {', '.join(['(%s, %s, %s)'] * len(batch))} "
+                f"ON CONFLICT ({qn('pictogram_id')}, {qn('day')}) "
+                f"DO UPDATE SET {qn('count')} = {table}.{qn('count')} + excluded.{qn('count')}",
+                [value for row in batch for value in row],
+            )
+
+
+def flush() -> int:
+    """Write pending counters to the database. Returns the number of counters written.
+
+    Counters of pictograms deleted in the meantime are dropped. If the write
+    fails, the counters are kept for the next flush.
+    """
+    global _last_flush, _flush_scheduled
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+        _flush_scheduled = False
+    if not pending:
+        return 0
+    try:
+        with transaction.atomic():
+            existing = set(
+                Pictogram.objects.filter(pk__in={pk for pk, _day in pending}).values_list("pk", flat=True)
+            )
+            rows = [(pk, day, count) for (pk, day), count in pending.items() if pk in existing]
+            _upsert(rows)
+    except Exception:
+        with _lock:
+            _pending.update(pending)
+        raise
+    return len(rows)
+
+
+@transaction.atomic
+def refresh_ranks(window_days: int | None = None) -> int:
+    """Recompute popularity scores from the last *window_days* days and prune older buckets.
+
+    Returns the number of ranked pictograms.
+    """
+    days = window_days or int(getattr(settings, "PICTOGRAM_POPULARITY_WINDOW_DAYS", 30))
+    since = timezone.localdate() - timedelta(days=days - 1)
+    PictogramUsage.objects.filter(day__lt=since).delete()
+    PictogramPopularity.objects.all().delete()
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {qn(PictogramPopularity._meta.db_table)} ({qn('pictogram_id')}, {qn('score')}) "
+            f"SELECT {qn('pictogram_id')}, SUM({qn('count')}) FROM {qn(PictogramUsage._meta.db_table)} "
+            f"GROUP BY {qn('pictogram_id')}"
+        )
+        ranked: int = cursor.rowcount
+    library_cache.invalidate([library_cache.POPULARITY_SCOPE])
+    return ranked
+
+
+def flush_on_exit() -> None:
+    """Write pending counters before the process exits (gunicorn ``worker_exit``)."""
+    _stop.set()
+    _flush_logged()
+
+
+def reset() -> None:
+    """Stop the flush timer and drop pending counters without writing them (tests)."""
+    global _flush_scheduled, _flusher, _stop
+    _stop.set()
+    if _flusher is not None:
+        _flusher.join()
+    _flusher, _stop = None, threading.Event()
+    with _lock:
+        _pending.clear()
+        _flush_scheduled = False
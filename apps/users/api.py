@@ -2,12 +2,14 @@
 
 from django.conf import settings
 from ninja import File, Router
+from ninja.decorators import decorate_view
 from ninja.files import UploadedFile
 
 from apps.users.schemas import PasswordChangeIn, RegisterIn, UserOut, UserUpdateIn
 from apps.users.services import UserService
 from core.schemas import ErrorOut
 from core.throttling import PasswordChangeRateThrottle, RegisterRateThrottle
+from core.uploadhandlers import IMAGE_UPLOAD, validated_uploads
 
 router = Router(tags=["users"])
 
@@ -64,6 +66,7 @@ def delete_account(request):
 
 
 @router.post("/users/me/profile-picture", response={200: UserOut, 422: ErrorOut})
+@decorate_view(validated_uploads(file=IMAGE_UPLOAD))
 def upload_profile_picture(request, file: File[UploadedFile]):
     """Upload a profile picture."""
     updated = UserService.upload_profile_picture(user_id=request.auth.id, file=file)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_alter_user_profile_picture'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_picture_thumbnail',
+            field=models.ImageField(blank=True, help_text='128px rendition of the profile picture', null=True, upload_to='profile_pictures/%Y/%m/%d/'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=models.ImageField(blank=True, help_text='User profile picture, resized to 512px (uploads up to 20MB, JPEG/PNG/WebP)', null=True, upload_to='profile_pictures/%Y/%m/%d/'),
+        ),
+    ]
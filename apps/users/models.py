@@ -19,7 +19,13 @@ class User(AbstractUser):
         upload_to="profile_pictures/%Y/%m/%d/",
         null=True,
         blank=True,
-        help_text="User profile picture (max 20MB, JPEG/PNG/WebP)",
+        help_text="User profile picture, resized to 512px (uploads up to 20MB, JPEG/PNG/WebP)",
+    )
+    profile_picture_thumbnail = models.ImageField(
+        upload_to="profile_pictures/%Y/%m/%d/",
+        null=True,
+        blank=True,
+        help_text="128px rendition of the profile picture",
     )
 
     class Meta:
@@ -32,3 +32,4 @@ class UserOut(Schema):
     display_name: str
     is_active: bool
     profile_picture: str | None
+    profile_picture_thumbnail: str | None
@@ -7,14 +7,25 @@ import logging
 
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
 
 from apps.users.models import User
+from core.background import defer
 from core.exceptions import BusinessValidationError, ConflictError, ResourceNotFoundError
-from core.validators import sanitized_image_filename, validate_image_upload
+from core.validators import resize_image, sanitized_image_filename, validate_image_upload
 
 logger = logging.getLogger(__name__)
 
+PROFILE_PICTURE_SIZE = 512
+PROFILE_PICTURE_THUMBNAIL_SIZE = 128
+
+
+def _delete_stored_files(names: list[str]) -> None:
+    for name in names:
+        default_storage.delete(name)
+
 
 class UserService:
     @staticmethod
@@ -107,20 +118,29 @@ class UserService:
         logger.info("User deactivated: id=%d username=%s", user.id, user.username)
 
     @staticmethod
+    @transaction.atomic
     def upload_profile_picture(*, user_id: int, file: UploadedFile) -> User:
-        """Upload and validate profile picture.
+        """Validate a profile picture and store it as 512px and 128px renditions.
+
+        Both renditions are re-encoded, which drops EXIF and other metadata.
+        The previous files are deleted in the background after commit.
 
         Raises:
             BusinessValidationError: If file type or size is invalid.
         """
         user = UserService.get_user(user_id)
         mime_type = validate_image_upload(file)
+        picture = resize_image(file, max_dimension=PROFILE_PICTURE_SIZE, mime_type=mime_type)
+        thumbnail = resize_image(picture, max_dimension=PROFILE_PICTURE_THUMBNAIL_SIZE, mime_type=mime_type)
+        picture.seek(0)
+
+        old_names = [f.name for f in (user.profile_picture, user.profile_picture_thumbnail) if f]
 
-        # Delete old profile picture if exists
-        if user.profile_picture:
-            user.profile_picture.delete(save=False)
+        # Save new renditions with sanitized filenames
+        user.profile_picture.save(sanitized_image_filename(mime_type), picture, save=False)
+        user.profile_picture_thumbnail.save(sanitized_image_filename(mime_type), thumbnail, save=False)
+        user.save(update_fields=["profile_picture", "profile_picture_thumbnail"])
 
-        # Save new profile picture with sanitized filename
-        safe_name = sanitized_image_filename(mime_type)
-        user.profile_picture.save(safe_name, file, save=True)
+        if old_names:
+            defer(_delete_stored_files, old_names)
         return user
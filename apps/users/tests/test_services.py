@@ -61,3 +61,39 @@ class TestUserService:
         file = SimpleUploadedFile("fake.png", b"not an image at all", content_type="image/png")
         with pytest.raises(BusinessValidationError):
             UserService.upload_profile_picture(user_id=registered_user.id, file=file)
+
+
+@pytest.mark.django_db
+class TestProfilePicturePipeline:
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    @staticmethod
+    def _photo(size=(2000, 1000)) -> SimpleUploadedFile:
+        img = Image.new("RGB", size, color="green")
+        exif = Image.Exif()
+        exif[0x010F] = "PhoneMaker"  # Make
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", exif=exif)
+        return SimpleUploadedFile("photo.jpg", buf.getvalue(), content_type="image/jpeg")
+
+    def test_stores_resized_renditions_without_metadata(self, registered_user):
+        user = UserService.upload_profile_picture(user_id=registered_user.id, file=self._photo())
+
+        with user.profile_picture.open("rb") as fh:
+            picture = Image.open(fh)
+            assert picture.size == (512, 256)
+            assert not picture.getexif()
+        with user.profile_picture_thumbnail.open("rb") as fh:
+            assert Image.open(fh).size == (128, 64)
+
+    def test_replacing_deletes_old_files(self, registered_user):
+        from django.core.files.storage import default_storage
+
+        first = UserService.upload_profile_picture(user_id=registered_user.id, file=self._photo())
+        old_names = [first.profile_picture.name, first.profile_picture_thumbnail.name]
+
+        second = UserService.upload_profile_picture(user_id=registered_user.id, file=self._photo((300, 300)))
+        assert all(not default_storage.exists(name) for name in old_names)
+        assert default_storage.exists(second.profile_picture.name)
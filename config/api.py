@@ -23,6 +23,7 @@ from apps.invitations.api import receiver_router as invitations_receiver_router
 from apps.organizations.api import router as organizations_router
 from apps.pictograms.api import router as pictograms_router
 from apps.users.api import router as users_router
+from core.api import media_router
 from core.exceptions import (
     BadRequestError,
     BusinessValidationError,
@@ -139,3 +140,4 @@ api.add_router("", grades_router)
 api.add_router("/pictograms", pictograms_router)
 api.add_router("/organizations", invitations_org_router)
 api.add_router("/invitations", invitations_receiver_router)
+api.add_router("", media_router)
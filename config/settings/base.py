@@ -139,6 +139,30 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# When set (e.g. "/protected-media/"), authorized media endpoints reply with an
+# X-Accel-Redirect to this nginx `internal` location (aliased to MEDIA_ROOT)
+# instead of streaming the file from Python.
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get("MEDIA_ACCEL_REDIRECT_PREFIX", "")
+
+# When True, pictogram image/sound URLs are HMAC-signed links to
+# /api/v1/media/... that expire; verified without DB access. The key defaults
+# to SECRET_KEY. URLs are issued in TTL/4 buckets, so each lives at least
+# 3/4 of the TTL — keep that above PICTOGRAM_LIBRARY_CACHE_TIMEOUT.
+MEDIA_SIGNED_URLS = os.environ.get("MEDIA_SIGNED_URLS", "false").lower() == "true"
+MEDIA_URL_SIGNING_KEY = os.environ.get("MEDIA_URL_SIGNING_KEY", "")
+MEDIA_SIGNED_URL_TTL = int(os.environ.get("MEDIA_SIGNED_URL_TTL", "3600"))
+
+# core.dns resolver: lookups give up after DNS_RESOLVE_TIMEOUT seconds; answers
+# are cached per process for DNS_CACHE_TTL, failures for DNS_NEGATIVE_CACHE_TTL.
+DNS_RESOLVE_TIMEOUT = float(os.environ.get("DNS_RESOLVE_TIMEOUT", "2"))
+DNS_CACHE_TTL = int(os.environ.get("DNS_CACHE_TTL", "300"))
+DNS_NEGATIVE_CACHE_TTL = int(os.environ.get("DNS_NEGATIVE_CACHE_TTL", "30"))
+
+# When True, pictograms created with an external image_url get a local copy
+# downloaded in the background (SSRF-checked); effective_image_url then
+# serves the copy instead of the third-party host.
+PICTOGRAM_MIRROR_EXTERNAL_IMAGES = os.environ.get("PICTOGRAM_MIRROR_EXTERNAL_IMAGES", "false").lower() == "true"
+
 # Allow uploads up to 25MB (pictogram images can be large phone photos).
 DATA_UPLOAD_MAX_MEMORY_SIZE = 25 * 1024 * 1024
 
@@ -188,7 +212,7 @@ LOGGING = {
 }
 
 # ---------------------------------------------------------------------------
-# Cache (used by rate limiting)
+# Cache (used by rate limiting and pictogram library pages)
 # NOTE: Replace LocMemCache with Redis in production for multi-process support.
 # ---------------------------------------------------------------------------
 
@@ -198,6 +222,26 @@ CACHES = {
     }
 }
 
+# Serialized pictogram library pages are cached per (org, citizen, search, page)
+# and invalidated through per-scope version counters (apps/pictograms/cache.py).
+PICTOGRAM_LIBRARY_CACHE_TIMEOUT = 300
+
+# Delta-sync cursors (GET /pictograms/changes) lag the query by this many
+# seconds so writes stamped before the query but committed after it are
+# reported on the next call. Keep it above the longest pictogram write
+# transaction (bulk writes, import batches, library clones).
+PICTOGRAM_CHANGES_CURSOR_MARGIN = 300
+
+# Pictogram usage events (apps/pictograms/usage.py) are counted in memory and
+# written by a per-process timer every PICTOGRAM_USAGE_FLUSH_INTERVAL seconds,
+# sooner once PICTOGRAM_USAGE_MAX_PENDING counters are pending, and when a
+# gunicorn worker exits. "Popular" ordering reads ranks summed over the last
+# PICTOGRAM_POPULARITY_WINDOW_DAYS days, recomputed by
+# `manage.py refresh_pictogram_popularity` (run it periodically, e.g. hourly).
+PICTOGRAM_USAGE_FLUSH_INTERVAL = 60
+PICTOGRAM_USAGE_MAX_PENDING = 5000
+PICTOGRAM_POPULARITY_WINDOW_DAYS = 30
+
 # ---------------------------------------------------------------------------
 # Cookie security
 # ---------------------------------------------------------------------------
@@ -219,6 +263,22 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 GIRAF_AI_URL = os.environ.get("GIRAF_AI_URL", "")
 
+# TTS languages. `Pictogram.sound` is spoken in PICTOGRAM_SOUND_LANGUAGE; the
+# other PICTOGRAM_SOUND_LANGUAGES are generated on first request to
+# GET /pictograms/{id}/sound (?language= or Accept-Language) and then stored.
+PICTOGRAM_SOUND_LANGUAGE = os.environ.get("PICTOGRAM_SOUND_LANGUAGE", "da")
+PICTOGRAM_SOUND_LANGUAGES = [
+    code.strip().lower() for code in os.environ.get("PICTOGRAM_SOUND_LANGUAGES", "da,en").split(",") if code.strip()
+]
+
 # When True, TTS generation runs synchronously instead of in a background
 # thread.  Enabled in tests to keep them deterministic.
 TTS_SYNC = False
+
+# ---------------------------------------------------------------------------
+# Background tasks (core/background.py)
+# ---------------------------------------------------------------------------
+
+# When True, deferred jobs (e.g. media cleanup) run inline instead of in a
+# background thread after commit.
+BACKGROUND_TASKS_SYNC = False
@@ -29,3 +29,4 @@ NINJA_JWT = {
 
 # Run TTS synchronously so tests are deterministic (no background threads).
 TTS_SYNC = True
+BACKGROUND_TASKS_SYNC = True
@@ -9,6 +9,7 @@ from ninja_jwt.tokens import AccessToken
 
 from apps.organizations.models import Membership, Organization, OrgRole
 from apps.users.tests.factories import UserFactory
+from core import dns
 
 
 @pytest.fixture(autouse=True)
@@ -19,6 +20,12 @@ def _clear_throttle_cache():
     cache.clear()
 
 
+@pytest.fixture(autouse=True)
+def _clear_dns_cache():
+    """Forget cached DNS answers so per-test getaddrinfo patches take effect."""
+    dns.clear_cache()
+
+
 @pytest.fixture
 def owner(db):
     return UserFactory(username="owner", password="testpass123")
@@ -0,0 +1,31 @@
+"""Cross-cutting API endpoints."""
+
+import time
+
+from django.utils.cache import patch_cache_control
+from ninja import Router
+
+from core.exceptions import PermissionDeniedError
+from core.media import serve_media, verify_media_signature
+from core.schemas import ErrorOut
+
+media_router = Router(tags=["media"])
+
+
+@media_router.get(
+    "/media/{path:path}",
+    response={200: None, 403: ErrorOut, 404: ErrorOut},
+    auth=None,
+    url_name="signed_media",
+)
+def get_signed_media(request, path: str, exp: int, sig: str):
+    """Serve a media file via a signed URL (see ``core.media.signed_media_url``).
+
+    Verification is a single HMAC comparison: no authentication, no DB query.
+    """
+    if not verify_media_signature(path, exp, sig):
+        raise PermissionDeniedError("Invalid or expired media link.")
+    # The signed URL names the stored file, so content-addressed files never change under it.
+    response = serve_media(request, path, immutable=True)
+    patch_cache_control(response, max_age=max(0, exp - int(time.time())))
+    return response
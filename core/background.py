@@ -0,0 +1,36 @@
+"""Fire-and-forget background work.
+
+``defer`` runs a callable in a daemon thread once the current transaction
+commits, so request handlers do not wait on slow side effects such as file
+deletion. Work is lost if the process exits first; only use it for jobs
+that are safe to skip or redo. With ``BACKGROUND_TASKS_SYNC`` (tests) the
+callable runs inline instead.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _run(func: Callable[..., Any], *args: Any) -> None:
+    try:
+        func(*args)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(func, "__qualname__", func))
+    finally:
+        connection.close()
+
+
+def defer(func: Callable[..., Any], *args: Any) -> None:
+    """Run ``func(*args)`` in a background thread after the current transaction commits."""
+    if getattr(settings, "BACKGROUND_TASKS_SYNC", False):
+        func(*args)
+        return
+
+    transaction.on_commit(lambda: threading.Thread(target=_run, args=(func, *args), daemon=True).start())
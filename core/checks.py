@@ -19,3 +19,22 @@ def check_cors_not_open(app_configs, **kwargs):
             )
         )
     return errors
+
+
+@register(Tags.security)
+def check_signed_media_url_ttl(app_configs, **kwargs):
+    """Warn if signed media URLs can expire while a cached library page still links to them."""
+    errors = []
+    if not getattr(settings, "MEDIA_SIGNED_URLS", False):
+        return errors
+    # URLs are issued in TTL/4 buckets, so the shortest remaining lifetime is 3/4 of the TTL.
+    min_lifetime = settings.MEDIA_SIGNED_URL_TTL * 3 // 4
+    if min_lifetime <= getattr(settings, "PICTOGRAM_LIBRARY_CACHE_TIMEOUT", 0):
+        errors.append(
+            DjangoWarning(
+                "Signed media URLs may expire before cached pictogram library pages do.",
+                hint="Raise MEDIA_SIGNED_URL_TTL above 4/3 of PICTOGRAM_LIBRARY_CACHE_TIMEOUT.",
+                id="giraf.W002",
+            )
+        )
+    return errors
@@ -67,11 +67,11 @@ class GirafAIClient:
         })
         return base64.b64decode(result["image_base64"])
 
-    def generate_tts(self, text: str) -> bytes:
-        """Generate TTS audio from text. Returns raw audio bytes (MP3)."""
+    def generate_tts(self, text: str, language: str = "da") -> bytes:
+        """Generate TTS audio from text in *language* (ISO 639-1). Returns raw audio bytes (MP3)."""
         result = self._post("/api/v1/tts", {
             "text": text,
-            "language": "da",
+            "language": language,
             "format": "wav",
         })
         return base64.b64decode(result["audio_base64"])
@@ -0,0 +1,87 @@
+"""Conditional GET support (ETag / If-None-Match) for Ninja views.
+
+Validators are derived from data the view already has in hand — timestamps
+and primary keys of fetched rows, or cache version stamps — so a matching
+``If-None-Match`` is answered with 304 before anything is serialized.
+"""
+
+import hashlib
+import inspect
+from collections.abc import Callable
+from functools import wraps
+from typing import Any
+
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+# Ninja injects its temporal response into any view parameter annotated with
+# HttpResponse; the decorator claims one under this name to set the ETag header.
+_RESPONSE_ARG = "_conditional_response"
+
+
+def make_etag(*parts: object) -> str:
+    """Build a weak ETag from arbitrary hashable parts."""
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: HttpRequest, etag: str) -> bool:
+    """Whether the request's ``If-None-Match`` header matches *etag* (weak comparison)."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in parse_etags(header))
+
+
+def not_modified(etag: str) -> HttpResponse:
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    return response
+
+
+def instance_etag(obj: Any) -> str:
+    """ETag for a single model instance with an ``updated_at`` field."""
+    return make_etag(obj._meta.label, obj.pk, obj.updated_at)
+
+
+def page_etag(page: dict) -> str:
+    """ETag for a ``LimitOffsetPagination`` page of models with ``updated_at``."""
+    return make_etag(page["count"], [(obj.pk, obj.updated_at) for obj in page["items"]])
+
+
+def conditional(etag_func: Callable[[Any], str]) -> Callable:
+    """Answer ``If-None-Match`` with 304 and emit ``ETag`` on a Ninja GET view.
+
+    Place it between ``@router.get`` and ``@paginate`` (if any). *etag_func*
+    receives the 200 body — a model instance or a page dict whose items are
+    already fetched — after the view's permission checks have run.
+    """
+
+    def decorator(view_func: Callable) -> Callable:
+        signature = inspect.signature(view_func)
+
+        @wraps(view_func)
+        def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+            response: HttpResponse = kwargs.pop(_RESPONSE_ARG)
+            result = view_func(request, *args, **kwargs)
+            status, body = result if isinstance(result, tuple) else (200, result)
+            if status != 200:
+                return result
+            etag = etag_func(body)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            response["ETag"] = etag
+            return result
+
+        wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(_RESPONSE_ARG, inspect.Parameter.KEYWORD_ONLY, annotation=HttpResponse),
+            ]
+        )
+        return wrapper
+
+    return decorator
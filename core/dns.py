@@ -0,0 +1,88 @@
+"""Cached, time-bounded DNS resolution.
+
+``socket.getaddrinfo`` blocks for as long as the system resolver takes and
+has no timeout argument, so calling it inside request validation can pin a
+worker thread on slow DNS. ``resolve`` instead runs the lookup on a small
+shared thread pool, waits at most ``DNS_RESOLVE_TIMEOUT`` seconds, and keeps
+a per-process cache of answers (``DNS_CACHE_TTL``) and failures
+(``DNS_NEGATIVE_CACHE_TTL``). Concurrent lookups of the same host share one
+in-flight query.
+"""
+
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_ENTRIES = 1024
+
+_lock = threading.Lock()
+# hostname -> (expires_at, addresses or None for a cached failure)
+_cache: dict[str, tuple[float, tuple[str, ...] | None]] = {}
+_inflight: dict[str, Future[tuple[str, ...]]] = {}
+# Hung lookups occupy a worker until the OS resolver gives up; a few workers
+# are enough because callers stop waiting after the timeout either way.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dns")
+
+
+def _lookup(hostname: str) -> tuple[str, ...]:
+    infos = socket.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+    # getaddrinfo returns both A (IPv4) and AAAA (IPv6) records; keep order, drop duplicates.
+    # The sockaddr's first item is the address string for both families.
+    return tuple(dict.fromkeys(str(sockaddr[0]) for _family, _type, _proto, _name, sockaddr in infos))
+
+
+def _store(hostname: str, addresses: tuple[str, ...] | None) -> None:
+    if addresses is None:
+        ttl = getattr(settings, "DNS_NEGATIVE_CACHE_TTL", 30)
+    else:
+        ttl = getattr(settings, "DNS_CACHE_TTL", 300)
+    with _lock:
+        if len(_cache) >= _MAX_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+        _cache[hostname] = (time.monotonic() + ttl, addresses)
+
+
+def resolve(hostname: str) -> tuple[str, ...]:
+    """Return the IP addresses of *hostname*, from cache when fresh.
+
+    Raises:
+        socket.gaierror: If the host does not resolve, the lookup timed out,
+            or a recent lookup failed (negative cache).
+    """
+    hostname = hostname.lower().rstrip(".")
+    with _lock:
+        cached = _cache.get(hostname)
+        if cached is not None and cached[0] > time.monotonic():
+            if cached[1] is None:
+                raise socket.gaierror(socket.EAI_NONAME, f"{hostname} recently failed to resolve")
+            return cached[1]
+        future = _inflight.get(hostname)
+        if future is None:
+            future = _executor.submit(_lookup, hostname)
+            _inflight[hostname] = future
+            future.add_done_callback(lambda _f: _inflight.pop(hostname, None))
+
+    try:
+        addresses = future.result(timeout=getattr(settings, "DNS_RESOLVE_TIMEOUT", 2.0))
+    except FutureTimeoutError:
+        logger.warning("DNS lookup for %s timed out", hostname)
+        _store(hostname, None)
+        raise socket.gaierror(socket.EAI_AGAIN, f"DNS lookup for {hostname} timed out") from None
+    except (socket.gaierror, UnicodeError) as e:
+        _store(hostname, None)
+        raise socket.gaierror(socket.EAI_NONAME, f"{hostname} does not resolve") from e
+    _store(hostname, addresses)
+    return addresses
+
+
+def clear_cache() -> None:
+    """Forget all cached answers (tests, or after resolver configuration changes)."""
+    with _lock:
+        _cache.clear()
@@ -39,3 +39,7 @@ class InvitationSendError(InvitationError, BadRequestError):
 
 class GirafAIUnavailableError(ServiceError):
     """The giraf-ai service is not reachable or not yet deployed."""
+
+
+class ExternalFetchError(ServiceError):
+    """A third-party URL could not be fetched safely (blocked address, error status, too large)."""
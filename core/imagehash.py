@@ -0,0 +1,57 @@
+"""Perceptual image hashing (dHash) for near-duplicate detection.
+
+The difference hash compares each pixel of a 9x8 grayscale thumbnail with
+its right neighbour, giving 64 bits that survive re-encoding, resizing and
+small edits. Two images are near-duplicates when the Hamming distance of
+their hashes is small.
+
+To find candidates without scanning every hash, a hash is split into
+``BANDS`` bands of 16 bits (multi-index hashing): by the pigeonhole
+principle, hashes within ``BANDS - 1`` bits of each other share at least one
+band exactly, so an indexed equality lookup per band finds them all.
+"""
+
+from typing import IO
+
+from PIL import Image, ImageOps
+
+BANDS = 4
+_BAND_BITS = 64 // BANDS
+# Largest distance the band lookup is guaranteed to find.
+MAX_DISTANCE = BANDS - 1
+
+
+def dhash(img: Image.Image) -> str:
+    """64-bit difference hash of *img* as 16 hex digits."""
+    img = ImageOps.exif_transpose(img).convert("RGBA")
+    background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+    gray = Image.alpha_composite(background, img).convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+    pixels = list(gray.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return f"{value:016x}"
+
+
+def compute_dhash(file: IO[bytes]) -> str:
+    """Return the dHash of an image file; rewinds *file*."""
+    file.seek(0)
+    with Image.open(file) as img:
+        img.load()
+        result = dhash(img)
+    file.seek(0)
+    return result
+
+
+def bands(image_hash: str) -> list[int]:
+    """Split a hex hash into ``BANDS`` integers, most significant first."""
+    value = int(image_hash, 16)
+    mask = (1 << _BAND_BITS) - 1
+    return [(value >> (_BAND_BITS * (BANDS - 1 - i))) & mask for i in range(BANDS)]
+
+
+def distance(a: str, b: str) -> int:
+    """Hamming distance between two hex hashes."""
+    return (int(a, 16) ^ int(b, 16)).bit_count()
@@ -0,0 +1,130 @@
+"""Delete media files that no database row references any more.
+
+Rows are deleted (directly or by cascade) and files are replaced without the
+old file being removed, so storage accumulates orphans. This command:
+
+1. collects every path referenced by a ``FileField`` on any model, iterating
+   the DB in chunks and loading only the column values;
+2. walks the storage directories those fields upload into, one directory
+   listing at a time;
+3. deletes unreferenced files older than ``--min-age`` in batches.
+
+Derived caches (offline packs, atlases) are never referenced by rows; they
+are rebuilt on demand, so they are pruned by age alone.
+"""
+
+import os
+import posixpath
+from collections.abc import Iterator
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import Storage, default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+
+from apps.pictograms.atlas import ATLAS_DIR
+from apps.pictograms.packs import PACK_DIR
+
+DERIVED_DIRS = (PACK_DIR, ATLAS_DIR)
+
+
+def _file_fields() -> Iterator[tuple[type[models.Model], models.FileField]]:
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, models.FileField) and field.storage is default_storage:
+                yield model, field
+
+
+def _upload_roots() -> set[str]:
+    """Top-level storage directories that FileFields upload into."""
+    roots: set[str] = set()
+    for _model, field in _file_fields():
+        if callable(field.upload_to) or not field.upload_to:
+            continue
+        roots.add(os.fspath(field.upload_to).split("/", 1)[0])
+    return roots
+
+
+def _referenced_names(chunk_size: int) -> set[str]:
+    names: set[str] = set()
+    for model, field in _file_fields():
+        qs = model._base_manager.exclude(**{field.name: ""}).exclude(**{f"{field.name}__isnull": True})
+        names.update(qs.values_list(field.name, flat=True).iterator(chunk_size=chunk_size))
+    return names
+
+
+def walk_storage(storage: Storage, path: str) -> Iterator[str]:
+    """Yield every file name under *path*, listing one directory at a time."""
+    try:
+        dirs, files = storage.listdir(path)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield posixpath.join(path, name)
+    for name in dirs:
+        yield from walk_storage(storage, posixpath.join(path, name))
+
+
+class Command(BaseCommand):
+    help = "Delete media files not referenced by any database row (and stale derived caches)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report orphans without deleting them.")
+        parser.add_argument(
+            "--min-age",
+            type=float,
+            default=24.0,
+            help="Only delete files older than this many hours, so in-flight uploads are kept (default: 24).",
+        )
+        parser.add_argument(
+            "--derived-max-age",
+            type=float,
+            default=7 * 24.0,
+            help="Prune offline packs and atlases older than this many hours (default: 168).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Files deleted per batch (default: 500).")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+        now = timezone.now()
+        orphan_cutoff = now - timedelta(hours=options["min_age"])
+        derived_cutoff = now - timedelta(hours=options["derived_max_age"])
+
+        referenced = _referenced_names(chunk_size=batch_size)
+        self.stdout.write(f"{len(referenced)} referenced file(s).")
+
+        count = total_bytes = 0
+        batch: list[str] = []
+        for root in sorted(_upload_roots() | set(DERIVED_DIRS)):
+            cutoff = derived_cutoff if root in DERIVED_DIRS else orphan_cutoff
+            for name in walk_storage(default_storage, root):
+                if name in referenced:
+                    continue
+                try:
+                    if default_storage.get_modified_time(name) > cutoff:
+                        continue
+                    size = default_storage.size(name)
+                except FileNotFoundError:
+                    continue
+                count += 1
+                total_bytes += size
+                if dry_run:
+                    self.stdout.write(f"  would delete {name} ({size} bytes)")
+                    continue
+                batch.append(name)
+                if len(batch) >= batch_size:
+                    self._delete(batch)
+        self._delete(batch)
+
+        verb = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {count} file(s), {total_bytes} bytes."))
+
+    def _delete(self, batch: list[str]) -> None:
+        for name in batch:
+            default_storage.delete(name)
+        if batch:
+            self.stdout.write(f"  deleted batch of {len(batch)}")
+        batch.clear()
@@ -0,0 +1,215 @@
+"""Media file delivery without reading file bytes in Python.
+
+With ``MEDIA_ACCEL_REDIRECT_PREFIX`` set, responses carry an empty body and
+an ``X-Accel-Redirect`` header; the front proxy (nginx) then serves the file
+from an ``internal`` location mapped to ``MEDIA_ROOT``. Without a proxy,
+``FileResponse`` streams the open file, which WSGI servers hand to
+``os.sendfile`` via ``wsgi.file_wrapper``.
+
+Responses carry a strong ETag and honor ``If-None-Match``, ``Range`` and
+``If-Range`` (single byte ranges), so interrupted or seeked playback only
+fetches the missing bytes. Files named by their SHA-256 (see
+``content_addressed_name``) never change, so they get a content-derived ETag;
+``Cache-Control: immutable`` is only sent when the requested URL itself names
+that file (signed ``/media/...`` links). Stable endpoints such as
+``/pictograms/{id}/sound`` serve whatever file is current, so browsers must
+revalidate them.
+
+Signed URLs grant access to one storage path until an expiry time. They are
+verified with an HMAC alone (no session, no DB), so a grid of images costs
+no authorization queries. Expiry is rounded up to a bucket so the same file
+gets the same URL for a while, keeping cached pages and browser caches warm.
+"""
+
+import base64
+import hashlib
+import hmac
+import mimetypes
+import posixpath
+import re
+import time
+from collections.abc import Iterator
+from typing import IO
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpRequest, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+
+from core.conditional import etag_matches, not_modified
+from core.exceptions import ResourceNotFoundError
+
+_CONTENT_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_CHUNK_SIZE = 64 * 1024
+_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def content_addressed_name(file: IO[bytes], extension: str) -> str:
+    """File name made of the SHA-256 of *file*'s content plus *extension*.
+
+    Uses ``content_sha256`` when the upload handler already computed it;
+    otherwise hashes the file in chunks. Rewinds *file*.
+    """
+    digest = getattr(file, "content_sha256", None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        file.seek(0)
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+    file.seek(0)
+    return f"{digest}{extension}"
+
+
+def _content_hash(name: str) -> str | None:
+    stem = posixpath.splitext(posixpath.basename(name))[0]
+    return stem if _CONTENT_HASH_RE.match(stem) else None
+
+
+def _media_etag(name: str) -> str:
+    content_hash = _content_hash(name)
+    if content_hash:
+        return f'"{content_hash}"'
+    # Legacy names: size + mtime, like nginx's static ETags.
+    try:
+        size = default_storage.size(name)
+        mtime = default_storage.get_modified_time(name).timestamp()
+    except FileNotFoundError as e:
+        raise ResourceNotFoundError("Media file not found.") from e
+    return f'"{hashlib.sha256(f"{name}:{size}:{mtime}".encode()).hexdigest()[:32]}"'
+
+
+def _requested_range(request: HttpRequest, etag: str, size: int) -> tuple[int, int] | None:
+    """Resolve a single ``Range`` header to ``(start, end)`` inclusive, or None for a full response.
+
+    Returns ``(size, size)`` when the range cannot be satisfied.
+    """
+    match = _RANGE_RE.match(request.headers.get("Range", "").strip())
+    if not match or not any(match.groups()):
+        return None
+    # If-Range needs a strong match; a stale validator means "send it all".
+    if_range = request.headers.get("If-Range")
+    if if_range is not None and if_range.strip() != etag:
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return size, size
+    return start, end
+
+
+def _iter_range(fh: IO[bytes], start: int, length: int) -> Iterator[bytes]:
+    try:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def serve_media(request: HttpRequest, name: str, *, immutable: bool = False) -> HttpResponseBase:
+    """Respond with the stored file *name*, offloading the body where possible.
+
+    Pass *immutable* only when the request URL addresses this exact file
+    (not e.g. "the current sound of pictogram N"); it takes effect for
+    content-addressed names. Otherwise clients revalidate with the ETag.
+
+    Raises:
+        ResourceNotFoundError: If the file is missing from storage.
+    """
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    etag = _media_etag(name)
+    immutable = immutable and _content_hash(name) is not None
+
+    response: HttpResponseBase
+    if etag_matches(request, etag):
+        response = not_modified(etag)
+    elif prefix := getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", ""):
+        # nginx answers Range / If-Range itself for internal redirects.
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{quote(name)}"
+    else:
+        try:
+            fh = default_storage.open(name, "rb")
+        except FileNotFoundError as e:
+            raise ResourceNotFoundError("Media file not found.") from e
+        size = fh.size
+        byte_range = _requested_range(request, etag, size)
+        if byte_range is None:
+            response = FileResponse(fh, content_type=content_type)
+        elif byte_range == (size, size):
+            fh.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _iter_range(fh, start, end - start + 1), status=206, content_type=content_type
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = str(end - start + 1)
+
+    response["ETag"] = etag
+    response["Accept-Ranges"] = "bytes"
+    # Media behind authorization must not land in shared caches.
+    if immutable:
+        patch_cache_control(response, private=True, max_age=_IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _signing_key() -> bytes:
+    key = getattr(settings, "MEDIA_URL_SIGNING_KEY", "") or settings.SECRET_KEY
+    return hashlib.sha256(b"giraf.media-url:" + key.encode()).digest()
+
+
+def _signature(name: str, expires: int) -> str:
+    mac = hmac.new(_signing_key(), f"{name}\n{expires}".encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(mac[:16]).rstrip(b"=").decode()
+
+
+def signed_url_epoch() -> int:
+    """Start of the current expiry bucket. Changes whenever newly issued URLs change."""
+    bucket = settings.MEDIA_SIGNED_URL_TTL // 4
+    return int(time.time()) // bucket * bucket
+
+
+def signed_media_url(name: str) -> str:
+    """URL serving storage file *name* without authentication until it expires.
+
+    URLs stay valid for between 3/4 and all of ``MEDIA_SIGNED_URL_TTL``.
+    """
+    expires = signed_url_epoch() + settings.MEDIA_SIGNED_URL_TTL
+    path = reverse("api-1.0.0:signed_media", kwargs={"path": name})
+    return f"{path}?{urlencode({'exp': expires, 'sig': _signature(name, expires)})}"
+
+
+def media_url(name: str) -> str:
+    """Public URL for storage file *name*: signed if ``MEDIA_SIGNED_URLS``, else plain ``MEDIA_URL``."""
+    if settings.MEDIA_SIGNED_URLS:
+        return signed_media_url(name)
+    return default_storage.url(name)
+
+
+def media_url_epoch() -> int:
+    """Value to mix into validators of responses embedding ``media_url`` links."""
+    return signed_url_epoch() if settings.MEDIA_SIGNED_URLS else 0
+
+
+def verify_media_signature(name: str, expires: int, signature: str) -> bool:
+    """Whether *signature* is valid for *name* and *expires* has not passed."""
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_signature(name, expires), signature)
@@ -4,6 +4,8 @@ Reusable helpers for checking organization membership and role-based access.
 All role checks use the hierarchy: OWNER > ADMIN > MEMBER.
 """
 
+from collections.abc import Iterable
+
 from apps.organizations.models import ROLE_HIERARCHY, Membership
 from core.exceptions import PermissionDeniedError
 
@@ -43,6 +45,23 @@ def check_role_or_raise(user, org_id: int, *, min_role: str) -> None:
         raise PermissionDeniedError(msg)
 
 
+def check_roles_or_raise(user, org_ids: Iterable[int], *, min_role: str) -> None:
+    """Require at least *min_role* in every organization, using a single membership query."""
+    org_ids = set(org_ids)
+    if not org_ids:
+        return
+    roles = dict(
+        Membership.objects.filter(user=user, organization_id__in=org_ids).values_list("organization_id", "role")
+    )
+    if org_ids - roles.keys():
+        raise PermissionDeniedError("You are not a member of this organization.")
+
+    required_level = ROLE_HIERARCHY.get(min_role, 999)
+    for role in roles.values():
+        if ROLE_HIERARCHY.get(role, -1) < required_level:
+            raise PermissionDeniedError(f"Insufficient permissions. Required: {min_role}, your role: {role}.")
+
+
 def check_invitation_receiver(user, invitation) -> None:
     """Raise PermissionDeniedError if the user is not the invitation's receiver."""
     if invitation.receiver_id != user.id:
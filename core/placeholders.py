@@ -0,0 +1,114 @@
+"""Tiny image placeholders: BlurHash strings and dominant colors.
+
+Clients paint these instantly while the real image loads. The BlurHash
+encoder follows the reference algorithm (https://blurha.sh); the image is
+first shrunk to a few dozen pixels, so pure Python is fast enough.
+"""
+
+import math
+from typing import IO
+
+from PIL import Image, ImageOps
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+# Placeholders are blurry by design; sampling more pixels changes nothing visible.
+_SAMPLE_SIZE = 32
+COMPONENTS_X = 4
+COMPONENTS_Y = 3
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // 83 ** (length - i)) % 83] for i in range(1, length + 1))
+
+
+def _srgb_to_linear(value: int) -> float:
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exp: float) -> float:
+    return math.copysign(abs(value) ** exp, value)
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """Apply EXIF orientation, composite transparency onto white, and shrink."""
+    img = ImageOps.exif_transpose(img)
+    img = img.convert("RGBA")
+    img.thumbnail((_SAMPLE_SIZE, _SAMPLE_SIZE))
+    background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+    return Image.alpha_composite(background, img).convert("RGB")
+
+
+def blurhash(img: Image.Image, components_x: int = COMPONENTS_X, components_y: int = COMPONENTS_Y) -> str:
+    """Encode *img* as a BlurHash string."""
+    img = _flatten(img)
+    width, height = img.size
+    data = img.tobytes()  # packed RGB
+    pixels = [
+        (_srgb_to_linear(data[i]), _srgb_to_linear(data[i + 1]), _srgb_to_linear(data[i + 2]))
+        for i in range(0, len(data), 3)
+    ]
+
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(components_x)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(components_y)]
+
+    factors: list[tuple[float, float, float]] = []
+    for j in range(components_y):
+        for i in range(components_x):
+            normalisation = 1 if i == j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                basis_y = cos_y[j][y]
+                for x in range(width):
+                    basis = normalisation * cos_x[i][x] * basis_y
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = 1 / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((components_x - 1) + (components_y - 1) * 9, 1)
+    if ac:
+        actual_max = max(abs(c) for factor in ac for c in factor)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        max_value = 1.0
+        result += _base83(0, 1)
+
+    result += _base83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        qr, qg, qb = (max(0, min(18, int(_sign_pow(c / max_value, 0.5) * 9 + 9.5))) for c in factor)
+        result += _base83(qr * 19 * 19 + qg * 19 + qb, 2)
+    return result
+
+
+def dominant_color(img: Image.Image) -> str:
+    """Most common color of *img* (transparency flattened onto white) as ``#rrggbb``."""
+    small = _flatten(img).quantize(colors=8, method=Image.Quantize.MEDIANCUT)
+    palette = small.getpalette() or []
+    counts = small.histogram()  # pixels per palette index
+    index = max(range(len(counts)), key=lambda i: (counts[i], i))
+    r, g, b = palette[index * 3 : index * 3 + 3] or (255, 255, 255)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def compute_placeholders(file: IO[bytes]) -> tuple[str, str]:
+    """Return ``(blurhash, dominant_color)`` for an image file; rewinds *file*."""
+    file.seek(0)
+    with Image.open(file) as img:
+        img.load()
+        result = blurhash(img), dominant_color(img)
+    file.seek(0)
+    return result
@@ -0,0 +1,41 @@
+"""Tests for deferred background tasks."""
+
+import pytest
+
+from core.background import _run, defer
+
+
+@pytest.mark.django_db
+class TestDefer:
+    def test_sync_mode_runs_inline(self, settings):
+        settings.BACKGROUND_TASKS_SYNC = True
+        calls = []
+        defer(calls.append, 1)
+        assert calls == [1]
+
+    def test_async_mode_waits_for_commit(self, settings, django_capture_on_commit_callbacks, monkeypatch):
+        settings.BACKGROUND_TASKS_SYNC = False
+        started = []
+
+        class FakeThread:
+            def __init__(self, target, args, daemon):
+                self.target, self.args = target, args
+
+            def start(self):
+                started.append(self.args)
+                self.target(*self.args)
+
+        monkeypatch.setattr("core.background.threading.Thread", FakeThread)
+        calls = []
+        with django_capture_on_commit_callbacks(execute=True):
+            defer(calls.append, 2)
+            assert calls == []
+        assert calls == [2]
+        assert len(started) == 1
+
+    def test_worker_failure_is_logged_not_raised(self, caplog):
+        def boom():
+            raise RuntimeError("boom")
+
+        _run(boom)
+        assert "Background task" in caplog.text
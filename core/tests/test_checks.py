@@ -1,6 +1,6 @@
 """Tests for security system checks."""
 
-from core.checks import check_cors_not_open
+from core.checks import check_cors_not_open, check_signed_media_url_ttl
 
 
 class TestCorsCheck:
@@ -28,3 +28,25 @@ class TestCorsCheck:
         warnings = check_cors_not_open(app_configs=None)
 
         assert len(warnings) == 0
+
+
+class TestSignedMediaUrlTtlCheck:
+    def test_warns_when_ttl_shorter_than_library_cache(self, settings):
+        settings.MEDIA_SIGNED_URLS = True
+        settings.MEDIA_SIGNED_URL_TTL = 300
+        settings.PICTOGRAM_LIBRARY_CACHE_TIMEOUT = 300
+
+        warnings = check_signed_media_url_ttl(app_configs=None)
+
+        assert [w.id for w in warnings] == ["giraf.W002"]
+
+    def test_no_warning_with_default_ttl(self, settings):
+        settings.MEDIA_SIGNED_URLS = True
+
+        assert check_signed_media_url_ttl(app_configs=None) == []
+
+    def test_no_warning_when_signing_disabled(self, settings):
+        settings.MEDIA_SIGNED_URLS = False
+        settings.MEDIA_SIGNED_URL_TTL = 1
+
+        assert check_signed_media_url_ttl(app_configs=None) == []
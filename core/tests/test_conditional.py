@@ -0,0 +1,85 @@
+"""Tests for ETag / conditional GET support."""
+
+import pytest
+from django.http import HttpRequest
+from django.test import RequestFactory
+
+from apps.citizens.models import Citizen
+from conftest import auth_header_for_user
+from core.conditional import etag_matches, make_etag
+
+
+class TestEtagMatches:
+    def _request(self, header: str | None) -> HttpRequest:
+        headers = {"If-None-Match": header} if header is not None else {}
+        return RequestFactory().get("/", headers=headers)
+
+    def test_no_header(self):
+        assert etag_matches(self._request(None), make_etag(1)) is False
+
+    def test_exact_match(self):
+        etag = make_etag(1)
+        assert etag_matches(self._request(etag), etag) is True
+
+    def test_weak_comparison_ignores_prefix(self):
+        etag = make_etag(1)
+        assert etag_matches(self._request(etag.removeprefix("W/")), etag) is True
+
+    def test_any_of_list(self):
+        etag = make_etag(1)
+        assert etag_matches(self._request(f'"other", {etag}'), etag) is True
+
+    def test_star_matches(self):
+        assert etag_matches(self._request("*"), make_etag(1)) is True
+
+    def test_mismatch(self):
+        assert etag_matches(self._request(make_etag(2)), make_etag(1)) is False
+
+
+@pytest.mark.django_db
+class TestConditionalEndpoints:
+    def test_citizen_detail_emits_etag_and_304(self, client, member, citizen):
+        headers = auth_header_for_user(member)
+        first = client.get(f"/api/v1/citizens/{citizen.id}", **headers)
+        assert first.status_code == 200
+        etag = first["ETag"]
+
+        second = client.get(f"/api/v1/citizens/{citizen.id}", HTTP_IF_NONE_MATCH=etag, **headers)
+        assert second.status_code == 304
+        assert second["ETag"] == etag
+        assert second.content == b""
+
+    def test_citizen_detail_changes_after_update(self, client, member, citizen):
+        headers = auth_header_for_user(member)
+        etag = client.get(f"/api/v1/citizens/{citizen.id}", **headers)["ETag"]
+        citizen.first_name = "Changed"
+        citizen.save()
+
+        response = client.get(f"/api/v1/citizens/{citizen.id}", HTTP_IF_NONE_MATCH=etag, **headers)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_citizen_list_revalidates_until_count_changes(self, client, org, member, citizen):
+        headers = auth_header_for_user(member)
+        url = f"/api/v1/organizations/{org.id}/citizens"
+        etag = client.get(url, **headers)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag, **headers).status_code == 304
+
+        Citizen.objects.create(first_name="Bob", last_name="New", organization=org)
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag, **headers).status_code == 200
+
+    def test_grade_detail_304(self, client, org, member):
+        from apps.grades.models import Grade
+
+        grade = Grade.objects.create(name="1A", organization=org)
+        headers = auth_header_for_user(member)
+        etag = client.get(f"/api/v1/grades/{grade.id}", **headers)["ETag"]
+        response = client.get(f"/api/v1/grades/{grade.id}", HTTP_IF_NONE_MATCH=etag, **headers)
+        assert response.status_code == 304
+
+    def test_permission_checked_before_304(self, client, member, non_member, citizen):
+        etag = client.get(f"/api/v1/citizens/{citizen.id}", **auth_header_for_user(member))["ETag"]
+        response = client.get(
+            f"/api/v1/citizens/{citizen.id}", HTTP_IF_NONE_MATCH=etag, **auth_header_for_user(non_member)
+        )
+        assert response.status_code == 403
@@ -0,0 +1,59 @@
+"""Tests for the cached, time-bounded DNS resolver."""
+
+import socket
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from core import dns
+
+
+def _answer(*ips):
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (ip, 0)) for ip in ips]
+
+
+class TestResolve:
+    @patch("core.dns.socket.getaddrinfo", return_value=_answer("93.184.216.34", "93.184.216.34", "93.184.216.35"))
+    def test_returns_unique_addresses(self, mock_getaddrinfo):
+        assert dns.resolve("example.com") == ("93.184.216.34", "93.184.216.35")
+
+    @patch("core.dns.socket.getaddrinfo", return_value=_answer("93.184.216.34"))
+    def test_repeated_lookups_are_cached(self, mock_getaddrinfo):
+        dns.resolve("example.com")
+        dns.resolve("EXAMPLE.com.")
+        assert mock_getaddrinfo.call_count == 1
+
+    @patch("core.dns.socket.getaddrinfo", return_value=_answer("93.184.216.34"))
+    def test_expired_entries_are_refreshed(self, mock_getaddrinfo, settings):
+        settings.DNS_CACHE_TTL = 0
+        dns.resolve("example.com")
+        dns.resolve("example.com")
+        assert mock_getaddrinfo.call_count == 2
+
+    @patch("core.dns.socket.getaddrinfo", side_effect=socket.gaierror("Name or service not known"))
+    def test_failures_are_negatively_cached(self, mock_getaddrinfo):
+        for _ in range(2):
+            with pytest.raises(socket.gaierror):
+                dns.resolve("doesnt-exist.invalid")
+        assert mock_getaddrinfo.call_count == 1
+
+    def test_slow_lookup_times_out(self, settings):
+        settings.DNS_RESOLVE_TIMEOUT = 0.05
+        release = threading.Event()
+
+        def hang(*args, **kwargs):
+            release.wait(5)
+            return _answer("93.184.216.34")
+
+        try:
+            with (
+                patch("core.dns.socket.getaddrinfo", side_effect=hang),
+                pytest.raises(socket.gaierror, match="timed out"),
+            ):
+                dns.resolve("slow.test")
+            # The timeout is cached too, so the next request does not wait again.
+            with pytest.raises(socket.gaierror):
+                dns.resolve("slow.test")
+        finally:
+            release.set()
@@ -0,0 +1,95 @@
+"""Tests for SSRF-safe external URL fetching."""
+
+import socket
+
+import httpx
+import pytest
+
+from core.clients import external
+from core.clients.external import fetch_public_url, resolve_public_address
+from core.exceptions import ExternalFetchError
+
+PUBLIC_IP = "93.184.216.34"
+
+
+def _resolve_to(mapping):
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host not in mapping:
+            raise socket.gaierror("unknown host")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (mapping[host], port))]
+
+    return getaddrinfo
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Route the fetcher's httpx.Client through a MockTransport; returns the list of seen requests."""
+    seen: list[httpx.Request] = []
+    responses: dict[str, httpx.Response] = {}
+    real_client = httpx.Client
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return responses[request.headers["Host"] + request.url.path]
+
+    mock = httpx.MockTransport(handler)
+    monkeypatch.setattr(external.httpx, "Client", lambda **kw: real_client(transport=mock, **kw))
+    return seen, responses
+
+
+class TestResolvePublicAddress:
+    def test_returns_public_address(self, monkeypatch):
+        monkeypatch.setattr(socket, "getaddrinfo", _resolve_to({"example.com": PUBLIC_IP}))
+        assert resolve_public_address("example.com") == PUBLIC_IP
+
+    @pytest.mark.parametrize("ip", ["127.0.0.1", "10.0.0.5", "169.254.169.254", "::1"])
+    def test_rejects_non_public_address(self, monkeypatch, ip):
+        monkeypatch.setattr(socket, "getaddrinfo", _resolve_to({"evil.test": ip}))
+        with pytest.raises(ExternalFetchError, match="non-public"):
+            resolve_public_address("evil.test")
+
+    def test_unresolvable_host(self, monkeypatch):
+        monkeypatch.setattr(socket, "getaddrinfo", _resolve_to({}))
+        with pytest.raises(ExternalFetchError, match="Could not resolve"):
+            resolve_public_address("nowhere.test")
+
+
+class TestFetchPublicUrl:
+    def test_connects_to_checked_ip_with_original_host(self, monkeypatch, transport):
+        monkeypatch.setattr(socket, "getaddrinfo", _resolve_to({"example.com": PUBLIC_IP}))
+        seen, responses = transport
+        responses["example.com/a.png"] = httpx.Response(200, content=b"data")
+
+        assert fetch_public_url("https://example.com/a.png", max_bytes=100) == b"data"
+        assert seen[0].url.host == PUBLIC_IP
+        assert seen[0].extensions["sni_hostname"] == "example.com"
+
+    def test_redirect_to_private_address_is_blocked(self, monkeypatch, transport):
+        monkeypatch.setattr(
+            socket, "getaddrinfo", _resolve_to({"example.com": PUBLIC_IP, "internal.test": "10.0.0.1"})
+        )
+        _seen, responses = transport
+        responses["example.com/a.png"] = httpx.Response(302, headers={"Location": "http://internal.test/secret"})
+
+        with pytest.raises(ExternalFetchError, match="non-public"):
+            fetch_public_url("http://example.com/a.png", max_bytes=100)
+
+    def test_body_larger_than_cap_is_rejected(self, monkeypatch, transport):
+        monkeypatch.setattr(socket, "getaddrinfo", _resolve_to({"example.com": PUBLIC_IP}))
+        _seen, responses = transport
+        responses["example.com/big"] = httpx.Response(200, content=b"x" * 101)
+
+        with pytest.raises(ExternalFetchError, match="larger than 100"):
+            fetch_public_url("http://example.com/big", max_bytes=100)
+
+    def test_error_status_is_rejected(self, monkeypatch, transport):
+        monkeypatch.setattr(socket, "getaddrinfo", _resolve_to({"example.com": PUBLIC_IP}))
+        _seen, responses = transport
+        responses["example.com/gone"] = httpx.Response(404)
+
+        with pytest.raises(ExternalFetchError, match="HTTP 404"):
+            fetch_public_url("http://example.com/gone", max_bytes=100)
+
+    def test_non_http_scheme_is_rejected(self):
+        with pytest.raises(ExternalFetchError, match="Only http"):
+            fetch_public_url("file:///etc/passwd", max_bytes=100)
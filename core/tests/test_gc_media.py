@@ -0,0 +1,82 @@
+"""Tests for the gc_media management command."""
+
+import os
+import time
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from apps.pictograms.models import Pictogram
+from apps.pictograms.tests.utils import make_test_audio, make_test_image
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def _age(name: str, hours: float) -> None:
+    past = time.time() - hours * 3600
+    os.utime(default_storage.path(name), (past, past))
+
+
+def _run(*args) -> str:
+    out = StringIO()
+    call_command("gc_media", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestGcMedia:
+    def test_deletes_only_old_unreferenced_files(self, org):
+        kept = Pictogram.objects.create(name="Kept", image=make_test_image(), sound=make_test_audio(), organization=org)
+        doomed = Pictogram.objects.create(name="Doomed", image=make_test_image(), organization=org)
+        orphan = doomed.image.name
+        doomed.delete()
+        fresh_orphan = default_storage.save("pictograms/fresh.png", ContentFile(b"x"))
+        unrelated = default_storage.save("other/keep.txt", ContentFile(b"x"))
+        for name in (kept.image.name, kept.sound.name, orphan, unrelated):
+            _age(name, 48)
+
+        output = _run()
+
+        assert not default_storage.exists(orphan)
+        assert default_storage.exists(kept.image.name)
+        assert default_storage.exists(kept.sound.name)
+        assert default_storage.exists(fresh_orphan)
+        assert default_storage.exists(unrelated)
+        assert "Deleted 1 file(s)" in output
+
+    def test_dry_run_reports_without_deleting(self):
+        orphan = default_storage.save("profile_pictures/old.png", ContentFile(b"12345"))
+        _age(orphan, 48)
+
+        output = _run("--dry-run")
+
+        assert default_storage.exists(orphan)
+        assert f"would delete {orphan} (5 bytes)" in output
+        assert "Would delete 1 file(s), 5 bytes." in output
+
+    def test_prunes_stale_derived_caches(self):
+        stale = default_storage.save("pictogram-packs/a.zip", ContentFile(b"zip"))
+        recent = default_storage.save("pictogram-atlases/b.webp", ContentFile(b"webp"))
+        _age(stale, 24 * 8)
+        _age(recent, 48)
+
+        _run()
+
+        assert not default_storage.exists(stale)
+        assert default_storage.exists(recent)
+
+    def test_deletes_in_batches(self):
+        names = [default_storage.save(f"pictograms/o{i}.png", ContentFile(b"x")) for i in range(5)]
+        for name in names:
+            _age(name, 48)
+
+        output = _run("--batch-size", "2")
+
+        assert output.count("deleted batch of") == 3
+        assert not any(default_storage.exists(name) for name in names)
@@ -69,6 +69,23 @@ class TestGirafAIClient:
             result = client.generate_tts("hej verden")
 
         assert result == b"fake-mp3-bytes"
+        assert mock_post.call_args.kwargs["json"]["language"] == "da"
+
+    @patch("core.clients.giraf_ai._get_service_token", return_value="fake.jwt.token")
+    def test_generate_tts_passes_language(self, mock_token):
+        audio_b64 = base64.b64encode(b"fake-mp3-bytes").decode()
+
+        with patch("httpx.post") as mock_post:
+            mock_post.return_value = httpx.Response(
+                200,
+                json={"audio_base64": audio_b64},
+                request=httpx.Request("POST", "http://test/api/v1/tts"),
+            )
+            client = GirafAIClient()
+            client.base_url = "http://test"
+            client.generate_tts("hello world", language="en")
+
+        assert mock_post.call_args.kwargs["json"]["language"] == "en"
 
     @patch("core.clients.giraf_ai._get_service_token", return_value="fake.jwt.token")
     def test_raises_on_http_error(self, mock_token):
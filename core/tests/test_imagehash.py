@@ -0,0 +1,52 @@
+"""Tests for perceptual image hashing."""
+
+import io
+
+from PIL import Image
+
+from core.imagehash import BANDS, MAX_DISTANCE, bands, compute_dhash, dhash, distance
+
+
+def _gradient() -> Image.Image:
+    return Image.linear_gradient("L").rotate(90).convert("RGB")
+
+
+class TestDhash:
+    def test_is_16_hex_digits(self):
+        value = dhash(_gradient())
+        assert len(value) == 16
+        int(value, 16)
+
+    def test_survives_resize_and_reencode(self):
+        original = _gradient()
+        buf = io.BytesIO()
+        original.resize((64, 64)).save(buf, format="JPEG", quality=60)
+        buf.seek(0)
+        assert distance(dhash(original), compute_dhash(buf)) <= MAX_DISTANCE
+
+    def test_different_images_are_far_apart(self):
+        assert distance(dhash(_gradient()), dhash(_gradient().rotate(180))) > MAX_DISTANCE
+
+    def test_transparency_is_flattened_onto_white(self):
+        transparent = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+        assert dhash(transparent) == dhash(Image.new("RGB", (16, 16), "white"))
+
+    def test_compute_rewinds_file(self):
+        buf = io.BytesIO()
+        _gradient().save(buf, format="PNG")
+        buf.seek(5)
+        assert compute_dhash(buf) == dhash(_gradient())
+        assert buf.tell() == 0
+
+
+class TestBands:
+    def test_splits_most_significant_first(self):
+        assert bands("0001000200030004") == [1, 2, 3, 4]
+        assert len(bands("ffffffffffffffff")) == BANDS
+
+    def test_hashes_within_max_distance_share_a_band(self):
+        a = "0123456789abcdef"
+        # Flip one bit in each of MAX_DISTANCE different bands.
+        b = f"{int(a, 16) ^ 0x0001_0001_0001_0000:016x}"
+        assert distance(a, b) == MAX_DISTANCE
+        assert any(x == y for x, y in zip(bands(a), bands(b), strict=True))
@@ -0,0 +1,168 @@
+"""Tests for media delivery helpers."""
+
+import hashlib
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+
+from core.exceptions import ResourceNotFoundError
+from core.media import (
+    content_addressed_name,
+    media_url,
+    serve_media,
+    signed_media_url,
+    verify_media_signature,
+)
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = ""
+
+
+class TestServeMedia:
+    def test_streams_file_without_proxy(self, rf):
+        name = default_storage.save("pictograms/a.png", ContentFile(b"png-bytes"))
+        response = serve_media(rf.get("/"), name)
+        assert isinstance(response, FileResponse)
+        assert response["Content-Type"] == "image/png"
+        assert b"".join(response.streaming_content) == b"png-bytes"
+        assert "private" in response["Cache-Control"]
+        assert response["Accept-Ranges"] == "bytes"
+
+    def test_hands_off_to_proxy_when_configured(self, rf, settings):
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+        name = default_storage.save("pictograms/sounds/a b.mp3", ContentFile(b"ID3..."))
+        response = serve_media(rf.get("/"), name)
+        assert response["X-Accel-Redirect"] == "/protected-media/pictograms/sounds/a%20b.mp3"
+        assert response["Content-Type"] == "audio/mpeg"
+        assert response.content == b""
+
+    def test_missing_file_raises(self, rf):
+        with pytest.raises(ResourceNotFoundError):
+            serve_media(rf.get("/"), "pictograms/missing.png")
+
+
+class TestServeMediaConditional:
+    CONTENT = bytes(range(256)) * 4
+
+    @pytest.fixture
+    def name(self):
+        file = ContentFile(self.CONTENT)
+        return default_storage.save(f"pictograms/sounds/{content_addressed_name(file, '.mp3')}", file)
+
+    def test_content_addressed_file_is_immutable_with_hash_etag(self, rf, name):
+        response = serve_media(rf.get("/"), name, immutable=True)
+        assert response["ETag"] == f'"{hashlib.sha256(self.CONTENT).hexdigest()}"'
+        assert "immutable" in response["Cache-Control"]
+
+    def test_stable_url_revalidates_content_addressed_file(self, rf, name):
+        response = serve_media(rf.get("/"), name)
+        assert response["ETag"] == f'"{hashlib.sha256(self.CONTENT).hexdigest()}"'
+        assert "immutable" not in response["Cache-Control"]
+        assert "no-cache" in response["Cache-Control"]
+
+    def test_legacy_name_gets_strong_etag_but_not_immutable(self, rf):
+        name = default_storage.save("pictograms/sounds/1.wav", ContentFile(b"RIFF"))
+        response = serve_media(rf.get("/"), name, immutable=True)
+        assert not response["ETag"].startswith("W/")
+        assert "immutable" not in response["Cache-Control"]
+
+    def test_if_none_match_returns_304(self, rf, name):
+        etag = serve_media(rf.get("/"), name)["ETag"]
+        assert serve_media(rf.get("/", HTTP_IF_NONE_MATCH=etag), name).status_code == 304
+
+    @pytest.mark.parametrize(
+        ("header", "start", "end"),
+        [
+            ("bytes=0-99", 0, 99),
+            ("bytes=1000-", 1000, 1023),
+            ("bytes=-24", 1000, 1023),
+            ("bytes=1000-5000", 1000, 1023),
+        ],
+    )
+    def test_range_returns_partial_content(self, rf, name, header, start, end):
+        response = serve_media(rf.get("/", HTTP_RANGE=header), name)
+        assert response.status_code == 206
+        assert response["Content-Range"] == f"bytes {start}-{end}/{len(self.CONTENT)}"
+        assert response["Content-Length"] == str(end - start + 1)
+        assert b"".join(response.streaming_content) == self.CONTENT[start : end + 1]
+
+    def test_unsatisfiable_range(self, rf, name):
+        response = serve_media(rf.get("/", HTTP_RANGE="bytes=5000-"), name)
+        assert response.status_code == 416
+        assert response["Content-Range"] == f"bytes */{len(self.CONTENT)}"
+
+    def test_if_range_mismatch_sends_full_body(self, rf, name):
+        response = serve_media(rf.get("/", HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'), name)
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == self.CONTENT
+
+    def test_if_range_match_honors_range(self, rf, name):
+        etag = serve_media(rf.get("/"), name)["ETag"]
+        response = serve_media(rf.get("/", HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag), name)
+        assert response.status_code == 206
+
+    def test_multiple_ranges_fall_back_to_full_body(self, rf, name):
+        response = serve_media(rf.get("/", HTTP_RANGE="bytes=0-1,5-6"), name)
+        assert response.status_code == 200
+
+
+class TestContentAddressedName:
+    def test_prefers_precomputed_hash(self):
+        file = ContentFile(b"abc")
+        file.content_sha256 = "f" * 64
+        assert content_addressed_name(file, ".mp3") == "f" * 64 + ".mp3"
+
+    def test_hashes_and_rewinds(self):
+        file = ContentFile(b"abc")
+        file.read()
+        assert content_addressed_name(file, ".wav") == hashlib.sha256(b"abc").hexdigest() + ".wav"
+        assert file.tell() == 0
+
+
+class TestSignedMediaUrls:
+    @staticmethod
+    def _parts(url: str) -> tuple[str, int, str]:
+        split = urlsplit(url)
+        query = parse_qs(split.query)
+        return split.path, int(query["exp"][0]), query["sig"][0]
+
+    def test_round_trip(self):
+        path, exp, sig = self._parts(signed_media_url("pictograms/a.png"))
+        assert path == "/api/v1/media/pictograms/a.png"
+        assert verify_media_signature("pictograms/a.png", exp, sig)
+
+    def test_signature_is_bound_to_path_and_expiry(self):
+        _path, exp, sig = self._parts(signed_media_url("pictograms/a.png"))
+        assert not verify_media_signature("pictograms/b.png", exp, sig)
+        assert not verify_media_signature("pictograms/a.png", exp + 1, sig)
+
+    def test_expired_signature_rejected(self, monkeypatch):
+        _path, exp, sig = self._parts(signed_media_url("pictograms/a.png"))
+        monkeypatch.setattr("core.media.time.time", lambda: exp + 1)
+        assert not verify_media_signature("pictograms/a.png", exp, sig)
+
+    def test_urls_are_stable_within_a_bucket(self, settings, monkeypatch):
+        settings.MEDIA_SIGNED_URL_TTL = 3600
+        monkeypatch.setattr("core.media.time.time", lambda: 36_000)
+        first = signed_media_url("pictograms/a.png")
+        monkeypatch.setattr("core.media.time.time", lambda: 36_000 + 899)
+        assert signed_media_url("pictograms/a.png") == first
+        monkeypatch.setattr("core.media.time.time", lambda: 36_000 + 900)
+        assert signed_media_url("pictograms/a.png") != first
+
+    def test_key_defaults_to_secret_key(self, settings):
+        url = signed_media_url("pictograms/a.png")
+        settings.MEDIA_URL_SIGNING_KEY = "another-key"
+        assert signed_media_url("pictograms/a.png") != url
+
+    def test_media_url_plain_unless_enabled(self, settings):
+        settings.MEDIA_SIGNED_URLS = False
+        assert media_url("pictograms/a.png") == "/media/pictograms/a.png"
+        settings.MEDIA_SIGNED_URLS = True
+        assert media_url("pictograms/a.png").startswith("/api/v1/media/pictograms/a.png?")
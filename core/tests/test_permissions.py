@@ -106,3 +106,46 @@ class TestCheckRoleOrRaise:
 
         with pytest.raises(PermissionDeniedError):
             check_role_or_raise(user, org.id, min_role=OrgRole.MEMBER)
+
+
+@pytest.mark.django_db
+class TestCheckRolesOrRaise:
+    def test_passes_when_member_of_all(self, django_assert_num_queries):
+        from core.permissions import check_roles_or_raise
+
+        user = UserFactory()
+        orgs = [Organization.objects.create(name=f"School {i}") for i in range(3)]
+        for org in orgs:
+            Membership.objects.create(user=user, organization=org, role=OrgRole.MEMBER)
+
+        with django_assert_num_queries(1):
+            check_roles_or_raise(user, [o.id for o in orgs], min_role=OrgRole.MEMBER)
+
+    def test_empty_set_is_free(self, django_assert_num_queries):
+        from core.permissions import check_roles_or_raise
+
+        with django_assert_num_queries(0):
+            check_roles_or_raise(UserFactory.build(), [], min_role=OrgRole.MEMBER)
+
+    def test_raises_when_missing_one_org(self):
+        from core.exceptions import PermissionDeniedError
+        from core.permissions import check_roles_or_raise
+
+        user = UserFactory()
+        mine = Organization.objects.create(name="Mine")
+        other = Organization.objects.create(name="Other")
+        Membership.objects.create(user=user, organization=mine, role=OrgRole.OWNER)
+
+        with pytest.raises(PermissionDeniedError, match="not a member"):
+            check_roles_or_raise(user, [mine.id, other.id], min_role=OrgRole.MEMBER)
+
+    def test_raises_when_role_too_low(self):
+        from core.exceptions import PermissionDeniedError
+        from core.permissions import check_roles_or_raise
+
+        user = UserFactory()
+        org = Organization.objects.create(name="School")
+        Membership.objects.create(user=user, organization=org, role=OrgRole.MEMBER)
+
+        with pytest.raises(PermissionDeniedError, match="Insufficient"):
+            check_roles_or_raise(user, [org.id], min_role=OrgRole.ADMIN)
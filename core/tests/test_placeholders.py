@@ -0,0 +1,41 @@
+"""Tests for BlurHash / dominant-color placeholders."""
+
+import io
+
+from PIL import Image
+
+from core.placeholders import blurhash, compute_placeholders, dominant_color
+
+
+class TestBlurhash:
+    def test_matches_reference_encoder(self):
+        # Reference value from the C implementation (blurhash-python).
+        assert blurhash(Image.new("RGB", (32, 32), "red")) == "L9TI:j|cfQ|c|co1fQo1fQfQfQfQ"
+
+    def test_length_follows_component_count(self):
+        img = Image.linear_gradient("L").convert("RGB")
+        # size flag + AC max + 4-char DC + 2 chars per AC component
+        assert len(blurhash(img, components_x=4, components_y=3)) == 1 + 1 + 4 + 2 * 11
+        assert len(blurhash(img, components_x=1, components_y=1)) == 6
+
+    def test_transparency_is_flattened_onto_white(self):
+        transparent = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+        assert blurhash(transparent) == blurhash(Image.new("RGB", (16, 16), "white"))
+
+
+class TestDominantColor:
+    def test_picks_most_common_color(self):
+        img = Image.new("RGB", (100, 100), (0, 0, 255))
+        img.paste((255, 0, 0), (0, 0, 30, 30))
+        assert dominant_color(img) == "#0000ff"
+
+
+class TestComputePlaceholders:
+    def test_rewinds_file(self):
+        buf = io.BytesIO()
+        Image.new("RGB", (8, 8), "green").save(buf, format="PNG")
+        buf.seek(3)
+        hash_, color = compute_placeholders(buf)
+        assert hash_.startswith("L")
+        assert color == "#008000"
+        assert buf.tell() == 0
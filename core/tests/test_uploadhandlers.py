@@ -0,0 +1,64 @@
+"""Tests for the validating streaming upload handler."""
+
+import hashlib
+import io
+import os
+
+import pytest
+from django.core.files.uploadhandler import SkipFile
+from PIL import Image
+
+from core.exceptions import BusinessValidationError
+from core.uploadhandlers import AUDIO_UPLOAD, IMAGE_UPLOAD, UploadRule, ValidatingUploadHandler
+
+
+def _png_bytes() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (4, 4)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _stream(handler: ValidatingUploadHandler, field: str, data: bytes, chunk_size: int = 8):
+    handler.new_file(field, "upload.bin", "application/octet-stream", None)
+    for start in range(0, len(data), chunk_size):
+        handler.receive_data_chunk(data[start : start + chunk_size], start)
+    return handler.file_complete(len(data))
+
+
+class TestValidatingUploadHandler:
+    def test_accepts_image_and_hashes_content(self):
+        data = _png_bytes()
+        handler = ValidatingUploadHandler(rules={"image": IMAGE_UPLOAD})
+        file = _stream(handler, "image", data)
+        assert file.read() == data
+        assert file.content_sha256 == hashlib.sha256(data).hexdigest()
+        assert os.path.exists(file.temporary_file_path())
+
+    def test_rejects_bad_magic_on_first_chunk(self):
+        handler = ValidatingUploadHandler(rules={"image": IMAGE_UPLOAD})
+        handler.new_file("image", "x.png", "image/png", None)
+        with pytest.raises(BusinessValidationError, match="not a valid image"):
+            handler.receive_data_chunk(b"not an image at all", 0)
+        assert handler.file.closed
+
+    def test_rejects_short_file_at_completion(self):
+        handler = ValidatingUploadHandler(rules={"sound": AUDIO_UPLOAD})
+        with pytest.raises(BusinessValidationError, match="audio format"):
+            _stream(handler, "sound", b"ab")
+
+    def test_aborts_once_size_cap_exceeded(self):
+        rule = UploadRule(IMAGE_UPLOAD.detect, 32, "bad", "too large")
+        handler = ValidatingUploadHandler(rules={"image": rule})
+        with pytest.raises(BusinessValidationError, match="too large"):
+            _stream(handler, "image", _png_bytes())
+        assert handler.received <= 32 + 8
+
+    def test_rejects_oversized_request_before_reading(self):
+        handler = ValidatingUploadHandler(rules={"sound": AUDIO_UPLOAD})
+        with pytest.raises(BusinessValidationError, match="10MB"):
+            handler.handle_raw_input(None, {}, AUDIO_UPLOAD.max_size * 2, b"boundary")
+
+    def test_skips_unknown_fields(self):
+        handler = ValidatingUploadHandler(rules={"image": IMAGE_UPLOAD})
+        with pytest.raises(SkipFile):
+            handler.new_file("other", "x.bin", "application/octet-stream", None)
@@ -7,7 +7,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from PIL import Image
 
 from core.exceptions import BusinessValidationError
-from core.validators import resize_image, validate_audio_file, validate_image_upload
+from core.validators import optimize_image, resize_image, validate_audio_file, validate_image_upload
 
 
 class TestValidateImageUpload:
@@ -83,6 +83,53 @@ class TestResizeImage:
         assert img.size == (256, 192)
 
 
+class TestOptimizeImage:
+    @staticmethod
+    def _encode(img: Image.Image, fmt: str, **params) -> SimpleUploadedFile:
+        buf = io.BytesIO()
+        img.save(buf, format=fmt, **params)
+        return SimpleUploadedFile(f"in.{fmt.lower()}", buf.getvalue(), content_type=f"image/{fmt.lower()}")
+
+    @staticmethod
+    def _flat_graphic() -> Image.Image:
+        img = Image.new("RGBA", (256, 256), (255, 255, 255, 0))
+        for i, color in enumerate([(255, 0, 0, 255), (0, 128, 0, 255), (0, 0, 255, 128)]):
+            img.paste(color, (i * 60, i * 60, i * 60 + 100, i * 60 + 100))
+        return img
+
+    def test_flat_png_gets_smaller_and_stays_lossless(self):
+        source = self._flat_graphic()
+        original = self._encode(source, "PNG", compress_level=0)
+
+        result = optimize_image(original)
+        assert result.size < original.size
+        assert result.content_type in ("image/png", "image/webp")
+        decoded = Image.open(result).convert("RGBA")
+
+        def visible(pixels):
+            # Color under fully transparent pixels is irrelevant and may be dropped.
+            return [p if p[3] else (0, 0, 0, 0) for p in pixels]
+
+        assert visible(decoded.getdata()) == visible(source.getdata())
+
+    def test_jpeg_is_kept_byte_for_byte(self):
+        original = self._encode(Image.new("RGB", (64, 64), "orange"), "JPEG")
+        result = optimize_image(original)
+        assert result.content_type == "image/jpeg"
+        assert result.name.endswith((".jpg", ".jpeg"))
+        original.seek(0)
+        assert result.read() == original.read()
+
+    def test_never_larger_than_input(self):
+        original = self._encode(Image.effect_noise((64, 64), 64).convert("RGB"), "PNG", optimize=True)
+        assert optimize_image(original).size <= original.size
+
+    def test_undecodable_input_returned_unchanged(self):
+        original = SimpleUploadedFile("x.png", b"garbage", content_type="image/png")
+        result = optimize_image(original)
+        assert result.read() == b"garbage"
+
+
 class TestValidateAudioFile:
     def test_valid_mp3_with_id3(self):
         content = b"ID3" + b"\x00" * 100
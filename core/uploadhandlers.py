@@ -0,0 +1,138 @@
+"""Streaming upload handler that validates files while they are received.
+
+Django's default handlers buffer the whole request before any validator
+sees a byte. ``ValidatingUploadHandler`` instead checks the magic bytes of
+each file's first chunk, aborts as soon as a size cap is exceeded, spools
+to disk, and hashes content as it arrives (``file.content_sha256``).
+
+Install it per endpoint with ``@decorate_view(validated_uploads(...))``;
+the full validators in ``core.validators`` still run in the service layer.
+"""
+
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any
+
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.http import HttpRequest
+
+from core.exceptions import BusinessValidationError
+from core.validators import (
+    MAX_ARCHIVE_SIZE,
+    MAX_AUDIO_SIZE,
+    MAX_IMAGE_SIZE,
+    detect_audio_mime,
+    detect_image_mime,
+    detect_zip_mime,
+)
+
+_HEADER_SIZE = 12
+# Allowance for multipart boundaries and plain form fields on top of file caps.
+_FORM_OVERHEAD = 64 * 1024
+
+
+@dataclass(frozen=True)
+class UploadRule:
+    """Constraints for one multipart file field."""
+
+    detect: Callable[[bytes], str | None]
+    max_size: int
+    invalid_message: str
+    too_large_message: str
+
+
+IMAGE_UPLOAD = UploadRule(
+    detect=detect_image_mime,
+    max_size=MAX_IMAGE_SIZE,
+    invalid_message="File is not a valid image.",
+    too_large_message="File size must not exceed 20MB.",
+)
+AUDIO_UPLOAD = UploadRule(
+    detect=detect_audio_mime,
+    max_size=MAX_AUDIO_SIZE,
+    invalid_message="File is not a recognized audio format.",
+    too_large_message="Audio file size must not exceed 10MB.",
+)
+ARCHIVE_UPLOAD = UploadRule(
+    detect=detect_zip_mime,
+    max_size=MAX_ARCHIVE_SIZE,
+    invalid_message="File is not a ZIP archive.",
+    too_large_message="Archive size must not exceed 200MB.",
+)
+
+
+class ValidatingUploadHandler(TemporaryFileUploadHandler):
+    """Temp-file upload handler enforcing an ``UploadRule`` per field.
+
+    File fields without a rule are skipped. Violations raise
+    ``BusinessValidationError`` mid-stream, so the rest of the body is never
+    spooled.
+    """
+
+    def __init__(self, request: HttpRequest | None = None, *, rules: dict[str, UploadRule]) -> None:
+        super().__init__(request)
+        self.rules = rules
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):  # noqa: ARG002, N803
+        # Reject before reading anything if the body cannot possibly fit.
+        if content_length > sum(rule.max_size for rule in self.rules.values()) + _FORM_OVERHEAD:
+            raise BusinessValidationError(max(self.rules.values(), key=lambda r: r.max_size).too_large_message)
+
+    def new_file(self, field_name, *args, **kwargs):
+        self.rule = self.rules.get(field_name)
+        if self.rule is None:
+            raise SkipFile()
+        super().new_file(field_name, *args, **kwargs)
+        if self.content_length is not None and self.content_length > self.rule.max_size:
+            self._abort(self.rule.too_large_message)
+        self.header = b""
+        self.received = 0
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.rule.max_size:
+            self._abort(self.rule.too_large_message)
+        if len(self.header) < _HEADER_SIZE:
+            self.header += raw_data[: _HEADER_SIZE - len(self.header)]
+            if len(self.header) == _HEADER_SIZE:
+                self._check_header()
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if len(self.header) < _HEADER_SIZE:
+            self._check_header()
+        file = super().file_complete(file_size)
+        file.content_sha256 = self.hasher.hexdigest()
+        return file
+
+    def _check_header(self) -> None:
+        if self.rule.detect(self.header) is None:
+            self._abort(self.rule.invalid_message)
+
+    def _abort(self, message: str) -> None:
+        self.upload_interrupted()
+        raise BusinessValidationError(message)
+
+
+def validated_uploads(**rules: UploadRule) -> Callable:
+    """Ninja ``decorate_view`` decorator installing ``ValidatingUploadHandler``.
+
+    Keyword names are multipart field names, e.g.
+    ``@decorate_view(validated_uploads(image=IMAGE_UPLOAD, sound=AUDIO_UPLOAD))``.
+    It wraps the operation itself, so the handler is in place before Ninja
+    parses the body.
+    """
+
+    def decorator(run: Callable) -> Callable:
+        @wraps(run)
+        def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+            request.upload_handlers = [ValidatingUploadHandler(request, rules=rules)]
+            return run(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,14 +1,18 @@
 """Reusable validation utilities."""
 
 import io
+import logging
 import mimetypes
 import uuid
 
+from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile, UploadedFile
-from PIL import Image, ImageOps, UnidentifiedImageError
+from PIL import Image, ImageChops, ImageOps, UnidentifiedImageError
 
 from core.exceptions import BusinessValidationError
 
+logger = logging.getLogger(__name__)
+
 _PIL_FORMAT_TO_MIME: dict[str, str] = {
     "JPEG": "image/jpeg",
     "PNG": "image/png",
@@ -19,6 +23,17 @@ ALLOWED_IMAGE_TYPES = list(_PIL_FORMAT_TO_MIME.values())
 MAX_IMAGE_SIZE = 20 * 1024 * 1024  # 20MB — phone photos can be large
 
 
+def detect_image_mime(header: bytes) -> str | None:
+    """Detect an allowed image MIME type from the first 12 bytes of a file."""
+    if header[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if header[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
 def validate_image_upload(file: UploadedFile) -> str:
     """Validate an uploaded image file. Returns the detected MIME type.
 
@@ -71,10 +86,78 @@ def resize_image(file: UploadedFile, max_dimension: int, mime_type: str) -> Simp
     return SimpleUploadedFile(f"{uuid.uuid4().hex}{ext}", buf.read(), content_type=mime_type)
 
 
+# Largest per-channel difference still treated as lossless when palettizing.
+_PALETTE_MAX_ERROR = 2
+
+
+def _encode(img: Image.Image, pil_format: str, **params) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format=pil_format, **params)
+    return buf.getvalue()
+
+
+def _palette_candidate(img: Image.Image) -> bytes | None:
+    """Encode *img* as a palette PNG if that is (visually) lossless, else None."""
+    mode = "RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB"
+    source = img.convert(mode)
+    colors = source.getcolors(256)
+    if colors is None:
+        return None
+    method = Image.Quantize.FASTOCTREE if mode == "RGBA" else Image.Quantize.MEDIANCUT
+    paletted = source.quantize(colors=len(colors), method=method, dither=Image.Dither.NONE)
+    # Per-band (low, high) pairs: RGB and RGBA are multi-band.
+    extrema = ImageChops.difference(source, paletted.convert(mode)).getextrema()
+    if max(band[1] for band in extrema if isinstance(band, tuple)) > _PALETTE_MAX_ERROR:
+        return None
+    return _encode(paletted, "PNG", optimize=True)
+
+
+def optimize_image(file: File) -> SimpleUploadedFile:
+    """Re-encode an image in the smallest of a few lossless encodings.
+
+    Candidates are the input as-is and, for PNG/WebP input, an optimized
+    PNG, a palette PNG (flat-color graphics with at most 256 colors) and
+    lossless WebP. JPEG input is kept byte for byte: Pillow cannot
+    re-encode a JPEG without decoding it, and any re-encode would be a
+    second lossy pass. Returns a new
+    ``SimpleUploadedFile`` whose name and content type match the winner;
+    undecodable input is returned unchanged.
+    """
+    file.seek(0)
+    original = file.read()
+    try:
+        img = Image.open(io.BytesIO(original))
+        img.load()
+    except (UnidentifiedImageError, OSError):
+        content_type = getattr(file, "content_type", None) or "application/octet-stream"
+        return SimpleUploadedFile(file.name or "image.bin", original, content_type=content_type)
+
+    source_format = img.format or ""
+    candidates = [(source_format, original)]
+    if source_format != "JPEG":
+        if source_format == "PNG":
+            candidates.append(("PNG", _encode(img, "PNG", optimize=True)))
+        palette = _palette_candidate(img)
+        if palette is not None:
+            candidates.append(("PNG", palette))
+        webp_source = img if img.mode in ("RGB", "RGBA") else img.convert("RGBA")
+        candidates.append(("WEBP", _encode(webp_source, "WEBP", lossless=True, method=6)))
+
+    # min() keeps the first of equal sizes, so ties favor the untouched input.
+    best_format, best = min(candidates, key=lambda candidate: len(candidate[1]))
+    mime_type = _PIL_FORMAT_TO_MIME.get(best_format, "application/octet-stream")
+    if len(best) < len(original):
+        logger.info(
+            "Optimized image %s -> %s: %d -> %d bytes (saved %d)",
+            source_format, best_format, len(original), len(best), len(original) - len(best),
+        )
+    return SimpleUploadedFile(sanitized_image_filename(mime_type), best, content_type=mime_type)
+
+
 MAX_AUDIO_SIZE = 10 * 1024 * 1024  # 10MB
 
 
-def _detect_audio_mime(header: bytes) -> str | None:
+def detect_audio_mime(header: bytes) -> str | None:
     """Detect audio MIME type from the first 12 bytes of a file."""
     if len(header) < 4:
         return None
@@ -129,14 +212,37 @@ def validate_audio_file(file: UploadedFile) -> str:
     header = file.read(12)
     file.seek(0)
 
-    mime = _detect_audio_mime(header)
+    mime = detect_audio_mime(header)
     if mime is None:
         raise BusinessValidationError("File is not a recognized audio format.")
 
     return mime
 
 
+_AUDIO_EXTENSIONS: dict[str, str] = {
+    "audio/mpeg": ".mp3",
+    "audio/wav": ".wav",
+    "audio/ogg": ".ogg",
+    "audio/flac": ".flac",
+    "audio/aiff": ".aiff",
+    "audio/mp4": ".m4a",
+}
+
+
+def audio_extension(mime_type: str) -> str:
+    """File extension for an audio MIME type returned by ``validate_audio_file``."""
+    return _AUDIO_EXTENSIONS.get(mime_type, ".bin")
+
+
 def sanitized_image_filename(mime_type: str) -> str:
     """Generate a UUID-based filename with the correct extension for a MIME type."""
     ext = mimetypes.guess_extension(mime_type) or ".bin"
     return f"{uuid.uuid4().hex}{ext}"
+
+
+MAX_ARCHIVE_SIZE = 200 * 1024 * 1024  # 200MB — whole picture libraries
+
+
+def detect_zip_mime(header: bytes) -> str | None:
+    """Detect a (non-empty) ZIP archive from its first bytes."""
+    return "application/zip" if header[:4] == b"PK\x03\x04" else None
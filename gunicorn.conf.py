@@ -16,3 +16,11 @@ keepalive = 5
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
+
+
+# Hooks
+def worker_exit(server, worker):  # noqa: ARG001
+    """Write the worker's buffered pictogram usage counters before it exits."""
+    from apps.pictograms import usage
+
+    usage.flush_on_exit()